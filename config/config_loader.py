@@ -17,6 +17,8 @@ DEFAULT_CONFIG = {
             "input": "",
             "field": ""
         },
+        # extra countdowns: {"timeout_home": {"input": "", "field": "", "role": "timeout"}}
+        "timers": {},
         "penalties": {
             "input": "",
             "home": {
@@ -33,6 +33,24 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         "host": "127.0.0.1",
         "port": 8088,
         "password": "",
+        # HTTP keep-alive pool (sekunder / antal sockets)
+        "connect_timeout": 1.0,
+        "read_timeout": 3.0,
+        "pool_size": 4,
+        # "http" (port) eller "tcp" (vMix TCP API, tcp_port)
+        "transport": "http",
+        "tcp_port": 8099,
+        # Push-events via TCP (SUBSCRIBE TALLY/ACTS) istället för 1 s-poll
+        "subscribe_events": False,
+        "event_fallback_poll_ms": 5000,
+        # Delad status-snapshot: max ålder innan ny hämtning (ms)
+        "snapshot_max_age_ms": 250,
+        # Skicka kommandon med input-key (GUID) istället för titel/nummer
+        "address_inputs_by_key": True,
+        # Kö för utgående kommandon: SetText/SetImage slås ihop (ms, 0 = av)
+        "coalesce_ms": 20,
+        # Gemensam status-poll för alla paneler (en hämtning per varv)
+        "poll_interval_ms": 1000,
     },
     "scoreboard": {
         # Huvud-scoreboarden (titel/korttitel/nummer)
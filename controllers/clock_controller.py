@@ -1,11 +1,22 @@
 import logging
 
+from scoreboard_app.core.vmix_clock import ClockModel
+from scoreboard_app.core.vmix_timer_group import TimerRegistry
+
 log = logging.getLogger(__name__)
 
+MATCH_TIMER = "clock"
+
 
 class ClockController:
     """
     Master match clock controller.
+
+    Also owns the registry of every named countdown (mapping.timers:
+    timeouts, intermission, ...). The match clock is the timer "clock"
+    (role "match"); start_timers/pause_timers/adjust_timers/set_timers
+    run any subset as one batched burst.
+
     Supports:
         SetCountdown
         StartCountdown
@@ -29,6 +40,15 @@ class ClockController:
 
         # runtime state
         self.running = False
+        # local interpolation between polls (see core/vmix_clock)
+        self.model = ClockModel(name=self.clock_field or "clock")
+        # every named countdown; clock + linked countdowns (running
+        # penalties) go out as one burst
+        self.timers = TimerRegistry.from_config(client, cfg)
+        if self.clock_input and self.clock_field:
+            self.timers.register(MATCH_TIMER, self.clock_input, self.clock_field,
+                                 role="match", model=self.model)
+        self.group = self.timers.group
 
     # ======================================================
     # SAFETY WRAPPER
@@ -58,36 +78,27 @@ class ClockController:
         if not self._ensure_valid():
             return
 
-        def go():
-            self.client.set_countdown(self.clock_input, self.clock_field, value)
-
-        self._safe_call(go)
+        self._safe_call(lambda: self.timers.set(value, [MATCH_TIMER]))
 
     def start(self):
         """
-        Start or resume the match clock.
+        Start or resume the match clock (and every linked countdown).
         "StartCountdown" must be used when clock is idle/reset.
         """
         if not self._ensure_valid():
             return
 
-        def go():
-            self.client.start_countdown(self.clock_input, self.clock_field)
-
-        self._safe_call(go)
+        self._safe_call(lambda: self.timers.start([MATCH_TIMER]))
         self.running = True
 
     def pause(self):
         """
-        Pause the match clock.
+        Pause the match clock (and every linked countdown).
         """
         if not self._ensure_valid():
             return
 
-        def go():
-            self.client.pause_countdown(self.clock_input, self.clock_field)
-
-        self._safe_call(go)
+        self._safe_call(lambda: self.timers.pause([MATCH_TIMER]))
         self.running = False
 
     def stop(self):
@@ -103,19 +114,71 @@ class ClockController:
 
         self._safe_call(go)
         self.running = False
+        # StartTime lives in the GT title: unknown until the next poll
+        self.model.invalidate()
 
     def adjust(self, seconds: int):
         """
-        Adjust +/- seconds from current running time
+        Adjust +/- seconds from current running time (linked countdowns too)
         Can be used during play or paused states.
         """
         if not self._ensure_valid():
             return
 
-        def go():
-            self.client.adjust_countdown(self.clock_input, self.clock_field, seconds)
+        self._safe_call(lambda: self.timers.adjust(seconds, [MATCH_TIMER]))
 
-        self._safe_call(go)
+    # ======================================================
+    # NAMED TIMERS (one burst per call)
+    # ======================================================
+    def start_timers(self, names=None, role=None):
+        """Start any subset, e.g. start_timers(role="timeout")"""
+        self._safe_call(lambda: self.timers.start(names, role))
+        self._sync_running()
+
+    def pause_timers(self, names=None, role=None):
+        self._safe_call(lambda: self.timers.pause(names, role))
+        self._sync_running()
+
+    def adjust_timers(self, seconds: int, names=None, role=None):
+        self._safe_call(lambda: self.timers.adjust(seconds, names, role))
+
+    def set_timers(self, values, names=None, role=None):
+        """values: "MM:SS" for every selected timer or {name: "MM:SS"}"""
+        self._safe_call(lambda: self.timers.set(values, names, role))
+        self._sync_running()
+
+    def _sync_running(self):
+        # the match clock may have been part of the subset
+        clock = self.timers.get(MATCH_TIMER)
+        if clock is not None:
+            self.running = clock.model.running
+
+    # ======================================================
+    # LIVE VALUE
+    # ======================================================
+    def observe(self, snap):
+        """
+        StatePoller subscriber: resyncs the models on every fresh snapshot.
+        """
+        self.timers.observe(snap, skip=(MATCH_TIMER,))
+        if not self._ensure_valid():
+            return
+        inp = snap.state.find_input(self.clock_input)
+        if inp is None:
+            return
+        self.model.observe(inp.get_field(self.clock_field), at=snap.fetched_at, running=self.running)
+
+    def link(self, provider):
+        """provider() -> [(input, field)] countdowns that run with the clock"""
+        self.timers.link(MATCH_TIMER, provider)
+
+    def skew_stats(self) -> dict:
+        """Measured spread of the start/pause/adjust bursts"""
+        return self.group.stats()
+
+    def display(self) -> str:
+        """Current clock text from the local model (no vMix I/O)"""
+        return self.model.text()
 
     # ======================================================
     # UI EVENT HELPERS
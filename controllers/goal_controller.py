@@ -1,5 +1,6 @@
 import logging
 from scoreboard_app.core.vmix_client import VMixClient
+from scoreboard_app.core.vmix_timeline import ChannelSequencer, TimelineEngine, compile_timeline
 from scoreboard_app.controllers.scoreboard_controller import ScoreboardController
 
 log = logging.getLogger(__name__)
@@ -24,14 +25,27 @@ class GoalController:
                 "input": "...",
                 "overlay": 2,
                 "duration_ms": 3000,
+                "pause_ms": 0,
                 "fields": {
                     "name": "...",
                     "number": "...",
                     "team": "...",
                     "logo": "..."
                 }
+            },
+            # goal while a sequence is on air: queue | preempt | merge
+            "policy": "queue",
+            # optional: own step lists (see core/vmix_timeline), overrides
+            # the sequences built from the blocks above
+            "sequences": {
+                "goal": [...],          # no scorer data
+                "goal_scorer": [...],   # values {name} {number} {team} {logo}
+                "goal_multi": [...]     # merge policy, extra value {goals}
             }
         }
+
+    Each sequence is compiled once and played on client.timers through a
+    per-overlay-channel sequencer.
     """
 
     def __init__(self, client: VMixClient, cfg: dict, scoreboard: ScoreboardController):
@@ -39,7 +53,11 @@ class GoalController:
         self.cfg = cfg
         self.scoreboard = scoreboard
 
+        self.engine = TimelineEngine(client)
+
         self._resolve_mapping()
+        self._compile()
+        self.sequencer = ChannelSequencer(self.engine, self.policy, merge=self._merge_goals)
 
     # -------------------------------------------------
     # CONFIG
@@ -58,6 +76,8 @@ class GoalController:
         self.after_input = a.get("input")
         self.after_overlay = a.get("overlay", 2)
         self.after_duration = a.get("duration_ms", 3000)
+        # paus mellan GOAL och AFTER GOAL
+        self.after_pause = a.get("pause_ms", self.cfg.get("goal_graphics", {}).get("after_goal_pause_ms", 0))
 
         # scorer field mapping
         self.after_fields = a.get("fields", {
@@ -67,8 +87,70 @@ class GoalController:
             "logo": None,
         })
 
+        self.sequences = gm.get("sequences") or {}
+        self.policy = gm.get("policy", "queue")
+
         log.info("[GOAL] mapping resolved")
 
+    def _default_steps(self, scorer: bool) -> list:
+        steps = []
+        if self.popup_input:
+            steps += [
+                {"overlay_in": self.popup_overlay, "input": self.popup_input},
+                {"wait": "{popup_ms}"},
+                {"overlay_out": self.popup_overlay, "input": self.popup_input},
+            ]
+        else:
+            log.error("[GOAL] Missing mapping: goal_popup.input")
+        if not scorer:
+            return steps
+        if not self.after_input:
+            log.error("[GOAL] Missing mapping: after_goal.input")
+            return steps
+        fields = {f: "{%s}" % key for key, f in self.after_fields.items() if f}
+        steps += [{"wait": "{pause_ms}"}]
+        if fields:
+            # written while the popup is on air, confirmed before the overlay
+            steps += [{"stage": fields, "input": self.after_input}]
+        steps += [
+            {"overlay_in": self.after_overlay, "input": self.after_input},
+            {"wait": "{after_ms}"},
+            {"overlay_out": self.after_overlay, "input": self.after_input},
+        ]
+        return steps
+
+    def _compile(self):
+        variables = {
+            "popup_ms": self.popup_duration,
+            "after_ms": self.after_duration,
+            "pause_ms": self.after_pause,
+        }
+        self.timelines = {}
+        for name, scorer in (("goal", False), ("goal_scorer", True)):
+            steps = self.sequences.get(name) or self._default_steps(scorer)
+            self.timelines[name] = compile_timeline(name, steps, variables)
+            log.debug(f"[GOAL] {name}: {self.timelines[name].describe()}")
+        if self.sequences.get("goal_multi"):
+            self.timelines["goal_multi"] = compile_timeline("goal_multi", self.sequences["goal_multi"], variables)
+
+    def _merge_goals(self, items):
+        """
+        Goals that met on air -> one sequence: "goal_multi" with {goals}
+        when configured, else the last goal's own sequence (overlays
+        already up stay up, the scorer shown is the latest).
+        """
+        goals = 0
+        values = {}
+        scorer = None
+        for tl, v in items:
+            goals += int(v.get("goals") or 1)
+            values.update({k: val for k, val in v.items() if val})
+            if tl.name != "goal":
+                scorer = tl
+        values["goals"] = str(goals)
+        multi = self.timelines.get("goal_multi")
+        return (multi or scorer or items[-1][0]), values
+
     # -------------------------------------------------
     # REGISTER GOAL
     # GUI calls:
@@ -88,60 +170,44 @@ class GoalController:
         else:
             self.scoreboard.inc_away(1)
 
-        # Always fire goal popup overlay
-        self._show_goal_popup()
-
         # Only show scorer graphics IF we have enough data
         if player_name or player_number or team_name or logo_url:
-            self._show_after_goal(player_name, player_number, team_name, logo_url)
-
-    # -------------------------------------------------
-    # GOAL POPUP OVERLAY
-    # -------------------------------------------------
-    def _show_goal_popup(self):
-        if not self.popup_input:
-            log.error("[GOAL] Missing mapping: goal_popup.input")
-            return
-
-        try:
-            # SHOW
-            self.client.overlay_on(self.popup_input, self.popup_overlay)
-            self.client.after_delay(self.popup_duration,
-                                    lambda: self.client.overlay_off(self.popup_input, self.popup_overlay))
-        except Exception as e:
-            log.error(f"[GOAL] popup overlay failed: {e}")
+            self.play("goal_scorer", {
+                "name": player_name or "",
+                "number": "" if player_number is None else str(player_number),
+                "team": team_name or "",
+                "logo": logo_url or "",
+            })
+        else:
+            self.play("goal")
 
     # -------------------------------------------------
-    # AFTER GOAL — PLAYER GRAPHICS
+    # GRAPHICS SEQUENCES
     # -------------------------------------------------
-    def _show_after_goal(self, name, number, team, logo):
-        if not self.after_input:
-            log.error("[GOAL] Missing mapping: after_goal.input")
-            return
-
-        # PUSH fields only if mapped + non-empty
-        try:
-            if name and self.after_fields.get("name"):
-                self.client.update_text(self.after_input, self.after_fields["name"], name)
-
-            if number and self.after_fields.get("number"):
-                self.client.update_text(self.after_input, self.after_fields["number"], str(number))
-
-            if team and self.after_fields.get("team"):
-                self.client.update_text(self.after_input, self.after_fields["team"], team)
-
-            if logo and self.after_fields.get("logo"):
-                self.client.update_text(self.after_input, self.after_fields["logo"], logo)
-
-        except Exception as e:
-            log.error(f"[GOAL] field update failed: {e}")
-
-        # SHOW AFTER-GOAL OVERLAY
-        try:
-            self.client.overlay_on(self.after_input, self.after_overlay)
+    def play(self, name: str, values: dict = None):
+        """
+        Hands a compiled sequence to the sequencer; returns the run, or
+        None when it was queued behind the one on air.
+        """
+        timeline = self.timelines.get(name)
+        if timeline is None:
+            log.error(f"[GOAL] unknown sequence: {name}")
+            return None
+        return self.sequencer.submit(timeline, values)
 
-            self.client.after_delay(self.after_duration,
-                                    lambda: self.client.overlay_off(self.after_input, self.after_overlay))
+    def staging_stats(self) -> dict:
+        """
+        How long the pre-staged scorer fields took to land, against the
+        time the sequence gives them (popup duration + pause).
+        """
+        stats = self.engine.staging_stats()
+        stats["popup_ms"] = self.popup_duration
+        stats["pause_ms"] = self.after_pause
+        return stats
 
-        except Exception as e:
-            log.error(f"[GOAL] after-goal overlay failed: {e}")
+    def clear_graphics(self):
+        """
+        Takes goal graphics down now (e.g. goal undone), cancels the rest
+        of the running sequence and drops queued ones.
+        """
+        self.sequencer.clear()
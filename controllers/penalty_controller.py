@@ -1,7 +1,11 @@
 import logging
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 from scoreboard_app.core.vmix_client import VMixClient
+from scoreboard_app.core.vmix_clock import format_clock, parse_clock
+from scoreboard_app.core.vmix_expiry import PenaltyScheduler
+from scoreboard_app.core.vmix_projection import Projection
 
 log = logging.getLogger(__name__)
 
@@ -10,7 +14,9 @@ class PenaltyController:
     """
     Controller för utvisningar.
 
-    Användning i GUI (PenaltyPanel):
+    PenaltyPanel följer fälten via StatePoller-deltan (penalty_fields /
+    field_layout) och visar snapshot_age_ms(). En enstaka läsning av
+    alla slots:
 
         data = controller.get_penalties()
 
@@ -24,6 +30,7 @@ class PenaltyController:
                 {"time": "05:00", "number": "22", "name": ""},
                 {"time": "00:00", "number": "",   "name": ""},
             ],
+            "snapshot_age_ms": 180.0,   # None om inget kunde läsas
         }
 
     All logik för att läsa/skriva vMix-fält utgår från vmix_config.json:
@@ -52,14 +59,22 @@ class PenaltyController:
       }
 
     Just nu används bara time och number för att uppdatera GUI.
-    BG-fälten (time_bg / number_bg) kan användas senare för att
-    tända/släcka grafik, men är inte nödvändiga för att undvika fel.
+    BG-fälten (time_bg / number_bg) tänds/släcks av set_penalty /
+    clear_penalty.
+
+    Med en ClockController (clock=...) släcks utvisningar när de går ut
+    av en PenaltyScheduler som följer matchklockans modell – inte när en
+    poll råkar se 00:00. Släckningen körs på appens IOWorker (io=...,
+    lane "penalty").
     """
 
     # ---------------------------------------------------------
-    def __init__(self, client: VMixClient, config: Dict[str, Any]) -> None:
+    def __init__(self, client: VMixClient, config: Dict[str, Any],
+                 scoreboard=None, clock=None, io=None) -> None:
         self.client = client
         self.cfg = config
+        self.scoreboard = scoreboard
+        self.clock = clock
 
         # Scoreboard-input (t.ex. "SCOREBOARD UPPE")
         sb_cfg = self.cfg.get("scoreboard", {})
@@ -78,110 +93,239 @@ class PenaltyController:
                 "[PENALTIES] Ingen mapping.penalties hittades i config['mapping']"
             )
 
+        # Fältindex + projektion byggs en gång – get_penalties gör inga
+        # uppslag i mappingen per anrop
+        self._compile_fields()
+
+        # Utgång per slot, schemalagd mot matchklockan
+        self.expiry = None
+        if clock is not None:
+            if io is None:
+                raise ValueError("PenaltyController med clock kräver io (appens IOWorker)")
+            self.expiry = PenaltyScheduler(clock.model, io, self.client.timers,
+                                           send=self.client.batch)
+            # aktiva utvisningar startar/pausas/justeras i klockans burst
+            clock.link(self.running_fields)
+
     # ---------------------------------------------------------
-    @staticmethod
-    def _base_name(field_name: str) -> str:
+    def _slot_fields(self, side_key: str) -> List[Tuple[str, str]]:
         """
-        Tar ett fullständigt fältnamn från vMix (t.ex. 'HomeP1time.Text')
-        och returnerar basnamnet utan suffix (t.ex. 'HomeP1time').
+        Returnerar [(time_field, number_field), ...] för p1 och p2.
+        """
+        side_map = self.penalty_map.get(side_key, {})
+        out: List[Tuple[str, str]] = []
+        for slot_key in ("p1", "p2"):
+            slot_cfg = side_map.get(slot_key, {}) or {}
+            out.append((slot_cfg.get("time", ""), slot_cfg.get("number", "")))
+        return out
 
-        Detta behövs eftersom VMixClient.get_text / set_text själva lägger
-        till '.Text' i API-anropen.
+    # ---------------------------------------------------------
+    def penalty_fields(self) -> List[Tuple[str, str]]:
+        """
+        [(scoreboard_input, fält), ...] för alla tid/nummer-fält –
+        det en StatePoller-prenumeration behöver.
         """
-        if not field_name:
-            return ""
-        # Klipp av allt efter första punkten, t.ex. ".Text" eller ".Source"
-        return field_name.split(".", 1)[0]
+        return [
+            (self.scoreboard_input, f)
+            for side_key in ("home", "away")
+            for pair in self._slot_fields(side_key)
+            for f in pair
+            if f
+        ]
 
     # ---------------------------------------------------------
-    def _read_field(self, element_full_name: str) -> str:
+    def field_layout(self) -> Dict[str, Tuple[str, int, str]]:
         """
-        Läser textvärdet från ett GT-fält på scoreboard-inputen.
+        {fältnamn: (side, slot-index, "time"/"number")} – så att en
+        ändring av ett enskilt fält kan gå direkt till rätt GUI-cell.
+        """
+        layout: Dict[str, Tuple[str, int, str]] = {}
+        for side_key in ("home", "away"):
+            for i, (time_field, nr_field) in enumerate(self._slot_fields(side_key)):
+                if time_field:
+                    layout[time_field] = (side_key, i, "time")
+                if nr_field:
+                    layout[nr_field] = (side_key, i, "number")
+        return layout
 
-        element_full_name är exakt namnet från vMix / vmix_config.json,
-        t.ex. 'HomeP1time.Text'. Vi gör om det till 'HomeP1time' innan
-        vi skickar det vidare till VMixClient.
+    # ---------------------------------------------------------
+    def _compile_fields(self) -> None:
         """
-        if not self.scoreboard_input or not element_full_name:
-            return ""
+        Förkompilerar mapping.penalties till en lista
+        [(side, slot-index, "time"/"number", (input, fält)), ...]
+        och en Projection över exakt de fälten.
+        """
+        self._field_index: List[Tuple[str, int, str, Tuple[str, str]]] = []
+        for field, (side_key, i, kind) in self.field_layout().items():
+            if i < 2:
+                self._field_index.append((side_key, i, kind, (self.scoreboard_input, field)))
+        self._projection: Optional[Projection] = None
+        if self.scoreboard_input and self._field_index:
+            self._projection = Projection(
+                {self.scoreboard_input: {ref[1] for *_, ref in self._field_index}}
+            )
 
-        base = self._base_name(element_full_name)
-        if not base:
-            return ""
+    # ---------------------------------------------------------
+    def get_penalties(self) -> Dict[str, Any]:
+        """
+        Läser alla slots på en gång (en projektion, ingen poller).
+
+        Returnerar:
+        {
+          "home": [ {time, number, name}, {time, number, name} ],
+          "away": [ {time, number, name}, {time, number, name} ],
+          "snapshot_age_ms": float | None
+        }
+
+        Alla slots löses ur ETT snapshot via den förkompilerade
+        projektionen; snapshot_age_ms är snapshotets ålder (None om
+        inget kunde läsas).
+        """
+        empty_slot = {"time": "", "number": "", "name": ""}
+        data: Dict[str, Any] = {
+            "home": [empty_slot.copy(), empty_slot.copy()],
+            "away": [empty_slot.copy(), empty_slot.copy()],
+            "snapshot_age_ms": None,
+        }
+
+        # Om config saknas: returnera tomma strukturer så att GUI inte kraschar
+        if self._projection is None or not self.penalty_map:
+            log.debug("[PENALTIES] get_penalties körs utan komplett mapping")
+            return data
 
         try:
-            value = self.client.get_text(self.scoreboard_input, base)
-            return value or ""
+            res = self.client.project(self._projection)
         except Exception as exc:
             log.error(
-                "[PENALTIES] Misslyckades att läsa fält '%s' på input '%s': %s",
-                element_full_name,
+                "[PENALTIES] Misslyckades att läsa penalty-fält på input '%s': %s",
                 self.scoreboard_input,
                 exc,
             )
-            return ""
+            return data
+
+        values = res.values
+        for side_key, i, kind, ref in self._field_index:
+            data[side_key][i][kind] = (values.get(ref) or "").strip()
+        if res.fetched_at is not None:
+            data["snapshot_age_ms"] = (time.monotonic() - res.fetched_at) * 1000.0
+        return data
 
     # ---------------------------------------------------------
-    def _build_side_data(self, side_key: str) -> List[Dict[str, str]]:
+    def snapshot_age_ms(self) -> Optional[float]:
         """
-        Bygger listan med två slots för 'home' eller 'away'.
-
-        Varje slot är ett dict med:
-           {"time": "...", "number": "...", "name": ""}
-
-        Name används inte ännu (vi har ingen direkt mapping till spelarnamn),
-        så den lämnas tom.
+        Ålder på klientens cachade snapshot (None om inget lästs än) –
+        ingen vMix-läsning, PenaltyPanel visar den som inaktualitet.
         """
-        side_map = self.penalty_map.get(side_key, {})
+        snap = self.client.snapshots.peek()
+        return snap.age_ms if snap is not None else None
 
-        slots: List[Dict[str, str]] = []
-
-        # Vi har två uttalat definierade platser: p1 och p2
-        for slot_key in ("p1", "p2"):
-            slot_cfg = side_map.get(slot_key, {}) or {}
-
-            time_field = slot_cfg.get("time", "")
-            nr_field = slot_cfg.get("number", "")
+    # ---------------------------------------------------------
+    # Sätta / släcka
+    # ---------------------------------------------------------
+    def _slot_cfg(self, side_key: str, index: int) -> Dict[str, str]:
+        slot_cfg = self.penalty_map.get(side_key, {}).get(f"p{index + 1}", {}) or {}
+        if not slot_cfg.get("time") or not slot_cfg.get("number"):
+            raise ValueError(f"Felfält för utvisning {side_key} p{index + 1}: saknar time/number")
+        return slot_cfg
 
-            time_val = self._read_field(time_field)
-            nr_val = self._read_field(nr_field)
+    @staticmethod
+    def slot_key(side_key: str, index: int) -> str:
+        return f"{side_key}{index + 1}"
 
-            slots.append(
-                {
-                    "time": time_val,
-                    "number": nr_val,
-                    # Spelarnamn har vi inte mappat in ännu
-                    "name": "",
-                }
-            )
+    # ---------------------------------------------------------
+    def clear_commands(self, side_key: str, index: int) -> List[tuple]:
+        """
+        Batchen som släcker en slot: stoppa + nollställ, dölj tid/nummer
+        och bakgrunder. Byggs i förväg när utvisningen sätts.
+        """
+        c = self._slot_cfg(side_key, index)
+        sb = self.scoreboard_input
+        cmds = [
+            ("StopCountdown", {"Input": sb, "SelectedName": c["time"]}),
+            ("SetCountdown", {"Input": sb, "SelectedName": c["time"], "Value": "00:00"}),
+            ("SetText", {"Input": sb, "SelectedName": c["time"], "Value": "00:00"}),
+            ("SetText", {"Input": sb, "SelectedName": c["number"], "Value": ""}),
+            ("SetTextVisibleOff", {"Input": sb, "SelectedName": c["time"]}),
+            ("SetTextVisibleOff", {"Input": sb, "SelectedName": c["number"]}),
+        ]
+        for bg in (c.get("time_bg"), c.get("number_bg")):
+            if bg:
+                cmds.append(("SetImageVisibleOff", {"Input": sb, "SelectedName": bg}))
+        return cmds
 
-        # Säkerställ exakt två slots även om config är ofullständig
-        while len(slots) < 2:
-            slots.append({"time": "", "number": "", "name": ""})
+    # ---------------------------------------------------------
+    def set_penalty(self, side_key: str, index: int, number: str, time_str: str) -> None:
+        """
+        Sätter en utvisning (t.ex. "home", 0, "12", "02:00") i en batch och
+        startar den om matchklockan går. Med scheduler: utgången armeras.
+        """
+        c = self._slot_cfg(side_key, index)
+        secs = parse_clock(time_str)
+        if secs is None:
+            raise ValueError(f"Ogiltig utvisningstid: {time_str!r}")
+        t_str = format_clock(secs)
+        sb = self.scoreboard_input
+        running = self.clock is not None and self.clock.running
+
+        cmds = [
+            ("StopCountdown", {"Input": sb, "SelectedName": c["time"]}),
+            ("SetCountdown", {"Input": sb, "SelectedName": c["time"], "Value": t_str}),
+            ("SetText", {"Input": sb, "SelectedName": c["time"], "Value": t_str}),
+            ("SetText", {"Input": sb, "SelectedName": c["number"], "Value": number or ""}),
+            ("SetTextVisibleOn", {"Input": sb, "SelectedName": c["time"]}),
+            ("SetTextVisibleOn", {"Input": sb, "SelectedName": c["number"]}),
+        ]
+        for bg in (c.get("time_bg"), c.get("number_bg")):
+            if bg:
+                cmds.append(("SetImageVisibleOn", {"Input": sb, "SelectedName": bg}))
+        if running and secs > 0:
+            cmds.append(("StartCountdown", {"Input": sb, "SelectedName": c["time"]}))
+
+        result = self.client.batch(cmds)
+        if not result.ok:
+            raise RuntimeError(f"[PENALTIES] set_penalty misslyckades: {result.errors[0][1]}")
+
+        if self.expiry is not None and secs > 0:
+            self.expiry.arm(self.slot_key(side_key, index), secs,
+                            self.clear_commands(side_key, index))
 
-        return slots
+    # ---------------------------------------------------------
+    def clear_penalty(self, side_key: str, index: int) -> None:
+        if self.expiry is not None:
+            self.expiry.disarm(self.slot_key(side_key, index))
+        result = self.client.batch(self.clear_commands(side_key, index))
+        if not result.ok:
+            raise RuntimeError(f"[PENALTIES] clear_penalty misslyckades: {result.errors[0][1]}")
 
     # ---------------------------------------------------------
-    def get_penalties(self) -> Dict[str, List[Dict[str, str]]]:
+    def running_fields(self) -> List[Tuple[str, str]]:
         """
-        API som används av PenaltyPanel för att uppdatera GUI.
-
-        Returnerar:
-        {
-          "home": [ {time, number, name}, {time, number, name} ],
-          "away": [ {time, number, name}, {time, number, name} ]
-        }
+        [(scoreboard_input, tidsfält)] för utvisningar som pågår enligt
+        schedulern – ur cachat tillstånd, ingen vMix-läsning.
         """
-        # Om config saknas: returnera tomma strukturer så att GUI inte kraschar
-        if not self.scoreboard_input or not self.penalty_map:
-            log.debug("[PENALTIES] get_penalties körs utan komplett mapping")
-            empty_slot = {"time": "", "number": "", "name": ""}
-            return {
-                "home": [empty_slot.copy(), empty_slot.copy()],
-                "away": [empty_slot.copy(), empty_slot.copy()],
-            }
-
-        home_slots = self._build_side_data("home")
-        away_slots = self._build_side_data("away")
+        if self.expiry is None:
+            return []
+        armed = self.expiry.armed()
+        out = []
+        for side_key in ("home", "away"):
+            for i, (time_field, _) in enumerate(self._slot_fields(side_key)):
+                if time_field and armed.get(self.slot_key(side_key, i)):
+                    out.append((self.scoreboard_input, time_field))
+        return out
 
-        return {"home": home_slots, "away": away_slots}
+    # ---------------------------------------------------------
+    def observe(self, snap) -> None:
+        """
+        StatePoller-prenumerant: justerar schemalagda utgångar mot det
+        vMix visar (visningen är hela sekunder -> +0.5 s).
+        """
+        if self.expiry is None:
+            return
+        inp = snap.state.find_input(self.scoreboard_input)
+        if inp is None:
+            return
+        for side_key in ("home", "away"):
+            for i, (time_field, _) in enumerate(self._slot_fields(side_key)):
+                secs = parse_clock(inp.get_field(time_field) or "") if time_field else None
+                if secs:
+                    self.expiry.resync(self.slot_key(side_key, i), secs + 0.5, at=snap.fetched_at)
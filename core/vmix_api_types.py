@@ -6,32 +6,45 @@ Datatyper som representerar vMix API-data.
 Används av vmix_client.py för att:
  • returnera strukturer istället för rå XML
  • göra projektet stabilt, typat och lätt att felsöka
+
+Uppslag (input via nummer/key/titel, fält via namn) går via index-dicts
+som byggs en gång av build_index() – se vmix_parser.parse_status_xml().
+
+Fält- och input-klasserna har __slots__ och fältnamnen interneras av
+parsern. För historik över många snapshots: se vmix_history.
 """
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 
 # ------------------------------------------------------------
 # Grundstrukturer
 # ------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class VMixTextField:
     """Ett textfält i ett GT/Title input"""
     name: str
     value: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class VMixImageField:
     """Ett bildfält (*.Source) i GT/Title"""
     name: str
     source: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
+class VMixColorField:
+    """Ett färgfält (*.Color) i GT/Title"""
+    name: str
+    value: str = ""
+
+
+@dataclass(slots=True)
 class VMixInput:
     """Representerar ett <input> från vMix XML API"""
 
@@ -44,18 +57,73 @@ class VMixInput:
     # Innehåll
     text_fields: List[VMixTextField] = field(default_factory=list)
     image_fields: List[VMixImageField] = field(default_factory=list)
+    color_fields: List[VMixColorField] = field(default_factory=list)
 
-    def get_text(self, name: str) -> str:
+    # Index: fältnamn -> värde (byggs av build_index)
+    _text_index: Dict[str, str] = field(default_factory=dict, repr=False, compare=False)
+    _image_index: Dict[str, str] = field(default_factory=dict, repr=False, compare=False)
+    _color_index: Dict[str, str] = field(default_factory=dict, repr=False, compare=False)
+
+    def build_index(self) -> "VMixInput":
+        # setdefault: första fältet med ett namn vinner (som en linjär sökning)
+        self._text_index = {}
         for t in self.text_fields:
-            if t.name == name:
-                return t.value
-        return ""
+            self._text_index.setdefault(t.name, t.value)
+        self._image_index = {}
+        for i in self.image_fields:
+            self._image_index.setdefault(i.name, i.source)
+        self._color_index = {}
+        for c in self.color_fields:
+            self._color_index.setdefault(c.name, c.value)
+        return self
+
+    def get_text(self, name: str) -> str:
+        return self._text_index.get(name, "")
 
     def get_image(self, name: str) -> str:
-        for i in self.image_fields:
-            if i.name == name:
-                return i.source
-        return ""
+        return self._image_index.get(name, "")
+
+    def get_color(self, name: str) -> str:
+        return self._color_index.get(name, "")
+
+    def get_field(self, name: str) -> Optional[str]:
+        """Värdet för ett text-, bild- eller färgfält, None om det saknas"""
+        for index in (self._text_index, self._image_index, self._color_index):
+            if name in index:
+                return index[name]
+        return None
+
+    def set_field(self, name: str, value: str, kind: str = "text") -> bool:
+        """
+        Uppdaterar ett befintligt text/image-fält (lokal spegling av en SetText/SetImage).
+        Returnerar False om fältet inte finns.
+        """
+        if kind == "image":
+            fields, attr, index = self.image_fields, "source", self._image_index
+        else:
+            fields, attr, index = self.text_fields, "value", self._text_index
+        if name not in index:
+            return False
+        for f in fields:
+            if f.name == name:
+                setattr(f, attr, value)
+                break
+        # nytt dict (copy-on-write): den som håller det gamla indexet
+        # (t.ex. vmix_diff) ser fortfarande det gamla värdet
+        index = {**index, name: value}
+        if kind == "image":
+            self._image_index = index
+        else:
+            self._text_index = index
+        return True
+
+    def field_names(self) -> List[str]:
+        """Alla fältnamn i XML-ordning: text, image, color"""
+        return (
+            [t.name for t in self.text_fields if t.name]
+            + [i.name for i in self.image_fields if i.name]
+            + [c.name for c in self.color_fields if c.name]
+        )
 
 
 @dataclass
@@ -66,21 +134,45 @@ class VMixState:
     preset: str
     inputs: List[VMixInput] = field(default_factory=list)
 
-    def find_input_by_number(self, number: int) -> Optional[VMixInput]:
+    # overlay-kanal -> inputnummer (None = tom)
+    overlays: Dict[int, Optional[int]] = field(default_factory=dict)
+    active: Optional[int] = None
+    preview: Optional[int] = None
+
+    # Index (byggs av build_index)
+    _by_number: Dict[int, VMixInput] = field(default_factory=dict, repr=False, compare=False)
+    _by_key: Dict[str, VMixInput] = field(default_factory=dict, repr=False, compare=False)
+    _by_name: Dict[str, VMixInput] = field(default_factory=dict, repr=False, compare=False)
+
+    def build_index(self) -> "VMixState":
+        self._by_number = {}
+        self._by_key = {}
+        self._by_name = {}
         for inp in self.inputs:
-            if inp.number == number:
-                return inp
-        return None
+            inp.build_index()
+            self._by_number.setdefault(inp.number, inp)
+            if inp.key:
+                self._by_key.setdefault(inp.key.lower(), inp)
+            # title går före short_title för samma input
+            for nm in (inp.title, inp.short_title):
+                if nm:
+                    self._by_name.setdefault(nm.strip().lower(), inp)
+        return self
+
+    def find_input_by_number(self, number: int) -> Optional[VMixInput]:
+        return self._by_number.get(number)
+
+    def find_input_by_key(self, key: str) -> Optional[VMixInput]:
+        return self._by_key.get(str(key).strip().lower())
 
     def find_input(self, name_or_number: str | int) -> Optional[VMixInput]:
-        """Tillåter sökning via nummer, namn eller shortTitle"""
+        """Tillåter sökning via nummer, namn, shortTitle eller key"""
         if isinstance(name_or_number, int):
             return self.find_input_by_number(name_or_number)
 
-        name = str(name_or_number).strip().lower()
+        name = str(name_or_number).strip()
+        if name.isdigit():
+            return self.find_input_by_number(int(name))
 
-        # matcha på title eller short_title
-        for inp in self.inputs:
-            if inp.title.lower() == name or inp.short_title.lower() == name:
-                return inp
-        return None
+        name = name.lower()
+        return self._by_name.get(name) or self._by_key.get(name)
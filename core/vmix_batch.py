@@ -0,0 +1,275 @@
+import heapq
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence, Tuple
+
+Command = Tuple[str, dict]
+
+
+def normalize(cmd) -> Command:
+    """
+    Accepts ("SetText", {"Input": ..., ...}) or {"Function": "SetText", "Input": ...}.
+    """
+    if isinstance(cmd, dict):
+        params = dict(cmd)
+        function = params.pop("Function", None)
+    else:
+        function, params = cmd[0], dict(cmd[1] if len(cmd) > 1 and cmd[1] else {})
+    if not function:
+        raise ValueError(f"Batch-kommando saknar Function: {cmd!r}")
+    return str(function), params
+
+
+def dependencies(commands: Sequence[Command],
+                 ordered_groups: Optional[Sequence[Sequence[int]]] = None) -> List[List[int]]:
+    """
+    deps[i] = indices that must complete before command i.
+
+    Implicit: commands on the same (Input, SelectedName) keep list order,
+    a command without SelectedName is ordered against everything on its Input
+    (StopCountdown -> SetCountdown -> SetText on one field stay in sequence).
+    Explicit: each ordered_groups entry [a, b, c] runs a -> b -> c.
+    """
+    deps: List[set] = [set() for _ in commands]
+    last_field = {}   # (input, field) -> index
+    last_input = {}   # input -> index of last whole-input command
+    on_input = {}     # input -> indices since that command
+
+    for i, (_, params) in enumerate(commands):
+        inp = params.get("Input")
+        if inp is None:
+            continue
+        inp = str(inp).strip().lower()
+        name = params.get("SelectedName")
+
+        if inp in last_input:
+            deps[i].add(last_input[inp])
+        if name:
+            if (inp, name) in last_field:
+                deps[i].add(last_field[(inp, name)])
+            last_field[(inp, name)] = i
+            on_input.setdefault(inp, []).append(i)
+        else:
+            deps[i].update(on_input.pop(inp, []))
+            last_input[inp] = i
+            for k in [k for k in last_field if k[0] == inp]:
+                del last_field[k]
+
+    for group in ordered_groups or ():
+        group = list(group)
+        for a, b in zip(group, group[1:]):
+            if not (0 <= a < len(commands) and 0 <= b < len(commands)) or a == b:
+                raise ValueError(f"Ogiltig ordered_groups-post: {group}")
+            deps[b].add(a)
+
+    return [sorted(d) for d in deps]
+
+
+def topo_order(deps: List[List[int]]) -> List[int]:
+    """Dependency order, list order among independent commands"""
+    waiting = [len(d) for d in deps]
+    children: List[List[int]] = [[] for _ in deps]
+    for i, d in enumerate(deps):
+        for j in d:
+            children[j].append(i)
+
+    ready = [i for i, n in enumerate(waiting) if n == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        i = heapq.heappop(ready)
+        order.append(i)
+        for c in children[i]:
+            waiting[c] -= 1
+            if waiting[c] == 0:
+                heapq.heappush(ready, c)
+    if len(order) != len(deps):
+        raise ValueError("ordered_groups innehåller en cykel")
+    return order
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch; results[i] is the reply or the exception of command i"""
+    commands: List[Command]
+    results: list
+    wall_ms: float
+    # what the same commands would have cost one round trip after another
+    serial_ms: float
+    mode: str
+    latencies_ms: List[float] = field(default_factory=list, repr=False)
+    # ms after the batch started that command i was handed to the transport
+    # (None: never sent) and that its reply arrived
+    sent_ms: List[Optional[float]] = field(default_factory=list, repr=False)
+    done_ms: List[Optional[float]] = field(default_factory=list, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return not any(isinstance(r, BaseException) for r in self.results)
+
+    @property
+    def errors(self) -> List[Tuple[Command, BaseException]]:
+        return [(c, r) for c, r in zip(self.commands, self.results) if isinstance(r, BaseException)]
+
+    @property
+    def skew_ms(self) -> float:
+        """Spread between the first and the last command going out"""
+        sent = [t for t in self.sent_ms if t is not None]
+        return max(sent) - min(sent) if sent else 0.0
+
+    @property
+    def ack_skew_ms(self) -> float:
+        """Spread between the first and the last reply (upper bound on execution skew)"""
+        done = [t for t, s in zip(self.done_ms, self.sent_ms) if t is not None and s is not None]
+        return max(done) - min(done) if done else 0.0
+
+    @property
+    def speedup(self) -> float:
+        return self.serial_ms / self.wall_ms if self.wall_ms > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"{len(self.commands)} commands in {self.wall_ms:.1f} ms "
+                f"(serial ~{self.serial_ms:.1f} ms, x{self.speedup:.1f}, {self.mode})")
+
+
+def run_batch(send: Callable[[str, dict], Future],
+              commands: Sequence,
+              ordered_groups: Optional[Sequence[Sequence[int]]] = None,
+              max_workers: int = 4,
+              timeout: Optional[float] = None,
+              pipelined: bool = False,
+              executor: Optional[Executor] = None) -> BatchResult:
+    """
+    Runs commands with as much overlap as their dependencies allow.
+
+    pipelined=False (HTTP): at most max_workers commands of this batch in
+      flight on executor (VMixClient keeps one for all its batches; a
+      throwaway pool when None); a command is started only when everything
+      it depends on has completed. Serial baseline = the sum of the
+      measured round trips.
+    pipelined=True (TCP): everything is written in dependency order on the one
+      socket, vMix executes them in that order. Serial baseline = the fastest
+      round trip times the number of commands.
+
+    Pool mode does not send a command whose dependency failed (its result is
+    an error); pipelined mode has already written it by then.
+    """
+    cmds = [normalize(c) for c in commands]
+    deps = dependencies(cmds, ordered_groups)
+    order = topo_order(deps)
+
+    n = len(cmds)
+    results: list = [None] * n
+    lat: List[float] = [0.0] * n
+    sent_at: List[Optional[float]] = [None] * n
+    done_at: List[Optional[float]] = [None] * n
+    t0 = time.perf_counter()
+
+    if pipelined:
+        sent = []
+        for i in order:
+            if any(isinstance(results[j], BaseException) for j in deps[i]):
+                results[i] = RuntimeError(f"beroende misslyckades för {cmds[i][0]}")
+                continue
+            start = time.perf_counter()
+            try:
+                fut = send(*cmds[i])
+            except Exception as e:
+                results[i] = e
+                continue
+            # written to the socket
+            sent_at[i] = (time.perf_counter() - t0) * 1000.0
+            fut.add_done_callback(
+                lambda f, i=i: done_at.__setitem__(i, (time.perf_counter() - t0) * 1000.0)
+            )
+            sent.append((i, start, fut))
+        for i, start, fut in sent:
+            try:
+                results[i] = fut.result(timeout=timeout)
+            except Exception as e:
+                results[i] = e
+            if done_at[i] is None:
+                done_at[i] = (time.perf_counter() - t0) * 1000.0
+            lat[i] = done_at[i] - (start - t0) * 1000.0
+        wall = (time.perf_counter() - t0) * 1000.0
+        done = [lat[i] for i, _, _ in sent]
+        serial = min(done) * len(done) if done else 0.0
+        return BatchResult(cmds, results, wall, serial, "pipelined", lat, sent_at, done_at)
+
+    waiting = [len(d) for d in deps]
+    children: List[List[int]] = [[] for _ in cmds]
+    for i, d in enumerate(deps):
+        for j in d:
+            children[j].append(i)
+
+    lock = threading.Lock()
+    all_done = threading.Event()
+    remaining = [n]
+    width = max(1, min(max_workers, n or 1))
+    pool = executor or ThreadPoolExecutor(max_workers=width, thread_name_prefix="vmix-batch")
+    # ready to run, in topological order; running = this batch's tasks on the pool
+    ready = deque(i for i in order if waiting[i] == 0)
+    running = [0]
+
+    def take() -> List[int]:
+        # under lock
+        out = []
+        while ready and running[0] < width:
+            running[0] += 1
+            out.append(ready.popleft())
+        return out
+
+    def start(i):
+        try:
+            pool.submit(task, i)
+        except RuntimeError as e:
+            # executor shut down (client closed)
+            results[i] = e
+            finish(i)
+
+    def finish(i):
+        with lock:
+            running[0] -= 1
+            remaining[0] -= 1
+            for c in children[i]:
+                waiting[c] -= 1
+                if waiting[c] == 0:
+                    ready.append(c)
+            if remaining[0] == 0:
+                all_done.set()
+            nxt = take()
+        for c in nxt:
+            start(c)
+
+    def task(i):
+        if any(isinstance(results[j], BaseException) for j in deps[i]):
+            results[i] = RuntimeError(f"beroende misslyckades för {cmds[i][0]}")
+        else:
+            start = time.perf_counter()
+            sent_at[i] = (start - t0) * 1000.0
+            try:
+                results[i] = send(*cmds[i]).result(timeout=timeout)
+            except Exception as e:
+                results[i] = e
+            end = time.perf_counter()
+            lat[i] = (end - start) * 1000.0
+            done_at[i] = (end - t0) * 1000.0
+        finish(i)
+
+    try:
+        if n == 0:
+            all_done.set()
+        with lock:
+            first = take()
+        for i in first:
+            start(i)
+        all_done.wait()
+    finally:
+        if executor is None:
+            pool.shutdown(wait=True)
+
+    wall = (time.perf_counter() - t0) * 1000.0
+    return BatchResult(cmds, results, wall, sum(lat), "pool", lat, sent_at, done_at)
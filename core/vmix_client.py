@@ -1,5 +1,19 @@
-import requests
-import xml.etree.ElementTree as ET
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from scoreboard_app.core.vmix_api_types import VMixState
+from scoreboard_app.core.vmix_batch import BatchResult, normalize, run_batch
+from scoreboard_app.core.vmix_projection import Projected, Projection
+from scoreboard_app.core.vmix_resolver import InputResolver, ResolvedInput
+from scoreboard_app.core.vmix_scheduler import Timer, TimerHeap
+from scoreboard_app.core.vmix_queue import CommandQueue
+from scoreboard_app.core.vmix_snapshot import SnapshotCache
+from scoreboard_app.core.vmix_transport import HttpTransport
+from scoreboard_app.core.vmix_tcp import TcpTransport
+from scoreboard_app.core.vmix_writes import WriteFilter
+
+log = logging.getLogger(__name__)
 
 
 class VMixClient:
@@ -10,39 +24,132 @@ class VMixClient:
     - safe countdown control
     - overlay toggling
     - text updates
+    - pooled keep-alive HTTP transport with timeouts
+    - optional native TCP API transport (port 8099, pipelined)
+    - shared status snapshot (max age, single-flight, write-through)
+    - cached title -> input key resolution; commands address inputs by key
+    - outbound queue coalescing SetText/SetImage (last-write-wins per field)
+    - redundant SetText/SetImage suppression (value already on screen)
+    - batch(): independent commands fanned out concurrently
     """
 
-    def __init__(self, host="127.0.0.1", port=8088):
+    def __init__(self, host="127.0.0.1", port=8088,
+                 connect_timeout: float = 1.0,
+                 read_timeout: float = 3.0,
+                 pool_size: int = 4,
+                 transport: str = "http",
+                 tcp_port: int = 8099,
+                 snapshot_max_age_ms: float = 250.0,
+                 address_by_key: bool = True,
+                 coalesce_ms: float = 20.0):
         self.host = host
         self.port = port
+        self.pool_size = pool_size
         self.base_url = f"http://{self.host}:{self.port}/api/?"
-        self._cached_xml = None
 
-    # --------------------------------------------------
-    # Internal low-level GET wrapper
-    # --------------------------------------------------
-    def _get(self, query: str) -> str:
-        url = self.base_url + query
-        r = requests.get(url)
-        r.raise_for_status()
-        return r.text
+        if transport == "tcp":
+            self.transport = TcpTransport(
+                host, tcp_port,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+            )
+        else:
+            self.transport = HttpTransport(
+                host, port,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                pool_size=pool_size,
+            )
+
+        self.snapshots = SnapshotCache(self.transport.status_xml, snapshot_max_age_ms)
+        # batch() fan-out on HTTP: one bounded pool for every batch
+        self._batch_pool = ThreadPoolExecutor(max_workers=max(1, pool_size),
+                                              thread_name_prefix="vmix-batch")
+
+        self.resolver = InputResolver()
+        self.address_by_key = address_by_key
+        self._resolved_snap = None
+
+        # coalesce_ms <= 0 disables the queue (every write goes out directly)
+        self.queue = (CommandQueue(self._send, coalesce_ms, result_timeout=read_timeout)
+                      if coalesce_ms > 0 else None)
+        # longest a caller of call_function waits: a flush already in
+        # flight, the coalesce window, then its own flush
+        self.call_timeout = (2 * read_timeout + coalesce_ms / 1000.0) if self.queue else read_timeout
+
+        # last-known field values; trusts snapshots for 4x their max age
+        self.writes = WriteFilter(trust_ms=max(1000.0, 4 * snapshot_max_age_ms))
+        self._transport_gen = getattr(self.transport, "generation", 0)
+
+        # the one timer thread for delayed actions (after_delay)
+        self.timers = TimerHeap(name="vmix-timers")
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "VMixClient":
+        """
+        Builds a client from cfg["connection"] (falls back to cfg["vmix"]).
+        """
+        conn = cfg.get("connection") or cfg.get("vmix") or {}
+        return cls(
+            conn.get("host", "127.0.0.1"),
+            int(conn.get("port", 8088)),
+            connect_timeout=float(conn.get("connect_timeout", 1.0)),
+            read_timeout=float(conn.get("read_timeout", 3.0)),
+            pool_size=int(conn.get("pool_size", 4)),
+            transport=str(conn.get("transport", "http")).lower(),
+            tcp_port=int(conn.get("tcp_port", 8099)),
+            snapshot_max_age_ms=float(conn.get("snapshot_max_age_ms", 250)),
+            address_by_key=bool(conn.get("address_inputs_by_key", True)),
+            coalesce_ms=float(conn.get("coalesce_ms", 20)),
+        )
+
+    def transport_stats(self) -> dict:
+        """Reuse rate, open sockets and latency of the active transport"""
+        return self.transport.stats()
+
+    def write_stats(self) -> dict:
+        """How many SetText/SetImage were skipped as redundant"""
+        return self.writes.stats()
+
+    def resync(self):
+        """
+        Forgets every last-known value and expires the snapshot,
+        e.g. after vMix restarted or a preset was reloaded.
+        """
+        self.writes.reset()
+        self.snapshots.invalidate()
+
+    def close(self):
+        self.timers.close()
+        if self.queue is not None:
+            self.queue.close()
+        self._batch_pool.shutdown(wait=False)
+        self.transport.close()
 
     # --------------------------------------------------
     # vMix XML status
     # --------------------------------------------------
     def refresh_status(self):
         """Force refresh and return full XML"""
-        self._cached_xml = self.get_status_xml()
-        return self._cached_xml
+        return self.get_status_xml(max_age_ms=0)
 
-    def get_status_xml(self) -> str:
+    def get_status_xml(self, max_age_ms=None, allow_stale: bool = False) -> str:
         """
         Retrieves vMix status.
         vMix requires Function=None to return full XML.
+
+        Served from the shared snapshot when it is younger than max_age_ms
+        (default: snapshot_max_age_ms). allow_stale=True accepts any age.
+        """
+        snap = self.snapshots.get(max_age_ms, allow_stale, need_xml=True)
+        return snap.xml
+
+    def get_state(self, max_age_ms=None, allow_stale: bool = False) -> VMixState:
         """
-        xml = self._get("Function=None")
-        self._cached_xml = xml
-        return xml
+        Returns the status parsed + indexed.
+        One parse serves any number of lookups and callers.
+        """
+        return self.snapshots.get(max_age_ms, allow_stale).state
 
     # --------------------------------------------------
     # Parsing helpers
@@ -51,12 +158,10 @@ class VMixClient:
         """
         Returns every input title in the preset.
         """
-        xml = self.get_status_xml()
-        root = ET.fromstring(xml)
-
+        state = self.get_state()
         res = []
-        for inp in root.findall("./inputs/input"):
-            title = inp.get("title") or inp.get("shortTitle") or ""
+        for inp in state.inputs:
+            title = inp.title or inp.short_title
             if title:
                 res.append(title)
         return res
@@ -66,34 +171,149 @@ class VMixClient:
         Returns every <text name="..."> and <image name="..."> field for a specific title,
         suitable for mapping inside MappingDialog.
         """
-        xml = self.get_status_xml()
-        root = ET.fromstring(xml)
+        inp = self.get_state().find_input(input_name)
+        return inp.field_names() if inp else []
+
+    # --------------------------------------------------
+    # Input resolution (title/shortTitle/key/number -> number + GUID)
+    # --------------------------------------------------
+    def _sync_resolver(self):
+        snap = self.snapshots.peek()
+        if snap is not None and snap is not self._resolved_snap:
+            self.resolver.update(snap.state)
+            self._resolved_snap = snap
+
+    def resolve_input(self, name_or_number) -> Optional[ResolvedInput]:
+        """
+        Resolves an input via the cached table. Only fetches status when
+        the name is unknown to the current table.
+        """
+        self._sync_resolver()
+        r = self.resolver.resolve(name_or_number)
+        if r is None:
+            self.get_state()
+            self._sync_resolver()
+            r = self.resolver.resolve(name_or_number)
+        return r
+
+    def find_input_number(self, name_or_number) -> Optional[str]:
+        """
+        Resolves number / title / shortTitle / key to the input number (as str),
+        or None if not found.
+        """
+        if isinstance(name_or_number, int):
+            return str(name_or_number)
+        if str(name_or_number).strip().isdigit():
+            return str(name_or_number).strip()
 
-        for inp in root.findall("./inputs/input"):
-            title = inp.get("title") or inp.get("shortTitle")
-            if title != input_name:
-                continue
+        r = self.resolve_input(name_or_number)
+        return str(r.number) if r else None
 
-            fields = []
+    def _address(self, kwargs: dict) -> dict:
+        """
+        Swaps Input=<title/number> for the stable input key.
+        Left untouched if the input cannot be resolved.
+        """
+        inp = kwargs.get("Input")
+        if not self.address_by_key or inp is None:
+            return kwargs
+        try:
+            r = self.resolve_input(inp)
+        except Exception:
+            return kwargs
+        if r is None or not r.key:
+            return kwargs
+        return {**kwargs, "Input": r.key}
+
+    def get_text_from_title(self, input_name, field_name: str) -> str:
+        """
+        Reads a text field from a GT/Title input via one parsed snapshot.
+        """
+        inp = self.get_state().find_input(input_name)
+        if inp is None:
+            return ""
+        return inp.get_text(field_name).strip()
+
+    # --------------------------------------------------
+    # Targeted field reads
+    # --------------------------------------------------
+    @staticmethod
+    def _xpath_literal(value: str) -> str:
+        if "'" not in value:
+            return f"'{value}'"
+        if '"' not in value:
+            return f'"{value}"'
+        parts = value.split("'")
+        return "concat(" + ", \"'\", ".join(f"'{p}'" for p in parts) + ")"
+
+    @classmethod
+    def _field_xpath(cls, input_name, field_name: str) -> str:
+        s = str(input_name).strip()
+        if s.isdigit():
+            pred = f"@number={cls._xpath_literal(s)}"
+        else:
+            lit = cls._xpath_literal(s)
+            pred = f"@title={lit} or @shortTitle={lit} or @key={lit}"
+        return f"vmix/inputs/input[{pred}]/*[@name={cls._xpath_literal(field_name)}]"
+
+    def read_fields(self, pairs: list) -> dict:
+        """
+        Reads several title fields at once:
+            read_fields([("SCOREBOARD UPPE", "HomeP1time.Text"), ...])
+            -> {("SCOREBOARD UPPE", "HomeP1time.Text"): "01:45", ...}
 
-            for node in inp.findall("./text"):
-                nm = node.get("name")
-                if nm:
-                    fields.append(nm)
+        TCP transport: one pipelined XMLTEXT query per field (a few bytes each).
+        HTTP transport: ONE shared status XML download for all fields,
+        of which only the requested inputs are parsed.
+        Missing inputs/fields read as "".
+        """
+        pairs = [(i, f) for i, f in pairs if i and f]
+        if not pairs:
+            return {}
 
-            for node in inp.findall("./image"):
-                nm = node.get("name")
-                if nm:
-                    fields.append(nm)
+        if isinstance(self.transport, TcpTransport):
+            futs = [
+                (pair, self.transport.send_line("XMLTEXT", self._field_xpath(*pair)))
+                for pair in dict.fromkeys(pairs)
+            ]
+            out = {}
+            for pair, fut in futs:
+                try:
+                    out[pair] = (fut.result(timeout=self.transport.read_timeout) or "").strip()
+                except RuntimeError:
+                    # XMLTEXT ER -> field/input not found
+                    out[pair] = ""
+            return out
 
-            for node in inp.findall("./color"):
-                nm = node.get("name")
-                if nm:
-                    fields.append(nm)
+        targets = {}
+        for input_name, field_name in pairs:
+            targets.setdefault(input_name, set()).add(field_name)
+        values = self.project(Projection(targets)).values
+        return {pair: (values.get(pair) or "").strip() for pair in pairs}
 
-            return fields
+    def project(self, projection: Projection, max_age_ms=None,
+                allow_stale: bool = False) -> Projected:
+        """
+        Only the fields of projection (see core/vmix_projection), from the
+        shared snapshot. An already parsed snapshot is read directly;
+        otherwise just the target inputs of the raw XML are parsed.
+        """
+        snap = self.snapshots.get(max_age_ms, allow_stale)
+        xml = snap.xml
+        if xml is None or snap.parsed:
+            out = projection.from_state(snap.state)
+        else:
+            out = projection.extract(xml)
+        out.fetched_at = snap.fetched_at
+        return out
 
-        return []
+    def get_text(self, input_name, field_name: str) -> str:
+        """
+        Reads one title field. A bare name ("HomeScore") gets ".Text" appended.
+        """
+        if "." not in field_name:
+            field_name += ".Text"
+        return self.read_fields([(input_name, field_name)]).get((input_name, field_name), "")
 
     # --------------------------------------------------
     # Base API function executor
@@ -104,30 +324,155 @@ class VMixClient:
         e.g.
             call_function("SetText", Input="Scoreboard", SelectedName="HomeScore.Text", Value="5")
         """
-        parts = [f"Function={function}"]
-        for k, v in kwargs.items():
-            if v is None:
-                continue
-            parts.append(f"{k}={v}")
+        if self.queue is not None:
+            # through the queue so ordering with pending writes is kept
+            return self.queue.submit(function, kwargs).result(timeout=self.call_timeout)
+        return self._send(function, kwargs).result(timeout=self.call_timeout)
+
+    def send_function(self, function: str, **kwargs):
+        """
+        Same as call_function but returns a Future instead of waiting.
+        On the TCP transport many of these are pipelined on one socket;
+        on HTTP the call runs immediately and the Future is already done.
+        """
+        if self.queue is not None:
+            return self.queue.submit(function, kwargs)
+        return self._send(function, kwargs)
+
+    def _send(self, function: str, kwargs: dict):
+        """Single path to the transport: address by key, send, mirror into snapshot"""
+        gen = getattr(self.transport, "generation", 0)
+        if gen != self._transport_gen:
+            # reconnected: vMix may have restarted, nothing we know is certain
+            self._transport_gen = gen
+            self.resync()
+
+        if function not in ("SetText", "SetImage") and kwargs.get("SelectedName"):
+            # countdown functions rewrite the field inside vMix
+            self.writes.forget(self._write_key(kwargs.get("Input")), kwargs["SelectedName"])
+
+        kwargs = self._address(kwargs)
+        fut = self.transport.send(function, kwargs)
+        if not (fut.done() and fut.exception() is not None):
+            self.snapshots.apply_write(function, kwargs)
+        return fut
+
+    def flush(self, timeout=None) -> bool:
+        """Blocks until every queued command has been sent"""
+        if self.queue is None:
+            return True
+        return self.queue.flush(timeout)
+
+    # --------------------------------------------------
+    # Redundant-write suppression
+    # --------------------------------------------------
+    def _write_key(self, input_name) -> str:
+        """Stable key for the write table, without fetching status"""
+        self._sync_resolver()
+        r = self.resolver.resolve(input_name)
+        if r is not None and r.key:
+            return r.key.lower()
+        return str(input_name).strip().lower()
+
+    def _write_field(self, function: str, input_name, field_name: str, value, force: bool):
+        """
+        Sends SetText/SetImage unless vMix already shows that value.
+        Returns the Future, or None when the write was skipped.
+        """
+        key = self._write_key(input_name)
+        if not self.writes.check(self.snapshots.peek(), key, field_name, value, force):
+            return None
+
+        fut = self.send_function(function, Input=input_name, SelectedName=field_name, Value=value)
+        fut.add_done_callback(
+            lambda f: self.writes.done(key, field_name, ok=f.exception() is None)
+        )
+        return fut
+
+    # --------------------------------------------------
+    # Batch (parallel fan-out)
+    # --------------------------------------------------
+    def batch(self, commands: list, ordered_groups=None,
+              max_workers: Optional[int] = None,
+              timeout: Optional[float] = None) -> BatchResult:
+        """
+        Runs several commands concurrently and waits for all of them:
+
+            client.batch([
+                ("StopCountdown", {"Input": sb, "SelectedName": "HomeP1time.Text"}),
+                ("SetCountdown", {"Input": sb, "SelectedName": "HomeP1time.Text", "Value": "00:00"}),
+                ("SetTextVisibleOff", {"Input": sb, "SelectedName": "HomeP1nr.Text"}),
+            ])
+
+        Commands on the same input field keep their order; ordered_groups
+        ([[0, 2], ...], indices into commands) adds explicit sequences.
+        HTTP: bounded pool of max_workers (default pool_size) requests.
+        TCP: one pipelined burst.
+        Returns a BatchResult with per-command results and wall vs serial time.
+        """
+        # anything queued before the batch goes first
+        self.flush()
+
+        cmds = [normalize(c) for c in commands]
+        tracked = []
+        for function, params in cmds:
+            if function in ("SetText", "SetImage") and params.get("Input") is not None:
+                key = self._write_key(params["Input"])
+                field = params.get("SelectedName") or ""
+                self.writes.check(self.snapshots.peek(), key, field, params.get("Value"), force=True)
+                tracked.append((key, field))
+            else:
+                tracked.append(None)
 
-        query = "&".join(parts)
-        return self._get(query)
+        res = run_batch(
+            self._send, cmds, ordered_groups,
+            max_workers=max_workers or self.pool_size,
+            timeout=self.transport.read_timeout if timeout is None else timeout,
+            pipelined=isinstance(self.transport, TcpTransport),
+            executor=self._batch_pool,
+        )
+
+        for t, r in zip(tracked, res.results):
+            if t is not None:
+                self.writes.done(*t, ok=not isinstance(r, BaseException))
+        for (function, params), err in res.errors:
+            log.error(f"[BATCH] {function} {params} failed: {err}")
+        log.debug(f"[BATCH] {res.summary()}")
+        return res
 
     # --------------------------------------------------
     # TEXT UPDATE
     # --------------------------------------------------
-    def update_text(self, input_name: str, field_name: str, value: str):
+    def update_text(self, input_name: str, field_name: str, value: str, force: bool = False):
+        """
+        Does NOT wait for vMix: the write is queued and coalesced and its
+        Future is returned (None when skipped). A failure does not raise
+        here – it is logged by the queue and set on the Future, so a
+        caller that must know calls .result(timeout=...) on it.
+        Skipped when the field already shows value (force=True always sends).
+        """
         if not input_name or not field_name:
-            return
-        self.call_function("SetText", Input=input_name, SelectedName=field_name, Value=value)
+            return None
+        return self._write_field("SetText", input_name, field_name, value, force)
+
+    # Names used by the controllers
+    def set_text(self, input_name: str, field_name: str, value: str, force: bool = False):
+        return self.update_text(input_name, field_name, value, force)
+
+    def title_set_text(self, input_name: str, field_name: str, value: str, force: bool = False):
+        return self.update_text(input_name, field_name, value, force)
 
     # --------------------------------------------------
     # IMAGE UPDATE
     # --------------------------------------------------
-    def update_image(self, input_name: str, field_name: str, path_or_url: str):
+    def update_image(self, input_name: str, field_name: str, path_or_url: str, force: bool = False):
+        """Same contract as update_text: returns the Future, None when skipped"""
         if not input_name or not field_name:
-            return
-        self.call_function("SetImage", Input=input_name, SelectedName=field_name, Value=path_or_url)
+            return None
+        return self._write_field("SetImage", input_name, field_name, path_or_url, force)
+
+    def set_image(self, input_name: str, field_name: str, path_or_url: str, force: bool = False):
+        return self.update_image(input_name, field_name, path_or_url, force)
 
     # --------------------------------------------------
     # OVERLAY TOGGLE
@@ -135,6 +480,22 @@ class VMixClient:
     def overlay_toggle(self, overlay_number: int):
         self.call_function("OverlayInput", Value=str(overlay_number))
 
+    def overlay_on(self, input_name, overlay_number: int):
+        self.call_function(f"OverlayInput{int(overlay_number)}In", Input=input_name)
+
+    def overlay_off(self, input_name, overlay_number: int):
+        self.call_function(f"OverlayInput{int(overlay_number)}Out", Input=input_name)
+
+    # --------------------------------------------------
+    # DELAYED ACTIONS
+    # --------------------------------------------------
+    def after_delay(self, delay_ms: float, fn, *args, name: str = "") -> Timer:
+        """
+        Runs fn(*args) on the shared timer thread after delay_ms.
+        The returned Timer can be cancelled / rescheduled; see timers.inspect().
+        """
+        return self.timers.call_later(float(delay_ms) / 1000.0, fn, *args, name=name)
+
     # --------------------------------------------------
     # COUNTDOWN LOGIC (correct vMix usage)
     # --------------------------------------------------
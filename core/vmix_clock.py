@@ -0,0 +1,259 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+log = logging.getLogger(__name__)
+
+# drift above this is logged at INFO, below at DEBUG
+DRIFT_LOG_MS = 250.0
+
+
+def parse_clock(value) -> Optional[float]:
+    """
+    "MM:SS", "MM:SS.f" or "SS.f" -> seconds (float), None if not a time.
+    """
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        if ":" in value:
+            mm, ss = value.split(":", 1)
+            secs = int(mm) * 60 + float(ss)
+        else:
+            secs = float(value)
+    except ValueError:
+        return None
+    return secs if secs >= 0 else None
+
+
+def format_clock(secs: float, tenths: bool = False) -> str:
+    """Seconds -> "MM:SS" (floored, like the countdown shows it)"""
+    secs = max(0.0, secs)
+    whole = int(secs)
+    text = f"{whole // 60:02d}:{whole % 60:02d}"
+    if tenths:
+        text += f".{int((secs - whole) * 10)}"
+    return text
+
+
+class ClockModel:
+    """
+    Local model of a vMix countdown between polls.
+
+    Anchored on the last known value + running flag and extrapolated with
+    time.monotonic(), so the UI can render at 10 Hz without any network
+    I/O. Local commands (start/pause/set/adjust) move the anchor at once;
+    observe() resyncs on every fresh snapshot and records the drift
+    between what the model predicted and what vMix showed.
+
+    vMix shows whole seconds: an observed "19:01" means the real value is
+    somewhere in [19:01, 19:02). A prediction inside that window is not
+    drift (the sub-second phase is kept); outside it, the model is pulled
+    to the nearest edge and the distance is the drift.
+
+    played() is the game time that has run (only while running and above
+    00:00). adjust() counts as a correction of it (+5 s on the clock = 5 s
+    less played; the penalties are adjusted in the same burst), set()
+    jumps do not count. Things that run with the match
+    clock (penalties) schedule against it and re-plan from subscribe()
+    callbacks, which fire after every anchor change.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic,
+                 drift_log_ms: float = DRIFT_LOG_MS, name: str = "clock"):
+        self._clock = clock
+        self.drift_log_ms = drift_log_ms
+        self.name = name
+        self._lock = threading.Lock()
+
+        self._value: Optional[float] = None   # seconds at _at
+        self._at = 0.0
+        # time of the last local command: older snapshots predate it
+        self._local_at = float("-inf")
+        # game seconds run up to _at
+        self._played = 0.0
+        self._listeners: list = []
+        self._running = False
+        # False until a snapshot confirmed the value (e.g. after StopCountdown)
+        self.synced = False
+
+        self.observations = 0
+        self.resyncs = 0
+        self.last_drift_ms = 0.0
+        self.max_drift_ms = 0.0
+        self._abs_drift_sum = 0.0
+
+    # --------------------------------------------------
+    # Reading (no I/O, any thread)
+    # --------------------------------------------------
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def remaining(self, now: Optional[float] = None) -> Optional[float]:
+        with self._lock:
+            return self._remaining(self._clock() if now is None else now)
+
+    def _remaining(self, now: float) -> Optional[float]:
+        if self._value is None:
+            return None
+        if not self._running:
+            return self._value
+        return max(0.0, self._value - (now - self._at))
+
+    def text(self, now: Optional[float] = None, tenths: bool = False) -> str:
+        secs = self.remaining(now)
+        return "--:--" if secs is None else format_clock(secs, tenths)
+
+    def played(self, now: Optional[float] = None) -> float:
+        with self._lock:
+            now = self._clock() if now is None else now
+            cur = self._remaining(now)
+            if cur is None or not self.synced:
+                return self._played
+            return self._played + max(0.0, self._value - cur)
+
+    # --------------------------------------------------
+    # Listeners
+    # --------------------------------------------------
+    def subscribe(self, callback: Callable) -> None:
+        """callback(model) after every anchor change (any thread)"""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self):
+        for cb in list(self._listeners):
+            try:
+                cb(self)
+            except Exception as e:
+                log.error(f"[CLOCK] listener failed: {e}")
+
+    def _fold(self, now: float) -> Optional[float]:
+        """Moves the anchor to now, adding the game time run since _at"""
+        cur = self._remaining(now)
+        if cur is not None and self.synced:
+            self._played += self._value - cur
+        self._value = cur
+        self._at = now
+        return cur
+
+    # --------------------------------------------------
+    # Local commands (what we just told vMix)
+    # --------------------------------------------------
+    def set(self, secs: float, running: Optional[bool] = None, at: Optional[float] = None) -> None:
+        with self._lock:
+            now = self._clock() if at is None else at
+            self._fold(now)
+            self._value = float(secs)
+            self._at = self._local_at = now
+            self.synced = True
+            if running is not None:
+                self._running = running
+        self._notify()
+
+    def set_running(self, running: bool, at: Optional[float] = None) -> None:
+        with self._lock:
+            now = self._clock() if at is None else at
+            self._fold(now)
+            self._local_at = now
+            self._running = running
+        self._notify()
+
+    def adjust(self, seconds: float) -> None:
+        with self._lock:
+            now = self._clock()
+            value = self._fold(now)
+            if value is None:
+                return
+            self._value = max(0.0, value + seconds)
+            if self.synced:
+                self._played -= self._value - value
+            self._local_at = now
+        self._notify()
+
+    def invalidate(self, running: bool = False) -> None:
+        """Value unknown until the next observe() (e.g. after StopCountdown)"""
+        with self._lock:
+            now = self._clock()
+            self._fold(now)
+            self._running = running
+            self._local_at = now
+            self.synced = False
+        self._notify()
+
+    # --------------------------------------------------
+    # Resync from vMix
+    # --------------------------------------------------
+    def observe(self, value, at: Optional[float] = None,
+                running: Optional[bool] = None) -> Optional[float]:
+        """
+        value: the countdown text vMix showed (or seconds) at monotonic
+        time at (the snapshot's fetched_at). Returns the drift in ms
+        (observed - predicted), None if value is not a time or the
+        snapshot is older than the last local command.
+        """
+        secs = value if isinstance(value, (int, float)) else parse_clock(value)
+        if secs is None:
+            return None
+        with self._lock:
+            at = self._clock() if at is None else at
+            if at < self._local_at:
+                return None
+            was_running = self._running
+            predicted = self._fold(at)
+            if running is not None:
+                self._running = running
+            low, high = float(secs), float(secs) + 1.0
+
+            if predicted is None or not self.synced:
+                # no trustworthy prediction: middle of the window while running
+                drift_ms = 0.0
+                target = low + 0.5 if self._running and low > 0 else low
+            elif not was_running:
+                # paused: vMix holds the value, take it as is
+                drift_ms = (low - predicted) * 1000.0 if not low <= predicted < high else 0.0
+                target = low
+            elif predicted < low:
+                drift_ms, target = (low - predicted) * 1000.0, low
+            elif predicted >= high:
+                drift_ms, target = (high - predicted) * 1000.0, high - 0.001
+            else:
+                drift_ms, target = 0.0, predicted
+
+            first = not self.synced
+            if not first and predicted is not None:
+                # vMix ran more (or less) than predicted: so did its penalties
+                self._played += predicted - target
+            self._value = target
+            self._at = at
+            self.synced = True
+            changed = first or bool(drift_ms) or was_running != self._running
+            self.observations += 1
+            if drift_ms:
+                self.resyncs += 1
+            self.last_drift_ms = drift_ms
+            self.max_drift_ms = max(self.max_drift_ms, abs(drift_ms))
+            self._abs_drift_sum += abs(drift_ms)
+
+        if first:
+            log.debug(f"[CLOCK] {self.name} synced at {format_clock(target)}")
+        elif abs(drift_ms) >= self.drift_log_ms:
+            log.info(f"[CLOCK] {self.name} drift {drift_ms:+.0f} ms (vMix {format_clock(low)})")
+        elif drift_ms:
+            log.debug(f"[CLOCK] {self.name} drift {drift_ms:+.0f} ms")
+        if changed:
+            self._notify()
+        return drift_ms
+
+    def stats(self) -> dict:
+        return {
+            "observations": self.observations,
+            "resyncs": self.resyncs,
+            "last_drift_ms": self.last_drift_ms,
+            "max_drift_ms": self.max_drift_ms,
+            "mean_abs_drift_ms": self._abs_drift_sum / self.observations if self.observations else 0.0,
+        }
@@ -0,0 +1,147 @@
+"""
+vmix_diff.py
+-------------
+Jämför två på varandra följande VMixState och ger bara det som ändrats:
+
+    FieldChanged(input, field, old, new, key)   – text/bild/färg-fält
+    OverlayChanged(channel, input, active)      – se vmix_events
+    TallyChanged(program, preview)              – se vmix_events
+
+Inputs vars fält-index är identiska (samma objekt eller lika dict,
+jämfört på C-nivå) hoppas över, så Python-arbetet per varv växer med
+antalet ändringar – inte med presetens storlek.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Iterable, List, NamedTuple, Optional
+
+from scoreboard_app.core.vmix_api_types import VMixInput, VMixState
+from scoreboard_app.core.vmix_events import OverlayChanged, TallyChanged
+
+
+class FieldChanged(NamedTuple):
+    """Ett fält i en input fick nytt värde (old=None: första snapshoten)"""
+    input: str
+    field: str
+    old: Optional[str]
+    new: Optional[str]
+    key: str = ""
+
+
+_INDEXES = ("_text_index", "_image_index", "_color_index")
+
+
+def field_indexes(inp: VMixInput) -> tuple:
+    """(text, image, color) fält-index – set_field byter dem, muterar dem aldrig"""
+    return tuple(getattr(inp, attr) for attr in _INDEXES)
+
+
+def _field_changes(old: Optional[tuple], new: VMixInput) -> List[FieldChanged]:
+    name = new.title or new.short_title or str(new.number)
+    out: List[FieldChanged] = []
+    for i, n in enumerate(field_indexes(new)):
+        o = old[i] if old is not None else None
+        if o is n or o == n:
+            continue
+        o = o or {}
+        for f, v in n.items():
+            if o.get(f) != v:
+                out.append(FieldChanged(name, f, o.get(f), v, new.key))
+        for f in o.keys() - n.keys():
+            out.append(FieldChanged(name, f, o[f], None, new.key))
+    return out
+
+
+def _targets(state: VMixState, inputs: Optional[Iterable[str]]) -> List[VMixInput]:
+    if inputs is None:
+        return state.inputs
+    return [i for i in (state.find_input(n) for n in inputs) if i is not None]
+
+
+def capture(state: VMixState, inputs: Optional[Iterable[str]] = None) -> dict:
+    """key (eller nummer) -> field_indexes(), det diff_states jämför mot"""
+    return {(inp.key or inp.number): field_indexes(inp) for inp in _targets(state, inputs)}
+
+
+def diff_states(old: Optional[VMixState], new: VMixState,
+                inputs: Optional[Iterable[str]] = None,
+                old_fields: Optional[dict] = None) -> list:
+    """
+    Ändringar från old till new. old=None ger alla fält (old=None) men
+    inga overlay/tally-events. inputs begränsar fältjämförelsen till
+    vissa inputs (titel/korttitel/key/nummer). old_fields = capture(old)
+    från när old var aktuell (om old har patchats sedan dess).
+    """
+    if old_fields is None:
+        old_fields = capture(old, inputs) if old is not None else {}
+
+    changes: list = []
+    for inp in _targets(new, inputs):
+        prev = old_fields.get(inp.key or inp.number)
+        changes.extend(_field_changes(prev, inp))
+
+    if old is None:
+        return changes
+
+    for ch in sorted(old.overlays.keys() | new.overlays.keys()):
+        was, now = old.overlays.get(ch), new.overlays.get(ch)
+        if was == now:
+            continue
+        if was is not None:
+            changes.append(OverlayChanged(ch, was, False))
+        if now is not None:
+            changes.append(OverlayChanged(ch, now, True))
+
+    if (old.active, old.preview) != (new.active, new.preview):
+        changes.append(TallyChanged(
+            frozenset({new.active}) if new.active is not None else frozenset(),
+            frozenset({new.preview}) if new.preview is not None else frozenset(),
+        ))
+    return changes
+
+
+class SnapshotDiff:
+    """
+    Håller förra snapshoten och ger ändringarna för varje ny.
+    Samma snapshot-objekt två gånger, eller en ny snapshot med oförändrad
+    body (delad state, se SnapshotCache) -> inga ändringar (inget arbete).
+    """
+
+    def __init__(self, inputs: Optional[Iterable[str]] = None):
+        self.inputs = list(inputs) if inputs is not None else None
+        self._lock = threading.Lock()
+        self._snap = None
+        self._version = -1
+        self._state: Optional[VMixState] = None
+        self._fields: Optional[dict] = None
+
+        self.diffs = 0
+        self.changes = 0
+
+    def feed(self, snap) -> list:
+        with self._lock:
+            if snap is self._snap and snap.version == self._version:
+                return []
+            state = snap.state
+            if state is self._state and snap.version == 0 and self._version == 0:
+                # byte-identical body, parse shared by the snapshot cache
+                self._snap = snap
+                return []
+            changes = diff_states(self._state, state, self.inputs, self._fields)
+            self._snap = snap
+            self._version = snap.version
+            self._state = state
+            # lokala patchar byter index-dicten; vi behåller de nuvarande
+            self._fields = capture(state, self.inputs)
+            self.diffs += 1
+            self.changes += len(changes)
+            return changes
+
+    def reset(self) -> None:
+        with self._lock:
+            self._snap = None
+            self._version = -1
+            self._state = None
+            self._fields = None
@@ -0,0 +1,234 @@
+"""
+vmix_events.py
+---------------
+Push-baserad vMix-state via TCP API:n (SUBSCRIBE TALLY / SUBSCRIBE ACTS).
+
+vMix skickar rader som:
+    TALLY OK 0121000
+    ACTS OK Input 3 1
+    ACTS OK Overlay1 5 1
+
+VMixEventService gör om dem till typade Python-events och publicerar dem
+till prenumeranter. Callbacks körs på TCP-läsartråden – GUI-kod ska
+själv flytta arbetet till Tk-tråden (t.ex. via en flagga + after()).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, FrozenSet, List, Optional
+
+from scoreboard_app.core.vmix_tcp import TcpTransport
+
+log = logging.getLogger(__name__)
+
+
+# ------------------------------------------------------------
+# Event-typer
+# ------------------------------------------------------------
+
+@dataclass(frozen=True)
+class TallyChanged:
+    """Ny tally-sträng: vilka inputs som är på program/preview"""
+    program: FrozenSet[int]
+    preview: FrozenSet[int]
+
+
+@dataclass(frozen=True)
+class InputOnAir:
+    """En input gick på/av program (ACTS Input)"""
+    input: int
+    on_air: bool
+
+
+@dataclass(frozen=True)
+class OverlayChanged:
+    """En input gick in/ut på en overlay-kanal (ACTS OverlayN)"""
+    channel: int
+    input: int
+    active: bool
+
+
+@dataclass(frozen=True)
+class ActivatorEvent:
+    """Övriga ACTS-rader (InputPlaying, InputVolume, ...)"""
+    name: str
+    input: Optional[int]
+    value: str
+
+
+# ------------------------------------------------------------
+# Parsning
+# ------------------------------------------------------------
+
+def parse_tally(payload: str) -> TallyChanged:
+    program = set()
+    preview = set()
+    for i, ch in enumerate(payload.strip(), start=1):
+        if ch == "1":
+            program.add(i)
+        elif ch == "2":
+            preview.add(i)
+    return TallyChanged(frozenset(program), frozenset(preview))
+
+
+def parse_acts(payload: str):
+    parts = payload.split()
+    if not parts:
+        return None
+
+    name = parts[0]
+    inp = None
+    if len(parts) > 1 and parts[1].isdigit():
+        inp = int(parts[1])
+    value = parts[-1] if len(parts) > 2 else ""
+
+    if name == "Input" and inp is not None:
+        return InputOnAir(inp, value == "1")
+
+    if name.startswith("Overlay") and name[7:].isdigit() and inp is not None:
+        return OverlayChanged(int(name[7:]), inp, value == "1")
+
+    return ActivatorEvent(name, inp, value)
+
+
+# ------------------------------------------------------------
+# Watch – enkel "något relevant har hänt"-flagga
+# ------------------------------------------------------------
+
+class EventWatch:
+    """
+    Sätts när ett matchande event kommer. pop() returnerar True en gång
+    per batch av events, så en poll-loop kan hoppa över XML-hämtning
+    när inget hänt.
+    """
+
+    def __init__(self, predicate: Optional[Callable[[object], bool]] = None):
+        self.predicate = predicate
+        self._flag = threading.Event()
+
+    def _offer(self, event) -> None:
+        if self.predicate is None or self.predicate(event):
+            self._flag.set()
+
+    def mark(self) -> None:
+        self._flag.set()
+
+    def pop(self) -> bool:
+        if self._flag.is_set():
+            self._flag.clear()
+            return True
+        return False
+
+
+# ------------------------------------------------------------
+# Service
+# ------------------------------------------------------------
+
+class VMixEventService:
+    """
+    Öppnar en egen TCP-anslutning, prenumererar på TALLY och ACTS och
+    publicerar typade events. Återansluter automatiskt.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8099,
+                 connect_timeout: float = 1.0,
+                 reconnect_s: float = 2.0):
+        self.transport = TcpTransport(host, port,
+                                      connect_timeout=connect_timeout,
+                                      on_event=self._on_line)
+        self.reconnect_s = reconnect_s
+
+        self._listeners: List[Callable[[object], None]] = []
+        self._watches: List[EventWatch] = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_tally: Optional[TallyChanged] = None
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> "VMixEventService":
+        conn = cfg.get("connection") or cfg.get("vmix") or {}
+        return cls(
+            conn.get("host", "127.0.0.1"),
+            int(conn.get("tcp_port", 8099)),
+            connect_timeout=float(conn.get("connect_timeout", 1.0)),
+        )
+
+    # --------------------------------------------------
+    # Prenumeration
+    # --------------------------------------------------
+    def subscribe(self, callback: Callable[[object], None]) -> None:
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[object], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def watch(self, predicate: Optional[Callable[[object], bool]] = None) -> EventWatch:
+        """
+        Skapar en EventWatch. Den är markerad från början så att första
+        poll-varvet alltid läser state.
+        """
+        w = EventWatch(predicate)
+        w.mark()
+        self._watches.append(w)
+        return w
+
+    # --------------------------------------------------
+    # Livscykel
+    # --------------------------------------------------
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="vmix-events", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.transport.close()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if not self.transport.connected:
+                tally = self.transport.send_line("SUBSCRIBE", "TALLY")
+                if self.transport.connected:
+                    self.transport.send_line("SUBSCRIBE", "ACTS")
+                    # allt kan ha ändrats medan vi var bortkopplade
+                    for w in self._watches:
+                        w.mark()
+                elif tally.done():
+                    log.debug(f"[EVENTS] connect failed: {tally.exception()}")
+            self._stop.wait(self.reconnect_s)
+
+    # --------------------------------------------------
+    # Inkommande rader
+    # --------------------------------------------------
+    def _on_line(self, command: str, status: str, payload: str) -> None:
+        if status != "OK":
+            return
+
+        event = None
+        if command == "TALLY":
+            event = parse_tally(payload)
+            if event == self._last_tally:
+                return
+            self._last_tally = event
+        elif command == "ACTS":
+            event = parse_acts(payload)
+
+        if event is None:
+            return
+        self._publish(event)
+
+    def _publish(self, event) -> None:
+        for w in list(self._watches):
+            w._offer(event)
+        for cb in list(self._listeners):
+            try:
+                cb(event)
+            except Exception as e:
+                log.error(f"[EVENTS] listener failed: {e}")
@@ -0,0 +1,183 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from scoreboard_app.core.vmix_batch import normalize
+from scoreboard_app.core.vmix_clock import ClockModel
+from scoreboard_app.core.vmix_io import IOWorker
+from scoreboard_app.core.vmix_scheduler import Timer, TimerHeap
+
+log = logging.getLogger(__name__)
+
+
+class _Armed:
+    __slots__ = ("key", "expires", "commands", "timer", "armed_at")
+
+    def __init__(self, key: str, expires: float, commands: List[tuple]):
+        self.key = key
+        self.armed_at = time.monotonic()
+        # ClockModel.played() value at which the penalty is over
+        self.expires = expires
+        self.commands = commands
+        self.timer: Optional[Timer] = None
+
+
+class PenaltyScheduler:
+    """
+    Fires each penalty's clear at the moment it runs out, computed from
+    the match ClockModel instead of waiting for a poll to see 00:00.
+
+    - arm(key, seconds, clear_commands): the penalty ends when the model
+      has played `seconds` more game time. The clear batch is normalized
+      once here, so at expiry it goes out as one client.batch() flush.
+    - every model change (start, pause, adjust, resync) re-plans the
+      timers: paused clock -> no timers, running -> one per penalty.
+      A penalty the period ends before is simply not scheduled until
+      the clock runs again.
+    - send(commands) performs the clear (default: nothing, just on_expire)
+
+    Timers live on the client's shared heap (timers=client.timers). The
+    timer thread only decides; the clear runs on `lane` of the app's
+    IOWorker (io) so a hanging vMix never holds up the other timers on
+    that heap. on_expire(key) is handed to deliver(callback, arg) when
+    given (e.g. TkIO.post -> Tk thread), otherwise it runs after the clear
+    on that lane. late_ms keeps the last `history` expiries.
+    """
+
+    def __init__(self, model: ClockModel, io: IOWorker, timers: TimerHeap,
+                 send: Optional[Callable[[list], object]] = None,
+                 on_expire: Optional[Callable[[str], None]] = None,
+                 deliver: Optional[Callable[[Callable, Any], None]] = None,
+                 lane: str = "penalty",
+                 history: int = 500):
+        self.model = model
+        self.send = send
+        self.timers = timers
+        self.on_expire = on_expire
+        self.deliver = deliver
+        # owned by the app, never closed here
+        self.io = io
+        self.lane = lane
+        self._lock = threading.Lock()
+        self._armed: Dict[str, _Armed] = {}
+
+        self.expired = 0
+        self.late_ms: deque = deque(maxlen=history)
+
+        model.subscribe(self._replan)
+
+    # --------------------------------------------------
+    # Penalties
+    # --------------------------------------------------
+    def arm(self, key: str, seconds: float, clear_commands: list) -> None:
+        commands = [normalize(c) for c in clear_commands]
+        with self._lock:
+            old = self._armed.pop(key, None)
+            if old is not None and old.timer is not None:
+                old.timer.cancel()
+            self._armed[key] = _Armed(key, self.model.played() + seconds, commands)
+        self._replan(self.model)
+
+    def disarm(self, key: str) -> bool:
+        with self._lock:
+            slot = self._armed.pop(key, None)
+        if slot is None:
+            return False
+        if slot.timer is not None:
+            slot.timer.cancel()
+        return True
+
+    def remaining(self, key: str) -> Optional[float]:
+        """Game seconds left on a penalty (None = not armed)"""
+        with self._lock:
+            slot = self._armed.get(key)
+        return None if slot is None else max(0.0, slot.expires - self.model.played())
+
+    def resync(self, key: str, seconds: float, at: Optional[float] = None,
+               tolerance: float = 1.0) -> None:
+        """
+        vMix showed `seconds` left (at monotonic time at, e.g. a snapshot's
+        fetched_at): move the expiry if we are off by more than tolerance.
+        Readings from before the penalty was armed are ignored.
+        """
+        with self._lock:
+            slot = self._armed.get(key)
+            if slot is None or (at is not None and at <= slot.armed_at):
+                return
+            expires = self.model.played(at) + seconds
+            if abs(expires - slot.expires) <= tolerance:
+                return
+            log.debug(f"[PENALTY] {key} resync {expires - slot.expires:+.1f} s")
+            slot.expires = expires
+        self._replan(self.model)
+
+    def armed(self) -> Dict[str, float]:
+        with self._lock:
+            keys = list(self._armed)
+        return {k: self.remaining(k) for k in keys}
+
+    # --------------------------------------------------
+    # Timers
+    # --------------------------------------------------
+    def _replan(self, model: ClockModel) -> None:
+        now = time.monotonic()
+        played = model.played(now)
+        clock_left = model.remaining(now)
+        with self._lock:
+            for slot in self._armed.values():
+                if slot.timer is not None:
+                    slot.timer.cancel()
+                    slot.timer = None
+                if not model.running:
+                    continue
+                left = slot.expires - played
+                if clock_left is not None and left > clock_left:
+                    continue  # period ends first; re-planned when the clock runs again
+                slot.timer = self.timers.call_at(now + max(0.0, left), self._fire, slot,
+                                                 name=f"penalty {slot.key}")
+
+    def _fire(self, slot: _Armed) -> None:
+        with self._lock:
+            if self._armed.get(slot.key) is not slot:
+                return
+            left = slot.expires - self.model.played()
+            if left > 0.05:
+                if not self.model.running:
+                    slot.timer = None   # re-planned on resume
+                    return
+                # model moved since this timer was planned
+                slot.timer = self.timers.call_later(left, self._fire, slot, name=f"penalty {slot.key}")
+                return
+            del self._armed[slot.key]
+            self.expired += 1
+            self.late_ms.append(-left * 1000.0)
+
+        log.info(f"[PENALTY] {slot.key} expired")
+        self.io.submit(self._clear, slot, lane=self.lane)
+
+    def _clear(self, slot: _Armed) -> None:
+        # IOWorker lane, never the timer thread
+        if self.send is not None and slot.commands:
+            try:
+                self.send(slot.commands)
+            except Exception as e:
+                log.error(f"[PENALTY] clear {slot.key} failed: {e}")
+        if self.on_expire is None:
+            return
+        if self.deliver is not None:
+            self.deliver(self.on_expire, slot.key)
+            return
+        try:
+            self.on_expire(slot.key)
+        except Exception as e:
+            log.error(f"[PENALTY] on_expire {slot.key} failed: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            for slot in self._armed.values():
+                if slot.timer is not None:
+                    slot.timer.cancel()
+            self._armed.clear()
+        self.model.unsubscribe(self._replan)
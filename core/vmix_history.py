@@ -0,0 +1,306 @@
+"""
+vmix_history.py
+----------------
+Kompakt historik av vMix-snapshots (för diff och replay).
+
+En VMixState håller ett objekt per fält och ett dict per input – tusen
+sparade snapshots blir tusen kopior av hela presetet. Här sparas i stället:
+
+    PresetSchema     en per preset: inputs + fältnamn (internerade),
+                     delas av alla snapshots med samma fältuppsättning
+    CompactSnapshot  __slots__: en tuple med strängvärden per bevakad
+                     input, i schemats ordning
+
+Oförändrade inputs återanvänder förra snapshotens tuple (och oförändrade
+värden samma str-objekt), så en snapshot där bara klockan tickat kostar
+en ny tuple för scoreboard-inputen och lite till.
+
+    hist = SnapshotHistory(maxlen=1000, inputs=["SCOREBOARD UPPE"])
+    hist.append(client.snapshots.get())
+    hist[-1].get("SCOREBOARD UPPE", "Time.Text")
+
+python -m scoreboard_app.core.vmix_history  mäter minnet för 1000
+sparade snapshots av resources/vMix-API-XML.txt.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from scoreboard_app.core.vmix_api_types import VMixInput, VMixState
+from scoreboard_app.core.vmix_diff import FieldChanged, field_indexes
+
+
+class InputSchema:
+    """Fältnamnen för en input, i samma ordning som dess värde-tuple"""
+
+    __slots__ = ("number", "key", "title", "names", "index")
+
+    def __init__(self, inp: VMixInput, names: Tuple[str, ...]):
+        self.number = inp.number
+        self.key = sys.intern(inp.key)
+        self.title = sys.intern(inp.title or inp.short_title or str(inp.number))
+        self.names = names
+        # första förekomsten vinner, som VMixInput.get_field (text före image)
+        self.index: Dict[str, int] = {}
+        for i, n in enumerate(names):
+            self.index.setdefault(n, i)
+
+
+class PresetSchema:
+    """Bevakade inputs och deras fält; delas så länge presetet inte ändras"""
+
+    __slots__ = ("inputs", "signature", "_by_name")
+
+    def __init__(self, inputs: List[InputSchema]):
+        self.inputs: Tuple[InputSchema, ...] = tuple(inputs)
+        self.signature = tuple((s.key, s.names) for s in self.inputs)
+        self._by_name: Dict[str, int] = {}
+        for pos, s in enumerate(self.inputs):
+            for nm in (s.key.lower(), s.title.strip().lower(), str(s.number)):
+                self._by_name.setdefault(nm, pos)
+
+    def position(self, input_name) -> Optional[int]:
+        return self._by_name.get(str(input_name).strip().lower())
+
+
+class CompactSnapshot:
+    """En snapshot: en värde-tuple per bevakad input + overlays/tally"""
+
+    __slots__ = ("fetched_at", "schema", "values", "overlays", "active", "preview")
+
+    def __init__(self, fetched_at: float, schema: PresetSchema, values: tuple,
+                 overlays: tuple, active: Optional[int], preview: Optional[int]):
+        self.fetched_at = fetched_at
+        self.schema = schema
+        self.values = values
+        self.overlays = overlays
+        self.active = active
+        self.preview = preview
+
+    def get(self, input_name, field_name: str) -> Optional[str]:
+        pos = self.schema.position(input_name)
+        if pos is None:
+            return None
+        i = self.schema.inputs[pos].index.get(field_name)
+        return None if i is None else self.values[pos][i]
+
+    def fields(self, input_name) -> Dict[str, str]:
+        pos = self.schema.position(input_name)
+        if pos is None:
+            return {}
+        return dict(zip(self.schema.inputs[pos].names, self.values[pos]))
+
+
+def _names(inp: VMixInput) -> Tuple[str, ...]:
+    return tuple(n for index in field_indexes(inp) for n in index)
+
+
+def _values(inp: VMixInput) -> Tuple[str, ...]:
+    return tuple(v for index in field_indexes(inp) for v in index.values())
+
+
+def compact_changes(old: Optional[CompactSnapshot], new: CompactSnapshot) -> List[FieldChanged]:
+    """FieldChanged mellan två kompakta snapshots (samma schema: tuple-identitet räcker)"""
+    out: List[FieldChanged] = []
+    same_schema = old is not None and old.schema is new.schema
+    for pos, s in enumerate(new.schema.inputs):
+        now = new.values[pos]
+        if same_schema:
+            was = old.values[pos]
+            if was is now:
+                continue
+            for n, o, v in zip(s.names, was, now):
+                if o != v:
+                    out.append(FieldChanged(s.title, n, o, v, s.key))
+        else:
+            was = old.fields(s.key) if old is not None else {}
+            for n, v in zip(s.names, now):
+                if was.get(n) != v:
+                    out.append(FieldChanged(s.title, n, was.get(n), v, s.key))
+    return out
+
+
+class SnapshotHistory:
+    """
+    Ringbuffert med de senaste maxlen snapshotarna i kompakt form.
+    inputs=None bevakar alla inputs i presetet.
+    """
+
+    def __init__(self, maxlen: int = 1000, inputs: Optional[Iterable[str]] = None):
+        self.inputs = list(inputs) if inputs is not None else None
+        self._items: "deque[CompactSnapshot]" = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        # senaste schema + per input: (index-refs, värde-tuple) för återanvändning
+        self._schema: Optional[PresetSchema] = None
+        self._names: Dict[tuple, Tuple[str, ...]] = {}
+        self._last: Dict[str, tuple] = {}
+        self._overlays: tuple = ()
+
+        self.schemas = 0
+        self.reused = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, i) -> CompactSnapshot:
+        return self._items[i]
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def _targets(self, state: VMixState) -> List[VMixInput]:
+        if self.inputs is None:
+            return state.inputs
+        return [i for i in (state.find_input(n) for n in self.inputs) if i is not None]
+
+    def _intern_names(self, inp: VMixInput) -> Tuple[str, ...]:
+        names = _names(inp)
+        shared = self._names.get(names)
+        if shared is None:
+            shared = tuple(sys.intern(n) for n in names)
+            self._names[shared] = shared
+        return shared
+
+    def append(self, snap_or_state, fetched_at: Optional[float] = None) -> CompactSnapshot:
+        """Lägger till en Snapshot (vmix_snapshot) eller VMixState"""
+        if isinstance(snap_or_state, VMixState):
+            state = snap_or_state
+            fetched_at = time.monotonic() if fetched_at is None else fetched_at
+        else:
+            state = snap_or_state.state
+            fetched_at = snap_or_state.fetched_at if fetched_at is None else fetched_at
+
+        with self._lock:
+            targets = self._targets(state)
+            names = [self._intern_names(inp) for inp in targets]
+            signature = tuple((inp.key, n) for inp, n in zip(targets, names))
+            if self._schema is None or self._schema.signature != signature:
+                self._schema = PresetSchema([InputSchema(inp, n) for inp, n in zip(targets, names)])
+                self._last = {}
+                self.schemas += 1
+            schema = self._schema
+
+            values = []
+            for inp in targets:
+                refs = field_indexes(inp)
+                prev = self._last.get(inp.key)
+                if prev is not None and all(a is b for a, b in zip(prev[0], refs)):
+                    vals = prev[1]
+                    self.reused += 1
+                else:
+                    vals = _values(inp)
+                    if prev is not None:
+                        if vals == prev[1]:
+                            vals = prev[1]
+                            self.reused += 1
+                        else:
+                            # oförändrade värden: behåll förra str-objektet
+                            vals = tuple(o if o == v else v for o, v in zip(prev[1], vals))
+                    self._last[inp.key] = (refs, vals)
+                values.append(vals)
+
+            overlays = tuple(sorted(state.overlays.items()))
+            if overlays == self._overlays:
+                overlays = self._overlays
+            self._overlays = overlays
+
+            item = CompactSnapshot(fetched_at, schema, tuple(values), overlays,
+                                   state.active, state.preview)
+            self._items.append(item)
+            return item
+
+    def changes(self, i: int) -> List[FieldChanged]:
+        """Fältändringarna som snapshot i förde in (mot i-1)"""
+        with self._lock:
+            items = self._items
+            n = len(items)
+            i = i + n if i < 0 else i
+            if not 0 <= i < n:
+                raise IndexError(i)
+            return compact_changes(items[i - 1] if i > 0 else None, items[i])
+
+    def series(self, input_name, field_name: str) -> List[Tuple[float, Optional[str]]]:
+        """(fetched_at, värde) för ett fält genom hela historiken"""
+        return [(s.fetched_at, s.get(input_name, field_name)) for s in self]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._schema = None
+            self._names = {}
+            self._last = {}
+            self._overlays = ()
+
+
+# ------------------------------------------------------------
+# Minnesmätning
+# ------------------------------------------------------------
+
+def measure(xml: str, count: int = 1000, inputs: Optional[Iterable[str]] = None,
+            field: Tuple[str, str] = ("SCOREBOARD UPPE", "Time.Text")) -> dict:
+    """
+    Behåller count snapshots av samma preset där klockan räknar ned ett
+    steg per snapshot (varje snapshot parsas från egen XML, som i drift).
+    Returnerar tracemalloc-storlek för full VMixState vs SnapshotHistory.
+    """
+    import gc
+    import tracemalloc
+    from scoreboard_app.core.vmix_parser import parse_status_xml
+
+    base = parse_status_xml(xml).find_input(field[0])
+    old = base.get_field(field[1]) if base is not None else None
+    marker = f">{old}<" if old else None
+
+    def states():
+        for n in range(count):
+            if marker is None:
+                yield parse_status_xml(xml)
+            else:
+                value = f"{(count - n) // 60:02d}:{(count - n) % 60:02d}"
+                yield parse_status_xml(xml.replace(marker, f">{value}<", 1))
+
+    def retained(build):
+        gc.collect()
+        tracemalloc.start()
+        keep = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return keep, size
+
+    full, full_bytes = retained(lambda: list(states()))
+    del full
+
+    def compact():
+        hist = SnapshotHistory(maxlen=count, inputs=inputs)
+        for st in states():
+            hist.append(st)
+        return hist
+
+    hist, compact_bytes = retained(compact)
+    return {
+        "snapshots": count,
+        "watched_inputs": len(hist[-1].schema.inputs),
+        "full_bytes": full_bytes,
+        "compact_bytes": compact_bytes,
+        "full_per_snapshot": full_bytes / count,
+        "compact_per_snapshot": compact_bytes / count,
+        "ratio": full_bytes / compact_bytes if compact_bytes else 0.0,
+        "schemas": hist.schemas,
+    }
+
+
+if __name__ == "__main__":
+    from scoreboard_app.core.vmix_projection import load_sample
+
+    sample = load_sample(sys.argv[1] if len(sys.argv) > 1 else None)
+    for watched in (None, ["SCOREBOARD UPPE"]):
+        res = measure(sample, 1000, watched)
+        print(f"inputs={watched or 'all'}")
+        for k, v in res.items():
+            print(f"  {k:22s} {v:,.1f}" if isinstance(v, float) else f"  {k:22s} {v:,}")
@@ -0,0 +1,136 @@
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+log = logging.getLogger(__name__)
+
+
+class IOWorker:
+    """
+    Runs blocking vMix calls (controller methods) off the UI thread.
+
+    - lanes: one thread + FIFO per lane. "cmd" keeps operator commands in
+      click order, "read" carries polling so a slow read never delays a
+      START/PAUSE.
+    - key: a job with the same key still queued or running is not queued
+      again (a refresh that cannot keep up is skipped, not piled up)
+    - results and errors are NOT delivered on the worker thread: callbacks
+      go into a thread-safe queue that the UI thread empties with drain()
+      (see gui/io_bridge.TkIO, which calls it from Tk's after()).
+    """
+
+    def __init__(self, lanes=("cmd", "read")):
+        self.results: "queue.Queue" = queue.Queue()
+        self._jobs: Dict[str, "queue.Queue"] = {name: queue.Queue() for name in lanes}
+        self._threads: Dict[str, threading.Thread] = {}
+        self._keys = set()
+        self._lock = threading.Lock()
+        self._stop = False
+
+        self.submitted = 0
+        self.skipped = 0
+        self.failed = 0
+
+    # --------------------------------------------------
+    # Producer (UI thread)
+    # --------------------------------------------------
+    def submit(self, fn: Callable, *args,
+               lane: str = "cmd",
+               key: Optional[str] = None,
+               on_done: Optional[Callable] = None,
+               on_error: Optional[Callable] = None,
+               **kwargs) -> Optional[Future]:
+        """
+        Queues fn(*args, **kwargs) and returns at once.
+        on_done(result) / on_error(exc) run later in the thread calling drain().
+        Returns None if a job with the same key is already pending.
+        """
+        if lane not in self._jobs:
+            raise ValueError(f"Okänd IO-lane: {lane}")
+
+        with self._lock:
+            if key is not None:
+                if key in self._keys:
+                    self.skipped += 1
+                    return None
+                self._keys.add(key)
+            self.submitted += 1
+            self._ensure_thread(lane)
+
+        fut = Future()
+        self._jobs[lane].put((fut, fn, args, kwargs, key, on_done, on_error))
+        return fut
+
+    # --------------------------------------------------
+    # Consumer (UI thread)
+    # --------------------------------------------------
+    def drain(self, max_items: int = 100) -> int:
+        """
+        Runs queued result callbacks in the calling thread. Never blocks.
+        """
+        n = 0
+        while n < max_items:
+            try:
+                cb, arg = self.results.get_nowait()
+            except queue.Empty:
+                break
+            n += 1
+            try:
+                cb(arg)
+            except Exception as e:
+                log.error(f"[IO] callback failed: {e}")
+        return n
+
+    def post(self, callback: Callable, arg=None) -> None:
+        """Schedules callback(arg) for the next drain() (from any thread)"""
+        self.results.put((callback, arg))
+
+    def close(self):
+        self._stop = True
+        for q in self._jobs.values():
+            q.put(None)
+
+    def stats(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "queued": sum(q.qsize() for q in self._jobs.values()),
+        }
+
+    # --------------------------------------------------
+    # Worker threads
+    # --------------------------------------------------
+    def _ensure_thread(self, lane: str):
+        t = self._threads.get(lane)
+        if t is None or not t.is_alive():
+            t = threading.Thread(target=self._run, args=(lane,), name=f"vmix-io-{lane}", daemon=True)
+            self._threads[lane] = t
+            t.start()
+
+    def _run(self, lane: str):
+        jobs = self._jobs[lane]
+        while True:
+            job = jobs.get()
+            if job is None or self._stop:
+                return
+            fut, fn, args, kwargs, key, on_done, on_error = job
+            try:
+                value = fn(*args, **kwargs)
+            except Exception as e:
+                self.failed += 1
+                fut.set_exception(e)
+                if on_error is not None:
+                    self.results.put((on_error, e))
+                else:
+                    log.error(f"[IO] {getattr(fn, '__name__', fn)} failed: {e}")
+            else:
+                fut.set_result(value)
+                if on_done is not None:
+                    self.results.put((on_done, value))
+            finally:
+                if key is not None:
+                    with self._lock:
+                        self._keys.discard(key)
@@ -0,0 +1,85 @@
+"""
+vmix_parser.py
+---------------
+Gör om vMix status-XML (/api/ eller TCP "XML") till en indexerad VMixState.
+
+En parse räcker för hur många uppslag som helst:
+    state = parse_status_xml(xml)
+    state.find_input("SCOREBOARD UPPE").get_text("Time.Text")
+"""
+
+from __future__ import annotations
+
+import sys
+import xml.etree.ElementTree as ET
+from typing import Optional
+
+from scoreboard_app.core.vmix_api_types import (
+    VMixColorField,
+    VMixImageField,
+    VMixInput,
+    VMixState,
+    VMixTextField,
+)
+
+
+def _int_or_none(value: Optional[str]) -> Optional[int]:
+    value = (value or "").strip()
+    return int(value) if value.isdigit() else None
+
+
+def parse_input(node: ET.Element) -> VMixInput:
+    inp = VMixInput(
+        number=_int_or_none(node.get("number")) or 0,
+        key=node.get("key") or "",
+        title=node.get("title") or "",
+        short_title=node.get("shortTitle") or "",
+        type=node.get("type") or "",
+    )
+
+    for child in node:
+        name = child.get("name")
+        if not name:
+            continue
+        # samma namn i varje snapshot -> ett str-objekt
+        name = sys.intern(name)
+        tag = child.tag
+        if tag == "text":
+            inp.text_fields.append(VMixTextField(name, child.text or ""))
+        elif tag == "image":
+            inp.image_fields.append(VMixImageField(name, child.text or ""))
+        elif tag == "color":
+            inp.color_fields.append(VMixColorField(name, child.text or ""))
+
+    return inp
+
+
+def parse_root(root: ET.Element) -> VMixState:
+    state = VMixState(
+        version=root.findtext("version") or "",
+        edition=root.findtext("edition") or "",
+        preset=root.findtext("preset") or "",
+        active=_int_or_none(root.findtext("active")),
+        preview=_int_or_none(root.findtext("preview")),
+    )
+
+    inputs = root.find("inputs")
+    if inputs is not None:
+        state.inputs = [parse_input(n) for n in inputs.findall("input")]
+
+    overlays = root.find("overlays")
+    if overlays is not None:
+        for ov in overlays.findall("overlay"):
+            ch = _int_or_none(ov.get("number"))
+            if ch is not None:
+                state.overlays[ch] = _int_or_none(ov.text)
+
+    return state.build_index()
+
+
+def parse_status_xml(xml: str) -> VMixState:
+    """
+    Parsar hela status-XML:en och returnerar en VMixState med index byggda.
+    Kastar ET.ParseError vid trasig XML.
+    """
+    return parse_root(ET.fromstring(xml))
@@ -0,0 +1,224 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from scoreboard_app.core.vmix_diff import FieldChanged, SnapshotDiff, diff_states
+from scoreboard_app.core.vmix_snapshot import Snapshot
+
+log = logging.getLogger(__name__)
+
+FieldRef = Tuple[str, str]
+
+
+class Subscription:
+    """
+    One subscriber of a StatePoller.
+
+    fields=None  -> callback(snapshot) on every tick
+    fields=[...] -> callback({(input, field): value}) only when one of
+                    those values changed (and once for the first tick)
+    deliver(callback, arg) decides which thread runs the callback
+    (None = the poller thread; TkIO.post = the Tk thread).
+    """
+
+    def __init__(self, callback: Callable, fields: Optional[Iterable[FieldRef]] = None,
+                 deliver: Optional[Callable] = None):
+        self.callback = callback
+        self.fields: Optional[List[FieldRef]] = list(fields) if fields is not None else None
+        self.deliver = deliver
+        self.last: Optional[Dict[FieldRef, str]] = None
+
+    def _emit(self, arg):
+        if self.deliver is not None:
+            self.deliver(self.callback, arg)
+        else:
+            self.callback(arg)
+
+    def offer(self, snap: Snapshot) -> bool:
+        if self.fields is None:
+            self._emit(snap)
+            return True
+
+        state = snap.state
+        values: Dict[FieldRef, str] = {}
+        for input_name, field_name in self.fields:
+            inp = state.find_input(input_name)
+            values[(input_name, field_name)] = (inp.get_field(field_name) or "") if inp else ""
+        if values == self.last:
+            return False
+        self.last = values
+        self._emit(values)
+        return True
+
+
+class ChangeSubscription(Subscription):
+    """
+    Subscriber of snapshot deltas (see vmix_diff):
+    callback([FieldChanged | OverlayChanged | TallyChanged, ...]),
+    only called when something it cares about changed.
+
+    inputs / fields narrow the FieldChanged events (overlay and tally
+    changes always pass). The first delivery carries the current value
+    of every matching field (old=None) so widgets can initialise.
+    """
+
+    def __init__(self, callback: Callable, inputs: Optional[Iterable[str]] = None,
+                 fields: Optional[Iterable[str]] = None,
+                 deliver: Optional[Callable] = None):
+        super().__init__(callback, None, deliver)
+        self.inputs = list(inputs) if inputs is not None else None
+        self.field_names = set(fields) if fields is not None else None
+        self._primed = False
+
+    def offer_changes(self, snap: Snapshot, changes: list) -> bool:
+        state = snap.state
+        if not self._primed:
+            self._primed = True
+            changes = diff_states(None, state, self.inputs)
+
+        keys = None
+        if self.inputs is not None:
+            keys = {inp.key for inp in (state.find_input(n) for n in self.inputs) if inp is not None}
+
+        out = []
+        for c in changes:
+            if isinstance(c, FieldChanged):
+                if keys is not None and c.key not in keys:
+                    continue
+                if self.field_names is not None and c.field not in self.field_names:
+                    continue
+            out.append(c)
+        if not out:
+            return False
+        self._emit(out)
+        return True
+
+
+class StatePoller:
+    """
+    The one status poller of the app.
+
+    Every tick fetches (or reuses) ONE shared snapshot via client.snapshots
+    and hands it to all subscribers, so the number of open panels does not
+    change the number of vMix requests. Nothing is fetched while there
+    are no subscribers.
+    """
+
+    def __init__(self, client, interval_ms: float = 1000.0):
+        self.client = client
+        self.interval_ms = interval_ms
+
+        self._subs: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # one diff per tick, shared by every ChangeSubscription
+        self._diff = SnapshotDiff()
+
+        self.ticks = 0
+        self.errors = 0
+        self.delivered = 0
+        self.last_ms = 0.0
+
+    @classmethod
+    def from_config(cls, client, cfg: dict) -> "StatePoller":
+        conn = cfg.get("connection") or cfg.get("vmix") or {}
+        return cls(client, float(conn.get("poll_interval_ms", 1000)))
+
+    # --------------------------------------------------
+    # Subscribers
+    # --------------------------------------------------
+    def subscribe(self, callback: Callable,
+                  fields: Optional[Iterable[FieldRef]] = None,
+                  deliver: Optional[Callable] = None) -> Subscription:
+        sub = Subscription(callback, fields, deliver)
+        with self._lock:
+            self._subs.append(sub)
+        self.start()
+        self.poll_now()
+        return sub
+
+    def subscribe_changes(self, callback: Callable,
+                          inputs: Optional[Iterable[str]] = None,
+                          fields: Optional[Iterable[str]] = None,
+                          deliver: Optional[Callable] = None) -> ChangeSubscription:
+        """Deltas only – see ChangeSubscription"""
+        sub = ChangeSubscription(callback, inputs, fields, deliver)
+        with self._lock:
+            self._subs.append(sub)
+        self.start()
+        self.poll_now()
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            if sub in self._subs:
+                self._subs.remove(sub)
+
+    # --------------------------------------------------
+    # Thread
+    # --------------------------------------------------
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="vmix-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def poll_now(self):
+        """Next tick right away (e.g. after a TALLY/ACTS event)"""
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            # cleared before the tick so a poll_now() during it is not lost
+            self._wake.clear()
+            with self._lock:
+                subs = list(self._subs)
+            if subs:
+                self._tick(subs)
+            self._wake.wait(self.interval_ms / 1000.0)
+
+    def _tick(self, subs: List[Subscription]):
+        t0 = time.perf_counter()
+        try:
+            # younger than half a tick: someone else's fetch is good enough
+            snap = self.client.snapshots.get(max_age_ms=self.interval_ms / 2)
+        except Exception as e:
+            self.errors += 1
+            log.debug(f"[POLL] status fetch failed: {e}")
+            return
+
+        self.ticks += 1
+        changes = None
+        for sub in subs:
+            try:
+                if isinstance(sub, ChangeSubscription):
+                    if changes is None:
+                        changes = self._diff.feed(snap)
+                    ok = sub.offer_changes(snap, changes)
+                else:
+                    ok = sub.offer(snap)
+                if ok:
+                    self.delivered += 1
+            except Exception as e:
+                log.error(f"[POLL] subscriber failed: {e}")
+        self.last_ms = (time.perf_counter() - t0) * 1000.0
+
+    def stats(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "errors": self.errors,
+            "delivered": self.delivered,
+            "subscribers": len(self._subs),
+            "last_ms": self.last_ms,
+            "fetches": self.client.snapshots.fetches,
+            "diffs": self._diff.diffs,
+            "changes": self._diff.changes,
+        }
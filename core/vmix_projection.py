@@ -0,0 +1,263 @@
+"""
+vmix_projection.py
+-------------------
+Läser bara de fält appen faktiskt använder ur vMix status-XML.
+
+compile_projection(cfg) går igenom mappningen (klocka, resultat, period,
+utvisningar, skott, empty goal) och bygger en Projection:
+
+    proj = compile_projection(cfg)
+    res = proj.extract(xml)
+    res.values[("SCOREBOARD UPPE", "Time.Text")]  -> "19:01"
+
+extract() letar upp <input>-taggarna med str.find och tittar bara på
+starttaggens attribut. Endast mål-inputs (och <overlays>, om de behövs)
+går genom XML-parsern, och sökningen slutar så fort sista mål-inputen
+är läst – inget DOM för hela presetet byggs.
+
+python -m scoreboard_app.core.vmix_projection  kör benchmark mot
+resources/vMix-API-XML.txt.
+"""
+
+from __future__ import annotations
+
+import re
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import unescape
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from scoreboard_app.core.vmix_api_types import VMixState
+
+FieldRef = Tuple[str, str]
+
+# "HomeP1time.Text", "HomeLogo.Source" – inte "SCOREBOARD UPPE" eller "20:00"
+_FIELD_RE = re.compile(r"^[A-Za-z0-9_\-]+\.[A-Za-z]+$")
+
+# Mappningssektioner med fält appen läser live
+SECTIONS = ("clock", "scoreboard", "penalties", "shots", "empty_goal")
+
+_OPEN_TAG = re.compile(r'<input((?:\s+[\w:.\-]+\s*=\s*"[^"]*")*)\s*(/?)>')
+_ATTR = re.compile(r'([\w:.\-]+)\s*=\s*"([^"]*)"')
+_ENTITIES = {"&quot;": '"', "&apos;": "'"}
+
+
+@dataclass
+class Projected:
+    """Resultat från Projection.extract / from_state"""
+    values: Dict[FieldRef, str] = field(default_factory=dict)
+    overlays: Dict[int, Optional[int]] = field(default_factory=dict)
+    # False om någon mål-input saknades i XML:en
+    complete: bool = True
+    # antal tecken som faktiskt gick genom XML-parsern
+    parsed: int = 0
+    # time.monotonic() när snapshotet hämtades (satt av VMixClient.project)
+    fetched_at: Optional[float] = None
+
+
+class Projection:
+    """
+    targets: {input (titel/korttitel/key/nummer): {fältnamn, ...}}
+    """
+
+    def __init__(self, targets: Dict[str, Iterable[str]], overlays: bool = False):
+        self.targets: Dict[str, FrozenSet[str]] = {}
+        for inp, fields in targets.items():
+            if not inp:
+                continue
+            merged = self.targets.get(inp, frozenset()) | frozenset(f for f in fields if f)
+            if merged:
+                self.targets[inp] = merged
+        self.overlays = overlays
+        self._by_lower = {str(name).strip().lower(): name for name in self.targets}
+
+    def __repr__(self):
+        n = sum(len(f) for f in self.targets.values())
+        return f"Projection({len(self.targets)} inputs, {n} fields, overlays={self.overlays})"
+
+    def pairs(self):
+        return [(inp, f) for inp, fields in self.targets.items() for f in sorted(fields)]
+
+    # --------------------------------------------------
+    # Från rå XML
+    # --------------------------------------------------
+    def _match(self, attrs: dict) -> list:
+        hits = []
+        for attr in ("title", "shortTitle", "key", "number"):
+            name = self._by_lower.get(unescape(attrs.get(attr, ""), _ENTITIES).strip().lower())
+            if name is not None and name not in hits:
+                hits.append(name)
+        return hits
+
+    def extract(self, xml) -> Projected:
+        """
+        Hoppar mellan <input>-starttaggar med str.find och läser bara
+        starttaggens attribut; endast mål-inputs (och <overlays>) skickas
+        till XML-parsern. Stannar när sista mål-inputen är läst.
+        """
+        if isinstance(xml, bytes):
+            xml = xml.decode("utf-8", errors="replace")
+
+        out = Projected()
+        missing = set(self.targets)
+        pos = xml.find("<inputs")
+        end_inputs = xml.find("</inputs>", pos) if pos >= 0 else -1
+        if end_inputs < 0:
+            end_inputs = len(xml)
+
+        while missing and pos >= 0:
+            pos = xml.find("<input ", pos + 1, end_inputs)
+            if pos < 0:
+                break
+            m = _OPEN_TAG.match(xml, pos)
+            if m is None:
+                continue
+            hits = self._match(dict(_ATTR.findall(m.group(1))))
+            if not hits:
+                continue
+            if m.group(2):              # <input ... />
+                stop = m.end()
+            else:
+                stop = xml.find("</input>", m.end(), end_inputs)
+                if stop < 0:
+                    break
+                stop += len("</input>")
+            elem = ET.fromstring(xml[pos:stop])
+            out.parsed += stop - pos
+            for child in elem:
+                name = child.get("name")
+                if name is None:
+                    continue
+                value = (child.text or "") if child.tag == "text" else (child.get("value") or child.text or "")
+                for target in hits:
+                    if name in self.targets[target]:
+                        out.values.setdefault((target, name), value)
+            missing.difference_update(hits)
+            pos = stop - 1
+
+        if self.overlays:
+            a = xml.find("<overlays", end_inputs)
+            b = xml.find("</overlays>", a) if a >= 0 else -1
+            if b >= 0:
+                b += len("</overlays>")
+                for ov in ET.fromstring(xml[a:b]).findall("overlay"):
+                    try:
+                        ch = int(ov.get("number") or "")
+                    except ValueError:
+                        continue
+                    txt = (ov.text or "").strip()
+                    out.overlays[ch] = int(txt) if txt.isdigit() else None
+                out.parsed += b - a
+
+        out.complete = not missing
+        return out
+
+    # --------------------------------------------------
+    # Från redan parsad state (ingen XML alls)
+    # --------------------------------------------------
+    def from_state(self, state: VMixState) -> Projected:
+        out = Projected(overlays=dict(state.overlays) if self.overlays else {})
+        for name, fields in self.targets.items():
+            inp = state.find_input(name)
+            if inp is None:
+                out.complete = False
+                continue
+            for f in fields:
+                v = inp.get_field(f)
+                if v is not None:
+                    out.values[(name, f)] = v
+        return out
+
+
+# ------------------------------------------------------------
+# Kompilering från config
+# ------------------------------------------------------------
+
+def _collect(node, inp: str, targets: Dict[str, set]) -> None:
+    if isinstance(node, dict):
+        inp = node.get("input") or node.get("source_input") or inp
+        for k, v in node.items():
+            if k in ("input", "source_input"):
+                continue
+            _collect(v, inp, targets)
+    elif isinstance(node, str) and inp and _FIELD_RE.match(node.strip()):
+        targets.setdefault(inp, set()).add(node.strip())
+
+
+def compile_projection(cfg: dict, sections: Iterable[str] = SECTIONS,
+                       overlays: bool = True) -> Projection:
+    """
+    Samlar alla fältnamn ur cfg["mapping"][sektion] och cfg[sektion]
+    (sektioner utan egen input hör till scoreboard-inputen).
+    """
+    default_input = (
+        cfg.get("scoreboard", {}).get("input")
+        or cfg.get("mapping", {}).get("scoreboard", {}).get("input")
+        or cfg.get("inputs", {}).get("scoreboard")
+        or ""
+    )
+    targets: Dict[str, set] = {}
+    mapping = cfg.get("mapping", {})
+    for sec in sections:
+        for src in (mapping.get(sec), cfg.get(sec)):
+            if isinstance(src, dict):
+                _collect(src, default_input, targets)
+    return Projection(targets, overlays=overlays)
+
+
+# ------------------------------------------------------------
+# Benchmark
+# ------------------------------------------------------------
+
+def load_sample(path: Optional[str] = None) -> str:
+    """
+    Det bundlade exemplet (resources/vMix-API-XML.txt) är kopierat ur en
+    webbläsare: rubrikrad före <vmix> och en oescapad '<' i en textnod.
+    """
+    import os
+    if path is None:
+        base = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        path = os.path.join(base, "resources", "vMix-API-XML.txt")
+    with open(path, encoding="utf-8") as f:
+        xml = f.read()
+    xml = xml[xml.index("<vmix>"):]
+    return re.sub(r">< ", ">&lt; ", xml)
+
+
+def benchmark(xml: str, projection: Projection, rounds: int = 200) -> dict:
+    import time
+    from scoreboard_app.core.vmix_parser import parse_status_xml
+
+    def timed(fn):
+        t = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        return (time.perf_counter() - t) * 1000.0 / rounds
+
+    full_ms = timed(lambda: parse_status_xml(xml))
+    et_ms = timed(lambda: ET.fromstring(xml))
+    proj_ms = timed(lambda: projection.extract(xml))
+    res = projection.extract(xml)
+    return {
+        "bytes": len(xml.encode("utf-8")),
+        "fields": len(res.values),
+        "complete": res.complete,
+        "parsed_pct": 100.0 * res.parsed / len(xml),
+        "parse_status_xml_ms": full_ms,
+        "ET.fromstring_ms": et_ms,
+        "projection_ms": proj_ms,
+        "speedup": full_ms / proj_ms if proj_ms else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    from scoreboard_app.config.vmix_config import DEFAULT_CONFIG, load_config
+
+    sample = load_sample(sys.argv[1] if len(sys.argv) > 1 else None)
+    for label, cfg in (("default config", DEFAULT_CONFIG), ("vmix_config.json", load_config())):
+        for ov in (False, True):
+            proj = compile_projection(cfg, overlays=ov)
+            print(f"{label}: {proj}")
+            for k, v in benchmark(sample, proj).items():
+                print(f"  {k:22s} {v:.2f}" if isinstance(v, float) else f"  {k:22s} {v}")
@@ -0,0 +1,194 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# Functions where only the last value per (input, field) matters
+COALESCABLE = frozenset({"SetText", "SetImage"})
+
+
+class _Pending:
+    __slots__ = ("function", "params", "seq", "futures")
+
+    def __init__(self, function: str, params: dict, seq: int, fut: Future):
+        self.function = function
+        self.params = params
+        self.seq = seq
+        self.futures = [fut]
+
+
+class CommandQueue:
+    """
+    Outbound vMix command queue with write coalescing.
+
+    - SetText/SetImage aimed at the same (input, field) are merged while
+      pending: only the last value is sent (last-write-wins).
+    - Any other function (StartCountdown, AdjustCountdown, Overlay...) is a
+      barrier: nothing is merged across it, order is preserved, and it
+      triggers an immediate flush.
+    - Otherwise the queue flushes at most max_latency_ms after the first
+      pending command.
+
+    send(function, params) must return a Future (VMixClient._send).
+    result_timeout bounds how long one flush waits for its replies (a
+    vMix that stays connected but never answers must not hang the queue
+    thread); VMixClient passes the transport's read_timeout.
+    """
+
+    def __init__(self, send: Callable[[str, dict], Future],
+                 max_latency_ms: float = 20.0,
+                 result_timeout: float = 3.0):
+        self._send = send
+        self.max_latency_ms = max_latency_ms
+        self.result_timeout = result_timeout
+
+        self._cond = threading.Condition()
+        self._pending: List[_Pending] = []
+        self._by_key: Dict[Tuple, _Pending] = {}
+        self._seq = 0
+        self._barrier_seq = 0
+        self._first_at = 0.0
+        self._urgent = False
+        self._inflight = 0
+        self._stop = False
+        self._thread = None
+
+        self.submitted = 0
+        self.merged = 0
+        self.sent = 0
+        self.flushes = 0
+
+    @staticmethod
+    def coalesce_key(function: str, params: dict) -> Optional[Tuple]:
+        if function not in COALESCABLE:
+            return None
+        return function, str(params.get("Input")), params.get("SelectedName")
+
+    # --------------------------------------------------
+    # Producer side
+    # --------------------------------------------------
+    def submit(self, function: str, params: dict) -> Future:
+        fut = Future()
+        key = self.coalesce_key(function, params)
+
+        with self._cond:
+            self._ensure_thread()
+            self._seq += 1
+            self.submitted += 1
+
+            if key is not None:
+                entry = self._by_key.get(key)
+                if entry is not None and entry.seq > self._barrier_seq:
+                    entry.params = dict(params)
+                    entry.futures.append(fut)
+                    self.merged += 1
+                    return fut
+                entry = _Pending(function, dict(params), self._seq, fut)
+                self._by_key[key] = entry
+            else:
+                entry = _Pending(function, dict(params), self._seq, fut)
+                self._barrier_seq = self._seq
+                self._urgent = True
+
+            if not self._pending:
+                self._first_at = time.monotonic()
+            self._pending.append(entry)
+            self._cond.notify_all()
+        return fut
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Sends everything pending now and waits until it has gone out.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._urgent = True
+            self._cond.notify_all()
+            while self._pending or self._inflight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self):
+        self.flush(timeout=2.0)
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "merged": self.merged,
+            "sent": self.sent,
+            "flushes": self.flushes,
+            "pending": len(self._pending),
+        }
+
+    # --------------------------------------------------
+    # Worker
+    # --------------------------------------------------
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop = False
+            self._thread = threading.Thread(target=self._run, name="vmix-queue", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stop:
+                    self._cond.wait()
+                if self._stop and not self._pending:
+                    return
+
+                deadline = self._first_at + self.max_latency_ms / 1000.0
+                while not self._urgent and not self._stop:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = self._pending
+                self._pending = []
+                self._by_key = {}
+                self._urgent = False
+                self._inflight = len(batch)
+
+            self._dispatch(batch)
+
+            with self._cond:
+                self._inflight = 0
+                self.flushes += 1
+                self.sent += len(batch)
+                self._cond.notify_all()
+
+    def _dispatch(self, batch: List[_Pending]):
+        # send everything first (pipelined on TCP), then collect replies
+        sent = []
+        for entry in batch:
+            try:
+                sent.append((entry, self._send(entry.function, entry.params)))
+            except Exception as e:
+                sent.append((entry, e))
+
+        # one deadline for the whole flush, not result_timeout per command
+        deadline = time.monotonic() + self.result_timeout
+        for entry, res in sent:
+            if isinstance(res, Future):
+                try:
+                    value = res.result(timeout=max(0.0, deadline - time.monotonic()))
+                except Exception as e:
+                    res = e
+                else:
+                    for f in entry.futures:
+                        f.set_result(value)
+                    continue
+
+            log.error(f"[QUEUE] {entry.function} {entry.params} failed: {res or type(res).__name__}")
+            for f in entry.futures:
+                f.set_exception(res)
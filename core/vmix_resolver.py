@@ -0,0 +1,68 @@
+import threading
+from typing import Dict, NamedTuple, Optional
+
+from scoreboard_app.core.vmix_api_types import VMixState
+
+
+class ResolvedInput(NamedTuple):
+    number: int
+    key: str
+
+
+class InputResolver:
+    """
+    Maps title / shortTitle / key / number -> (number, input GUID).
+
+    The table is built once per preset layout and only rebuilt when the
+    <preset> path or any input's (key, number, title, shortTitle) changes
+    – a rename or a reorder keeps the key set but must still rebuild – so
+    resolving the same title for every SetText costs a dict lookup, not
+    an XML scan.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signature = None
+        self._table: Dict[str, ResolvedInput] = {}
+        self.rebuilds = 0
+
+    @staticmethod
+    def signature(state: VMixState):
+        return state.preset, tuple(
+            (inp.key, inp.number, inp.title, inp.short_title) for inp in state.inputs
+        )
+
+    def update(self, state: VMixState) -> bool:
+        """
+        Feeds a new snapshot. Returns True if the table was rebuilt.
+        """
+        sig = self.signature(state)
+        with self._lock:
+            if sig == self._signature:
+                return False
+
+            table: Dict[str, ResolvedInput] = {}
+            for inp in state.inputs:
+                r = ResolvedInput(inp.number, inp.key)
+                table.setdefault(str(inp.number), r)
+                if inp.key:
+                    table.setdefault(inp.key.lower(), r)
+            # titlar efter nummer/key; title före shortTitle
+            for inp in state.inputs:
+                r = ResolvedInput(inp.number, inp.key)
+                for nm in (inp.title, inp.short_title):
+                    if nm:
+                        table.setdefault(nm.strip().lower(), r)
+
+            self._table = table
+            self._signature = sig
+            self.rebuilds += 1
+            return True
+
+    def resolve(self, name_or_number) -> Optional[ResolvedInput]:
+        return self._table.get(str(name_or_number).strip().lower())
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._signature = None
+            self._table = {}
@@ -0,0 +1,195 @@
+import heapq
+import itertools
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+
+class Timer:
+    """Handle returned by TimerHeap.call_at / call_later"""
+
+    __slots__ = ("due", "fn", "args", "name", "cancelled", "fired_at", "_heap")
+
+    def __init__(self, due: float, fn: Callable, args: tuple, name: str, heap=None):
+        self.due = due
+        self.fn = fn
+        self.args = args
+        self.name = name
+        self.cancelled = False
+        self.fired_at: Optional[float] = None
+        self._heap = heap
+
+    @property
+    def pending(self) -> bool:
+        return not self.cancelled and self.fired_at is None
+
+    def cancel(self) -> bool:
+        """True if the timer was still pending"""
+        was = self.pending
+        self.cancelled = True
+        if was and self._heap is not None:
+            self._heap.cancelled += 1
+        return was
+
+    def reschedule(self, delay_s: float) -> bool:
+        """Move a pending timer to now + delay_s (False: already fired/cancelled)"""
+        return self._heap is not None and self._heap.reschedule(self, self._heap.now() + delay_s)
+
+    def __repr__(self):
+        state = "cancelled" if self.cancelled else "fired" if self.fired_at is not None else "pending"
+        return f"Timer({self.name!r}, due={self.due:.3f}, {state})"
+
+
+class TimerHeap:
+    """
+    One thread, one heap of (due, seq, Timer) on time.monotonic().
+
+    The one place delayed vMix actions live (overlay off after a goal,
+    penalty expiry, ...): no thread per action, and every action can be
+    cancelled, rescheduled and listed while it waits.
+
+    Callbacks run on the timer thread in due order and must be short
+    (hand real work to a client batch / IOWorker). Cancelling only marks
+    the timer; rescheduling pushes a new entry and leaves the old one
+    stale. Both are dropped when they reach the top of the heap.
+
+    Jitter = how late each callback started compared to its due time,
+    see stats().
+    """
+
+    def __init__(self, name: str = "vmix-timers", clock: Callable[[], float] = time.monotonic,
+                 history: int = 500):
+        self.name = name
+        self._clock = clock
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = False
+
+        self.fired = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.rescheduled = 0
+        self.late_ms: deque = deque(maxlen=history)
+
+    # --------------------------------------------------
+    # Scheduling (any thread)
+    # --------------------------------------------------
+    def now(self) -> float:
+        return self._clock()
+
+    def call_at(self, due: float, fn: Callable, *args, name: str = "") -> Timer:
+        timer = Timer(due, fn, args, name or getattr(fn, "__name__", "timer"), self)
+        with self._cond:
+            heapq.heappush(self._heap, (due, next(self._seq), timer))
+            self._ensure_thread()
+            self._cond.notify()
+        return timer
+
+    def call_later(self, delay_s: float, fn: Callable, *args, name: str = "") -> Timer:
+        return self.call_at(self._clock() + max(0.0, delay_s), fn, *args, name=name)
+
+    def reschedule(self, timer: Timer, due: float) -> bool:
+        with self._cond:
+            if not timer.pending:
+                return False
+            timer.due = due
+            heapq.heappush(self._heap, (due, next(self._seq), timer))
+            self.rescheduled += 1
+            self._cond.notify()
+        return True
+
+    def cancel(self, name: str) -> int:
+        """Cancels every pending timer called name, returns how many"""
+        with self._cond:
+            hits = [t for t in self._live() if t.name == name]
+            for t in hits:
+                t.cancel()
+        return len(hits)
+
+    def _live(self) -> List[Timer]:
+        # one entry per pending timer (stale reschedule entries skipped)
+        return [t for due, _, t in self._heap if t.pending and due == t.due]
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._live())
+
+    def inspect(self) -> List[Dict]:
+        """Pending timers in due order: [{"name", "due_in_ms"}]"""
+        now = self._clock()
+        with self._cond:
+            live = sorted(self._live(), key=lambda t: t.due)
+        return [{"name": t.name, "due_in_ms": (t.due - now) * 1000.0} for t in live]
+
+    def stats(self) -> Dict[str, float]:
+        late = list(self.late_ms)
+        out = {
+            "fired": self.fired,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "rescheduled": self.rescheduled,
+            "pending": self.pending(),
+        }
+        if late:
+            late.sort()
+            out.update({
+                "jitter_ms_mean": statistics.fmean(late),
+                "jitter_ms_p95": late[min(len(late) - 1, int(len(late) * 0.95))],
+                "jitter_ms_max": late[-1],
+            })
+        return out
+
+    def close(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+
+    # --------------------------------------------------
+    # Timer thread
+    # --------------------------------------------------
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop = False
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stop:
+                    while self._heap and self._stale(self._heap[0]):
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    wait = self._heap[0][0] - self._clock()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                if self._stop:
+                    return
+                entry = heapq.heappop(self._heap)
+                if self._stale(entry):
+                    continue
+                timer = entry[2]
+                timer.fired_at = self._clock()
+                self.late_ms.append((timer.fired_at - timer.due) * 1000.0)
+
+            try:
+                timer.fn(*timer.args)
+                self.fired += 1
+            except Exception as e:
+                self.errors += 1
+                log.error(f"[TIMER] {timer.name} failed: {e}")
+
+    @staticmethod
+    def _stale(entry) -> bool:
+        due, _, timer = entry
+        return not timer.pending or due != timer.due
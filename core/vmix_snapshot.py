@@ -0,0 +1,214 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from scoreboard_app.core.vmix_api_types import VMixState
+from scoreboard_app.core.vmix_parser import parse_status_xml
+
+
+# vMix functions whose effect we can mirror into a cached snapshot
+_PATCHABLE = {"SetText": "text", "SetImage": "image"}
+
+
+class Snapshot:
+    """
+    One fetched vMix status document.
+    xml is the raw body (None once the snapshot has been patched locally),
+    state is parsed lazily and at most once.
+    """
+
+    def __init__(self, xml: str, fetched_at: float, base: Optional["Snapshot"] = None):
+        self.xml: Optional[str] = xml
+        self.fetched_at = fetched_at
+        # cheap identity of the raw body (see SnapshotCache: unchanged bodies)
+        self.fingerprint = (len(xml), hash(xml)) if xml is not None else None
+        # bumped by every local patch
+        self.version = 0
+        self._state: Optional[VMixState] = None
+        self._parse_lock = threading.Lock()
+        # byte-identical earlier snapshot whose parse we share
+        self._base = base
+        if base is not None and base._state is not None:
+            self._state = base._state
+            self._base = None
+
+    @property
+    def age_ms(self) -> float:
+        return (time.monotonic() - self.fetched_at) * 1000.0
+
+    @property
+    def parsed(self) -> bool:
+        return self._state is not None
+
+    @property
+    def state(self) -> VMixState:
+        if self._state is None:
+            with self._parse_lock:
+                if self._state is None:
+                    if self._base is not None:
+                        self._state = self._base.state
+                        self._base = None
+                    else:
+                        self._state = parse_status_xml(self.xml)
+        return self._state
+
+    def same_body(self, xml: str) -> bool:
+        """True if xml is byte-identical to this (unpatched) snapshot's body"""
+        return (
+            self.version == 0
+            and self.xml is not None
+            and self.fingerprint == (len(xml), hash(xml))
+            and self.xml == xml
+        )
+
+
+class SnapshotCache:
+    """
+    Shared status snapshot for VMixClient.
+
+    - max_age_ms: snapshots younger than this are served without a fetch
+    - single-flight: concurrent callers that miss share ONE in-flight fetch
+    - writes: SetText/SetImage patch an already parsed state in place;
+      every other function, and any write to an unparsed snapshot,
+      expires it
+    - stale reads are opt-in per call (allow_stale=True)
+    - a fetched body byte-identical to the previous one (clock stopped,
+      nothing changed) reuses the previous parsed state instead of
+      parsing again; counted as body_hits / body_misses
+    """
+
+    def __init__(self, fetch: Callable[[], str], max_age_ms: float = 250.0):
+        self._fetch = fetch
+        self.max_age_ms = max_age_ms
+
+        self._lock = threading.Lock()
+        self._snap: Optional[Snapshot] = None
+        self._expired = True
+        self._inflight: Optional[threading.Event] = None
+        # bumped on every write, so a fetch that raced a write is not trusted
+        self._write_gen = 0
+
+        self.fetches = 0
+        self.hits = 0
+        self.shared = 0
+        self.body_hits = 0
+        self.body_misses = 0
+
+    # --------------------------------------------------
+    # Read
+    # --------------------------------------------------
+    def get(self, max_age_ms: Optional[float] = None,
+            allow_stale: bool = False,
+            need_xml: bool = False) -> Snapshot:
+        """
+        Returns a snapshot no older than max_age_ms (default: cache setting).
+        allow_stale=True returns whatever is cached, however old.
+        need_xml=True skips snapshots whose raw XML was dropped by a patch.
+        """
+        limit = self.max_age_ms if max_age_ms is None else max_age_ms
+
+        with self._lock:
+            snap = self._snap
+            if snap is not None and not (need_xml and snap.xml is None):
+                if allow_stale or (not self._expired and snap.age_ms <= limit):
+                    self.hits += 1
+                    return snap
+
+            if self._inflight is not None:
+                event = self._inflight
+                self.shared += 1
+                leader = False
+            else:
+                event = threading.Event()
+                self._inflight = event
+                leader = True
+                gen = self._write_gen
+                prev = snap
+
+        if not leader:
+            event.wait()
+            result = event.result
+            if isinstance(result, BaseException):
+                raise result
+            return result
+
+        try:
+            xml = self._fetch()
+            reused = prev is not None and xml is not None and prev.same_body(xml)
+            result = Snapshot(xml, time.monotonic(), base=prev if reused else None)
+        except BaseException as e:
+            result = e
+
+        with self._lock:
+            if isinstance(result, Snapshot):
+                if reused:
+                    self.body_hits += 1
+                else:
+                    self.body_misses += 1
+                self._snap = result
+                self._expired = gen != self._write_gen
+                self.fetches += 1
+            event.result = result
+            self._inflight = None
+        event.set()
+
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def peek(self) -> Optional[Snapshot]:
+        """Cached snapshot without fetching (may be None or old)"""
+        return self._snap
+
+    # --------------------------------------------------
+    # Write-through
+    # --------------------------------------------------
+    def invalidate(self) -> None:
+        with self._lock:
+            self._expired = True
+
+    def apply_write(self, function: str, params: dict) -> None:
+        """
+        Mirrors a write the client just performed.
+        """
+        with self._lock:
+            self._write_gen += 1
+        kind = _PATCHABLE.get(function)
+        if kind is None:
+            self.invalidate()
+            return
+        if not self.patch_field(params.get("Input"), params.get("SelectedName"),
+                                params.get("Value"), kind):
+            self.invalidate()
+
+    def patch_field(self, input_name, field_name, value, kind: str = "text") -> bool:
+        """
+        Patches one text/image value in the parsed snapshot.
+        Returns False if there is nothing to patch (caller should invalidate).
+        A snapshot nobody parsed yet (only read through a Projection) is
+        not parsed here: that would be a full parse on the writer's thread
+        under the cache lock, for one field.
+        """
+        if input_name is None or not field_name:
+            return False
+        with self._lock:
+            snap = self._snap
+            if snap is None or self._expired or not snap.parsed:
+                return False
+            inp = snap.state.find_input(input_name)
+            if inp is None or not inp.set_field(field_name, "" if value is None else str(value), kind):
+                return False
+            # raw XML no longer matches the patched state
+            snap.xml = None
+            snap.version += 1
+            return True
+
+    def stats(self) -> dict:
+        return {
+            "fetches": self.fetches,
+            "hits": self.hits,
+            "shared": self.shared,
+            "body_hits": self.body_hits,
+            "body_misses": self.body_misses,
+            "age_ms": self._snap.age_ms if self._snap else None,
+        }
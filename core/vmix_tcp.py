@@ -0,0 +1,243 @@
+import logging
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from scoreboard_app.core.vmix_transport import build_query
+
+log = logging.getLogger(__name__)
+
+
+class TcpTransport:
+    """
+    vMix TCP API transport (default port 8099).
+
+    One long-lived socket, commands are written as lines:
+        FUNCTION SetText Input=1&SelectedName=HomeScore.Text&Value=5
+        XML
+    and replies come back in order per command:
+        FUNCTION OK Completed
+        FUNCTION ER <message>
+        XML <length>\\r\\n<xml bytes>
+
+    Commands are pipelined: send() registers a Future and writes the line
+    without waiting for earlier replies. A reader thread resolves the
+    Futures FIFO per command name.
+
+    Lines that do not answer a pending command (e.g. TALLY/ACTS after a
+    SUBSCRIBE) are handed to on_event(command, status, payload).
+    """
+
+    def __init__(self, host="127.0.0.1", port=8099,
+                 connect_timeout: float = 1.0,
+                 read_timeout: float = 3.0,
+                 on_event=None,
+                 latency_window: int = 200):
+        self.host = host
+        self.port = port
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.on_event = on_event
+
+        self._sock = None
+        self._reader = None
+        self._write_lock = threading.Lock()
+
+        # command name -> deque[(Future, t_sent)]
+        self._pending = {}
+
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)
+        self._requests = 0
+        self._errors = 0
+        self._connects = 0
+
+    # --------------------------------------------------
+    # Connection
+    # --------------------------------------------------
+    @property
+    def connected(self) -> bool:
+        return self._sock is not None
+
+    @property
+    def generation(self) -> int:
+        """Bumped on every (re)connect"""
+        return self._connects
+
+    def connect(self):
+        with self._write_lock:
+            self._connect_locked()
+
+    def _connect_locked(self):
+        if self._sock is not None:
+            return
+        sock = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(None)
+        self._sock = sock
+        self._pending = {}
+        self._connects += 1
+
+        self._reader = threading.Thread(target=self._read_loop, args=(sock, self._pending),
+                                        name="vmix-tcp-reader", daemon=True)
+        self._reader.start()
+        log.info(f"[TCP] connected to {self.host}:{self.port}")
+
+    def close(self):
+        with self._write_lock:
+            sock = self._sock
+            pending = self._pending
+            self._sock = None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        self._fail_pending(pending, ConnectionError("vMix TCP connection closed"))
+
+    # --------------------------------------------------
+    # Sending
+    # --------------------------------------------------
+    def send_line(self, command: str, argument: str = "") -> Future:
+        """
+        Writes one raw command line and returns a Future for its reply.
+        The reply payload (text after OK) is the Future result. Connect and
+        send errors never raise here: like HttpTransport.send, the Future
+        comes back failed with a ConnectionError.
+        """
+        command = command.upper()
+        line = f"{command} {argument}".rstrip() + "\r\n"
+        fut = Future()
+
+        with self._write_lock:
+            try:
+                self._connect_locked()
+            except OSError as e:
+                fut.set_exception(ConnectionError(f"vMix TCP connect failed: {e}"))
+                return fut
+            self._pending.setdefault(command, deque()).append((fut, time.perf_counter()))
+            try:
+                self._sock.sendall(line.encode("utf-8"))
+            except OSError as e:
+                self._pending[command].pop()
+                self._drop_locked()
+                fut.set_exception(ConnectionError(f"vMix TCP send failed: {e}"))
+        return fut
+
+    def send(self, function: str, params: dict) -> Future:
+        """Pipelined FUNCTION call"""
+        query = build_query(params)
+        return self.send_line("FUNCTION", f"{function} {query}".rstrip())
+
+    def call(self, function: str, params: dict) -> str:
+        return self.send(function, params).result(timeout=self.read_timeout)
+
+    def status_xml(self) -> str:
+        return self.send_line("XML").result(timeout=self.read_timeout)
+
+    def _drop_locked(self):
+        sock = self._sock
+        self._sock = None
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    # --------------------------------------------------
+    # Reading
+    # --------------------------------------------------
+    def _read_loop(self, sock, pending: dict):
+        reader = sock.makefile("rb")
+        try:
+            while True:
+                raw = reader.readline()
+                if not raw:
+                    break
+                line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+                if not line:
+                    continue
+
+                parts = line.split(" ", 2)
+                command = parts[0].upper()
+                status = parts[1] if len(parts) > 1 else ""
+                payload = parts[2] if len(parts) > 2 else ""
+
+                # XML <length> is followed by the document itself
+                if command == "XML" and status.isdigit():
+                    body = reader.read(int(status))
+                    self._resolve(pending, command, "OK", body.decode("utf-8", errors="replace"))
+                    continue
+
+                self._resolve(pending, command, status, payload)
+        except OSError:
+            pass
+        finally:
+            with self._write_lock:
+                if self._sock is sock:
+                    self._sock = None
+            self._fail_pending(pending, ConnectionError("vMix TCP connection lost"))
+
+    def _resolve(self, pending: dict, command: str, status: str, payload: str):
+        queue = pending.get(command)
+        item = None
+        if queue:
+            try:
+                item = queue.popleft()
+            except IndexError:
+                item = None
+
+        if item is None:
+            # unsolicited: VERSION greeting, TALLY/ACTS subscription events
+            if self.on_event:
+                try:
+                    self.on_event(command, status, payload)
+                except Exception as e:
+                    log.error(f"[TCP] event handler failed: {e}")
+            return
+
+        fut, t_sent = item
+        ms = (time.perf_counter() - t_sent) * 1000.0
+        with self._stats_lock:
+            self._requests += 1
+            self._latencies.append(ms)
+            if status != "OK":
+                self._errors += 1
+
+        if status == "OK":
+            fut.set_result(payload)
+        else:
+            fut.set_exception(RuntimeError(f"vMix {command} {status}: {payload}"))
+
+    @staticmethod
+    def _fail_pending(pending: dict, exc: Exception):
+        for queue in list(pending.values()):
+            while queue:
+                fut, _ = queue.popleft()
+                if not fut.done():
+                    fut.set_exception(exc)
+
+    # --------------------------------------------------
+    # Statistics
+    # --------------------------------------------------
+    def stats(self) -> dict:
+        with self._stats_lock:
+            n = self._requests
+            lat = list(self._latencies)
+            errors = self._errors
+        in_flight = sum(len(q) for q in list(self._pending.values()))
+        return {
+            "requests": n,
+            "errors": errors,
+            "new_connections": self._connects,
+            "reused": max(0, n - self._connects),
+            "reuse_rate": (max(0, n - self._connects) / n) if n else 0.0,
+            "open_sockets": 1 if self.connected else 0,
+            "in_flight": in_flight,
+            "last_ms": lat[-1] if lat else 0.0,
+            "avg_ms": (sum(lat) / len(lat)) if lat else 0.0,
+            "max_ms": max(lat) if lat else 0.0,
+        }
@@ -0,0 +1,563 @@
+import logging
+import statistics
+import threading
+from collections import deque
+from string import Formatter
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from scoreboard_app.core.vmix_io import IOWorker
+from scoreboard_app.core.vmix_scheduler import Timer, TimerHeap
+
+log = logging.getLogger(__name__)
+
+Overlay = Tuple[str, int]
+
+_FORMATTER = Formatter()
+
+
+# ------------------------------------------------------------
+# Compiled form
+# ------------------------------------------------------------
+
+class _Command:
+    """One vMix function call; templated params are filled in at run()"""
+
+    __slots__ = ("function", "params", "templated")
+
+    def __init__(self, function: str, params: dict):
+        self.function = function
+        self.params = params
+        # params whose value has "{name}" placeholders
+        self.templated = tuple(k for k, v in params.items() if isinstance(v, str) and "{" in v)
+
+    def bind(self, values: dict) -> Optional[tuple]:
+        """Ready (function, params), None when a placeholder came out empty"""
+        if not self.templated:
+            return self.function, self.params
+        params = dict(self.params)
+        for k in self.templated:
+            v = _FORMATTER.vformat(params[k], (), _Values(values))
+            if not v:
+                return None
+            params[k] = v
+        return self.function, params
+
+
+class _Values(dict):
+    def __missing__(self, key):
+        return ""
+
+
+class _Slot:
+    __slots__ = ("offset_ms", "commands")
+
+    def __init__(self, offset_ms: int, commands: List[_Command]):
+        self.offset_ms = offset_ms
+        self.commands = commands
+
+
+class CompiledTimeline:
+    """
+    A step list flattened to slots of (offset_ms, commands). Every slot
+    goes out as one client.batch() when its offset is reached.
+
+    staged: field writes pulled forward to offset 0 (stage steps), sent
+    as their own batch; they must have landed by stage_at_ms, the offset
+    the stage step stood at.
+    """
+
+    def __init__(self, name: str, slots: List[_Slot], duration_ms: int,
+                 staged: List[_Command] = (), stage_at_ms: Optional[int] = None):
+        self.name = name
+        self.slots = slots
+        self.duration_ms = duration_ms
+        self.staged = list(staged)
+        self.stage_at_ms = stage_at_ms
+        self.overlays: Set[Overlay] = {
+            ov for slot in slots for c in slot.commands for ov in [_overlay_of(c, "In")] if ov
+        }
+
+    def bind(self, values: Optional[dict] = None) -> List[Tuple[int, list]]:
+        values = values or {}
+        out = []
+        for slot in self.slots:
+            cmds = [b for b in (c.bind(values) for c in slot.commands) if b is not None]
+            if cmds:
+                out.append((slot.offset_ms, cmds))
+        return out
+
+    def bind_staged(self, values: Optional[dict] = None) -> list:
+        values = values or {}
+        return [b for b in (c.bind(values) for c in self.staged) if b is not None]
+
+    def describe(self) -> List[str]:
+        out = [f"+{s.offset_ms} ms: " + ", ".join(c.function for c in s.commands) for s in self.slots]
+        if self.staged:
+            out.insert(0, f"+0 ms: stage {len(self.staged)} fields, needed by +{self.stage_at_ms} ms")
+        return out
+
+    def __repr__(self):
+        return f"CompiledTimeline({self.name!r}, {len(self.slots)} slots, {self.duration_ms} ms)"
+
+
+def _overlay_of(cmd, edge: str) -> Optional[Overlay]:
+    function, params = (cmd.function, cmd.params) if isinstance(cmd, _Command) else cmd
+    if function.startswith("OverlayInput") and function.endswith(edge):
+        channel = function[len("OverlayInput"):-len(edge)]
+        if channel.isdigit():
+            return str(params.get("Input", "")), int(channel)
+    return None
+
+
+# ------------------------------------------------------------
+# Compiler
+# ------------------------------------------------------------
+
+def compile_timeline(name: str, steps: list, variables: Optional[dict] = None) -> CompiledTimeline:
+    """
+    steps (from config):
+
+        {"set": {"Name.Text": "{name}", "Logo.Source": "{logo}"}, "input": "X"}
+        {"stage": {...same as set...}, "input": "X"}
+        {"overlay_in": 2, "input": "X"}     {"overlay_out": 2, "input": "X"}
+        {"wait": 2000}                      {"wait": "{popup_ms}"}
+        {"parallel": [[steps...], [steps...]]}
+        {"function": "SetCountdown", "Input": ..., "Value": ...}
+
+    "{...}" in set/function values is filled per run (empty -> command
+    skipped); in wait it comes from variables, now.
+
+    stage writes its fields at the very start of the run instead of at
+    its position (e.g. while a popup is on air), so they have landed when
+    the next overlay comes in.
+    """
+    variables = variables or {}
+    at: Dict[int, List[_Command]] = {}
+    stage: List[Tuple[int, _Command]] = []
+    end = _compile_steps(name, steps, 0, at, variables, stage)
+    slots = [_Slot(off, at[off]) for off in sorted(at)]
+    stage_at = min((t for t, _ in stage), default=None)
+    return CompiledTimeline(name, slots, end, [c for _, c in stage], stage_at)
+
+
+def _compile_steps(name: str, steps: list, t: int, at: dict, variables: dict, stage: list) -> int:
+    for i, step in enumerate(steps or ()):
+        if not isinstance(step, dict):
+            raise ValueError(f"Timeline {name}: steg {i} är inte ett objekt: {step!r}")
+        where = f"Timeline {name}: steg {i}"
+
+        if "wait" in step:
+            t += _wait_ms(step["wait"], variables, where)
+        elif "parallel" in step:
+            t = max([_compile_steps(name, track, t, at, variables, stage)
+                     for track in step["parallel"]] or [t])
+        elif "set" in step or "stage" in step:
+            inp = _input(step, where)
+            for field, value in (step.get("set") or step.get("stage")).items():
+                function = "SetImage" if field.lower().endswith(".source") else "SetText"
+                cmd = _Command(function, {"Input": inp, "SelectedName": field, "Value": str(value)})
+                if "stage" in step:
+                    stage.append((t, cmd))
+                else:
+                    at.setdefault(t, []).append(cmd)
+        elif "overlay_in" in step or "overlay_out" in step:
+            edge = "In" if "overlay_in" in step else "Out"
+            channel = int(step["overlay_in" if edge == "In" else "overlay_out"])
+            at.setdefault(t, []).append(_Command(f"OverlayInput{channel}{edge}", {"Input": _input(step, where)}))
+        elif "function" in step:
+            params = {k: str(v) for k, v in step.items() if k != "function" and v is not None}
+            at.setdefault(t, []).append(_Command(str(step["function"]), params))
+        else:
+            raise ValueError(f"{where}: okänd steg-typ {sorted(step)}")
+    return t
+
+
+def _input(step: dict, where: str) -> str:
+    inp = step.get("input")
+    if not inp:
+        raise ValueError(f"{where}: saknar input")
+    return str(inp)
+
+
+def _wait_ms(value, variables: dict, where: str) -> int:
+    if isinstance(value, str):
+        value = _FORMATTER.vformat(value, (), _Values(variables))
+    try:
+        ms = int(float(value or 0))
+    except (TypeError, ValueError):
+        raise ValueError(f"{where}: ogiltig wait {value!r}")
+    return max(0, ms)
+
+
+# ------------------------------------------------------------
+# Runner
+# ------------------------------------------------------------
+
+class TimelineRun:
+    """One playing timeline: its scheduled slots and what already went out"""
+
+    def __init__(self, timeline: CompiledTimeline, on_done: Optional[Callable] = None,
+                 values: Optional[dict] = None):
+        self.timeline = timeline
+        self.values = values or {}
+        self.on_done = on_done
+        self.timers: List[Timer] = []
+        self.late_ms: List[float] = []
+        self.on_air: Set[Overlay] = set()
+        # stage step: the bound field writes, when they were confirmed
+        # (ms after the run started) and whether they had to be re-sent;
+        # staged is set on confirmation, stage_done once the batch returned
+        self.staging: list = []
+        self.staged = threading.Event()
+        self.stage_done = threading.Event()
+        self.staging_ms: Optional[float] = None
+        self.restaged = False
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+        self._left = 0
+
+    @property
+    def active(self) -> bool:
+        return not self.done.is_set()
+
+    def stop(self, keep: Iterable[Overlay] = ()) -> list:
+        """
+        Cancels what has not fired yet and returns the OverlayInputNOut
+        commands for overlays this run left on air, except those in keep
+        (the next timeline owns them). TimelineEngine.stop() sends them.
+        """
+        for timer in self.timers:
+            timer.cancel()
+        keep = set(keep)
+        with self._lock:
+            outs = [(f"OverlayInput{ch}Out", {"Input": inp}) for inp, ch in self.on_air if (inp, ch) not in keep]
+            self.on_air.clear()
+        self._finish()
+        return outs
+
+    def _finish(self):
+        if not self.done.is_set():
+            self.done.set()
+            if self.on_done is not None:
+                try:
+                    self.on_done(self)
+                except Exception as e:
+                    log.error(f"[TIMELINE] {self.timeline.name} on_done failed: {e}")
+
+
+class TimelineEngine:
+    """
+    Plays CompiledTimelines on the shared TimerHeap. run() binds every
+    command up front and schedules one timer per slot at t0 + offset.
+    A firing slot only records its lateness, updates the channel state
+    and hands its ready batch to the engine's IOWorker lane; the blocking
+    client.batch() never runs on the timer thread. The lane is FIFO, so
+    slots (and the overlay-outs of a stopped run) reach vMix in order.
+
+    Staged field writes go out at t0 as their own batch on a separate
+    "stage" lane, so they never wait behind (or hold up) a slot. The slot
+    at stage_at_ms waits up to stage_grace_ms for their confirmation and
+    re-sends them ahead of its own commands when it does not come.
+
+    Overlay channels are tracked across runs: an In for the input a
+    channel already shows, or an Out for a channel that does not show
+    that input, is dropped (counted in stats()["suppressed"]).
+    """
+
+    def __init__(self, client, history: int = 500, stage_grace_ms: float = 100.0):
+        timers: Optional[TimerHeap] = getattr(client, "timers", None)
+        if timers is None:
+            raise ValueError("TimelineEngine kräver client.timers (den delade TimerHeap)")
+        self.client = client
+        self.stage_grace_ms = stage_grace_ms
+        self.timers = timers
+        self.late_ms: deque = deque(maxlen=history)
+        # (staging_ms, lead_ms) per staged run
+        self.staging: deque = deque(maxlen=history)
+        self.restaged = 0
+        self.runs = 0
+        # overlay channel -> input we put on it
+        self.channels: Dict[int, str] = {}
+        self.suppressed = 0
+        self._lock = threading.Lock()
+        self.io = IOWorker(lanes=("timeline", "stage"))
+
+    def run(self, timeline: CompiledTimeline, values: Optional[dict] = None,
+            on_done: Optional[Callable] = None, start_at: Optional[float] = None) -> TimelineRun:
+        run = TimelineRun(timeline, on_done, values)
+        bound = timeline.bind(values)
+        run.staging = timeline.bind_staged(values)
+        if not run.staging:
+            run.staged.set()
+            run.stage_done.set()
+        self.runs += 1
+        if not bound:
+            run._finish()
+            return run
+        t0 = self.timers.now() if start_at is None else start_at
+        run._left = len(bound)
+        if run.staging:
+            run.timers.append(self.timers.call_at(t0, self._fire_stage, run, t0,
+                                                  name=f"{timeline.name} stage"))
+        for offset_ms, cmds in bound:
+            due = t0 + offset_ms / 1000.0
+            run.timers.append(self.timers.call_at(due, self._fire, run, due, offset_ms, cmds,
+                                                  name=f"{timeline.name} +{offset_ms}"))
+        return run
+
+    def stop(self, run: Optional[TimelineRun], keep: Iterable[Overlay] = ()) -> None:
+        if run is None or not run.active:
+            return
+        outs = self._filter(run.stop(keep))
+        if outs:
+            self.io.submit(self._send, run, outs, lane="timeline")
+
+    def _filter(self, cmds: list) -> list:
+        out = []
+        with self._lock:
+            for c in cmds:
+                ov = _overlay_of(c, "In")
+                if ov:
+                    if self.channels.get(ov[1]) == ov[0]:
+                        self.suppressed += 1
+                        continue
+                    self.channels[ov[1]] = ov[0]
+                ov = _overlay_of(c, "Out")
+                if ov:
+                    if self.channels.get(ov[1]) != ov[0]:
+                        self.suppressed += 1
+                        continue
+                    del self.channels[ov[1]]
+                out.append(c)
+        return out
+
+    def _fire_stage(self, run: TimelineRun, t0: float) -> None:
+        self.io.submit(self._stage, run, t0, lane="stage")
+
+    def _stage(self, run: TimelineRun, t0: float) -> None:
+        try:
+            res = self._send(run, run.staging)
+            if res is not None and res.ok:
+                run.staging_ms = (self.timers.now() - t0) * 1000.0
+                run.staged.set()
+                lead = run.timeline.stage_at_ms or 0
+                self.staging.append((run.staging_ms, lead))
+                log.debug(f"[TIMELINE] {run.timeline.name}: staged in {run.staging_ms:.1f} ms (lead {lead} ms)")
+        finally:
+            run.stage_done.set()
+
+    def _fire(self, run: TimelineRun, due: float, offset_ms: int, cmds: list) -> None:
+        # timer thread: bookkeeping only, the I/O goes to the lane
+        late = (self.timers.now() - due) * 1000.0
+        restage = bool(run.staging) and offset_ms == run.timeline.stage_at_ms
+        run.late_ms.append(late)
+        self.late_ms.append(late)
+        with run._lock:
+            for c in cmds:
+                ov = _overlay_of(c, "In")
+                if ov:
+                    run.on_air.add(ov)
+                ov = _overlay_of(c, "Out")
+                if ov:
+                    run.on_air.discard(ov)
+            run._left -= 1
+            last = run._left == 0
+        self.io.submit(self._dispatch, run, self._filter(cmds), restage, lane="timeline")
+        if last:
+            run._finish()
+
+    def _dispatch(self, run: TimelineRun, cmds: list, restage: bool) -> None:
+        if restage:
+            # bounded wait for the stage batch, then write the fields
+            # again right before the overlay if they are not confirmed
+            run.stage_done.wait(self.stage_grace_ms / 1000.0)
+            if not run.staged.is_set():
+                log.warning(f"[TIMELINE] {run.timeline.name}: staged fields not confirmed, re-sending")
+                run.restaged = True
+                self.restaged += 1
+                cmds = run.staging + cmds
+        self._send(run, cmds)
+
+    def _send(self, run: TimelineRun, cmds: list):
+        if not cmds:
+            return None
+        try:
+            res = self.client.batch(cmds)
+            if not res.ok:
+                log.error(f"[TIMELINE] {run.timeline.name}: {res.errors[0][0][0]} failed: {res.errors[0][1]}")
+            return res
+        except Exception as e:
+            log.error(f"[TIMELINE] {run.timeline.name} failed: {e}")
+            return None
+
+    def staging_stats(self) -> Dict[str, float]:
+        """Time for staged fields to be confirmed vs the lead the timeline gives them"""
+        rows = list(self.staging)
+        if not rows:
+            return {"staged": 0, "restaged": self.restaged}
+        ms = [r[0] for r in rows]
+        margin = [r[1] - r[0] for r in rows]
+        return {
+            "staged": len(rows),
+            "restaged": self.restaged,
+            "staging_ms_mean": statistics.fmean(ms),
+            "staging_ms_max": max(ms),
+            "lead_ms": rows[-1][1],
+            "margin_ms_min": min(margin),
+        }
+
+    def stats(self) -> Dict[str, float]:
+        late = sorted(self.late_ms)
+        if not late:
+            return {"runs": self.runs, "slots": 0, "suppressed": self.suppressed}
+        return {
+            "runs": self.runs,
+            "slots": len(late),
+            "suppressed": self.suppressed,
+            "late_ms_mean": statistics.fmean(late),
+            "late_ms_p95": late[min(len(late) - 1, int(len(late) * 0.95))],
+            "late_ms_max": late[-1],
+        }
+
+
+# ------------------------------------------------------------
+# Sequencer
+# ------------------------------------------------------------
+
+POLICIES = ("queue", "preempt", "merge")
+
+
+class ChannelSequencer:
+    """
+    One running timeline per overlay channel. A timeline submitted while
+    one of its channels is busy is handled by policy:
+
+      queue    waits until those channels are free, FIFO
+      preempt  stops the running one now (overlays the new one also uses
+               stay on air)
+      merge    running + queued + new are replaced by merge(items) ->
+               (timeline, values), e.g. a "2 goals" variant; preempt
+               when no merge function is given
+
+    Together with the engine's channel tracking every channel gets one
+    In and one Out per visible graphic.
+    """
+
+    def __init__(self, engine: TimelineEngine, policy: str = "queue",
+                 merge: Optional[Callable[[List[Tuple[CompiledTimeline, dict]]],
+                                          Tuple[CompiledTimeline, dict]]] = None):
+        if policy not in POLICIES:
+            raise ValueError(f"Okänd sekvens-policy: {policy}")
+        self.engine = engine
+        self.policy = policy
+        self.merge = merge
+        self._lock = threading.RLock()
+        self._active: Dict[int, TimelineRun] = {}
+        self._queue: deque = deque()
+
+        self.queued = 0
+        self.preempted = 0
+        self.merged = 0
+
+    @staticmethod
+    def _channels(timeline: CompiledTimeline) -> Set[int]:
+        return {ch for _, ch in timeline.overlays}
+
+    def _busy(self, channels: Set[int]) -> List[TimelineRun]:
+        runs = []
+        for ch in channels:
+            run = self._active.get(ch)
+            if run is not None and run.active and run not in runs:
+                runs.append(run)
+        return runs
+
+    def submit(self, timeline: CompiledTimeline, values: Optional[dict] = None,
+               policy: Optional[str] = None) -> Optional[TimelineRun]:
+        """Returns the started run, None when queued"""
+        policy = policy or self.policy
+        channels = self._channels(timeline)
+        with self._lock:
+            busy = self._busy(channels)
+            waiting = [q for q in self._queue if self._channels(q[0]) & channels]
+            if not busy and not waiting:
+                return self._start(timeline, values, [])
+
+            if policy == "queue":
+                self._queue.append((timeline, values or {}))
+                self.queued += 1
+                return None
+
+            if policy == "merge" and self.merge is not None:
+                items = [(r.timeline, r.values) for r in busy] + waiting + [(timeline, values or {})]
+                for q in waiting:
+                    self._queue.remove(q)
+                timeline, values = self.merge(items)
+                self.merged += 1
+                log.info(f"[TIMELINE] merged {len(items)} sequences into {timeline.name}")
+            else:
+                for q in waiting:
+                    self._queue.remove(q)
+                self.preempted += len(busy)
+            run = self._start(timeline, values, busy)
+        # stopped outside the lock: engine.stop sends their overlay-outs
+        for old in busy:
+            self.engine.stop(old, keep=timeline.overlays)
+        return run
+
+    def _start(self, timeline: CompiledTimeline, values: Optional[dict],
+               busy: List[TimelineRun]) -> TimelineRun:
+        # release the busy runs' channels; the caller stops them after the
+        # lock is dropped, and their on_done then finds nothing to drain
+        for ch, run in list(self._active.items()):
+            if run in busy:
+                del self._active[ch]
+        run = self.engine.run(timeline, values, on_done=self._on_done)
+        if run.active:
+            for ch in self._channels(timeline):
+                self._active[ch] = run
+        return run
+
+    def _on_done(self, run: TimelineRun) -> None:
+        with self._lock:
+            released = False
+            for ch, r in list(self._active.items()):
+                if r is run:
+                    del self._active[ch]
+                    released = True
+            if released:
+                self._drain()
+
+    def _drain(self) -> None:
+        while self._queue:
+            timeline, values = self._queue[0]
+            if self._busy(self._channels(timeline)):
+                return
+            self._queue.popleft()
+            self._start(timeline, values, [])
+
+    def pending(self) -> List[str]:
+        with self._lock:
+            return [tl.name for tl, _ in self._queue]
+
+    def running(self) -> List[TimelineRun]:
+        with self._lock:
+            return self._busy(set(self._active))
+
+    def clear(self) -> None:
+        """Drops the queue and stops every running timeline"""
+        with self._lock:
+            self._queue.clear()
+            busy = self._busy(set(self._active))
+            self._active.clear()
+        for run in busy:
+            self.engine.stop(run)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "policy": self.policy,
+                "queued": self.queued,
+                "preempted": self.preempted,
+                "merged": self.merged,
+                "waiting": len(self._queue),
+            }
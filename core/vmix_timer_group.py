@@ -0,0 +1,267 @@
+import logging
+import statistics
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from scoreboard_app.core.vmix_batch import BatchResult
+from scoreboard_app.core.vmix_clock import ClockModel, parse_clock
+
+log = logging.getLogger(__name__)
+
+FieldRef = Tuple[str, str]
+
+_FUNCTIONS = {
+    "start": "StartCountdown",
+    "pause": "PauseCountdown",
+    "adjust": "AdjustCountdown",
+    "set": "SetCountdown",
+}
+
+
+class TimerGroup:
+    """
+    Countdown fields that start, pause and adjust together (match clock +
+    running penalties), sent as ONE client.batch() burst:
+
+      TCP:  every command written back to back on the one socket
+      HTTP: concurrent requests, as wide as the connection pool allows
+
+    Members are passed in per burst (see TimerRegistry), never read from a
+    status fetch. Each burst records its skew: the spread between the
+    first and the last command leaving (skew_ms) and between the first and
+    the last reply (ack_skew_ms), see stats().
+    """
+
+    def __init__(self, client, history: int = 200):
+        self.client = client
+        self._lock = threading.Lock()
+        # (op, commands, skew_ms, ack_skew_ms, wall_ms)
+        self.history: deque = deque(maxlen=history)
+
+    # --------------------------------------------------
+    # Group operations
+    # --------------------------------------------------
+    def commands(self, op: str, value=None, members: Iterable[FieldRef] = ()) -> list:
+        function = _FUNCTIONS.get(op)
+        if function is None:
+            raise ValueError(f"Okänd timer-operation: {op}")
+        cmds = []
+        for inp, field in members:
+            params = {"Input": inp, "SelectedName": field}
+            if value is not None:
+                params["Value"] = value
+            cmds.append((function, params))
+        return cmds
+
+    def send(self, op: str, cmds: list) -> BatchResult:
+        """One burst of prepared countdown commands, skew recorded under op"""
+        width = min(len(cmds), getattr(self.client, "pool_size", len(cmds)))
+        res = self.client.batch(cmds, max_workers=max(1, width))
+        with self._lock:
+            self.history.append((op, len(cmds), res.skew_ms, res.ack_skew_ms, res.wall_ms))
+        log.debug(f"[TIMERS] {op} x{len(cmds)}: skew {res.skew_ms:.2f} ms, "
+                  f"ack skew {res.ack_skew_ms:.2f} ms, {res.wall_ms:.1f} ms")
+        if not res.ok:
+            function, err = res.errors[0][0][0], res.errors[0][1]
+            raise RuntimeError(f"[TIMERS] {op}: {function} failed: {err}")
+        return res
+
+    # --------------------------------------------------
+    # Skew tracking
+    # --------------------------------------------------
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            rows = [r for r in self.history if r[1] > 1]
+        if not rows:
+            return {"bursts": 0}
+        skew = [r[2] for r in rows]
+        ack = [r[3] for r in rows]
+        return {
+            "bursts": len(rows),
+            "skew_ms_mean": statistics.fmean(skew),
+            "skew_ms_max": max(skew),
+            "ack_skew_ms_mean": statistics.fmean(ack),
+            "ack_skew_ms_max": max(ack),
+            "wall_ms_mean": statistics.fmean(r[4] for r in rows),
+        }
+
+
+# ------------------------------------------------------------
+# Named countdowns
+# ------------------------------------------------------------
+
+class CountdownTimer:
+    """One named countdown field with its own local model"""
+
+    __slots__ = ("name", "input", "field", "role", "model")
+
+    def __init__(self, name: str, input_name: str, field: str, role: str = "custom",
+                 model: Optional[ClockModel] = None):
+        self.name = name
+        self.input = input_name
+        self.field = field
+        self.role = role
+        self.model = model or ClockModel(name=name)
+
+    @property
+    def ref(self) -> FieldRef:
+        return (self.input, self.field)
+
+    def __repr__(self):
+        return f"CountdownTimer({self.name!r}, {self.input!r}, {self.field!r}, role={self.role!r})"
+
+
+class TimerRegistry:
+    """
+    N named countdowns (match clock, timeouts, intermission, ...) across
+    inputs. Every operation takes any subset – names and/or a role – and
+    goes out as ONE TimerGroup burst:
+
+        reg.start(role="timeout")
+        reg.pause(["clock", "intermission"])
+        reg.adjust(-5, ["clock"])
+        reg.set({"timeout_home": "00:30", "timeout_away": "00:30"})
+
+    link(name, provider) adds countdowns that join every start/pause/
+    adjust of that timer (running penalties follow the match clock).
+    Each timer's ClockModel follows the command even if the burst fails
+    (the error is raised afterwards); the next poll resyncs it.
+    """
+
+    def __init__(self, client, history: int = 200):
+        self.client = client
+        self.group = TimerGroup(client, history=history)
+        self._timers: Dict[str, CountdownTimer] = {}
+        self._links: Dict[str, List[Callable[[], Iterable[FieldRef]]]] = {}
+
+    @classmethod
+    def from_config(cls, client, cfg: dict) -> "TimerRegistry":
+        """mapping.timers: {name: {"input": ..., "field": ..., "role": ...}}"""
+        reg = cls(client)
+        for name, spec in (cfg.get("mapping", {}).get("timers") or {}).items():
+            if isinstance(spec, dict) and spec.get("input") and spec.get("field"):
+                reg.register(name, spec["input"], spec["field"], spec.get("role", "custom"))
+        return reg
+
+    # --------------------------------------------------
+    # Registry
+    # --------------------------------------------------
+    def register(self, name: str, input_name: str, field: str, role: str = "custom",
+                 model: Optional[ClockModel] = None) -> CountdownTimer:
+        if not name or not input_name or not field:
+            raise ValueError(f"Timer behöver namn, input och fält: {name!r}")
+        timer = CountdownTimer(name, input_name, field, role, model)
+        self._timers[name] = timer
+        return timer
+
+    def unregister(self, name: str) -> bool:
+        self._links.pop(name, None)
+        return self._timers.pop(name, None) is not None
+
+    def link(self, name: str, provider: Callable[[], Iterable[FieldRef]]) -> None:
+        self._links.setdefault(name, []).append(provider)
+
+    def get(self, name: str) -> Optional[CountdownTimer]:
+        return self._timers.get(name)
+
+    def names(self, role: Optional[str] = None) -> List[str]:
+        return [n for n, t in self._timers.items() if role is None or t.role == role]
+
+    def __contains__(self, name) -> bool:
+        return name in self._timers
+
+    def __iter__(self):
+        return iter(list(self._timers.values()))
+
+    def select(self, names: Optional[Iterable[str]] = None,
+               role: Optional[str] = None) -> List[CountdownTimer]:
+        """names=None and role=None -> every timer"""
+        if names is None:
+            picked = list(self._timers.values())
+        else:
+            picked = []
+            for n in ([names] if isinstance(names, str) else names):
+                t = self._timers.get(n)
+                if t is None:
+                    raise ValueError(f"Okänd timer: {n}")
+                picked.append(t)
+        return [t for t in picked if role is None or t.role == role]
+
+    def _linked(self, timers: List[CountdownTimer]) -> List[FieldRef]:
+        out = []
+        for t in timers:
+            for provider in self._links.get(t.name, ()):
+                try:
+                    out.extend(provider())
+                except Exception as e:
+                    log.error(f"[TIMERS] link provider for {t.name} failed: {e}")
+        return out
+
+    # --------------------------------------------------
+    # Batched operations
+    # --------------------------------------------------
+    def _run(self, op: str, timers: List[CountdownTimer], value=None) -> Optional[BatchResult]:
+        refs = [t.ref for t in timers] + self._linked(timers)
+        refs = list(dict.fromkeys(refs))
+        if not refs:
+            return None
+        return self.group.send(op, self.group.commands(op, value, refs))
+
+    def start(self, names=None, role: Optional[str] = None) -> Optional[BatchResult]:
+        timers = self.select(names, role)
+        try:
+            return self._run("start", timers)
+        finally:
+            for t in timers:
+                t.model.set_running(True)
+
+    def pause(self, names=None, role: Optional[str] = None) -> Optional[BatchResult]:
+        timers = self.select(names, role)
+        try:
+            return self._run("pause", timers)
+        finally:
+            for t in timers:
+                t.model.set_running(False)
+
+    def adjust(self, seconds: int, names=None, role: Optional[str] = None) -> Optional[BatchResult]:
+        timers = self.select(names, role)
+        try:
+            return self._run("adjust", timers, int(seconds))
+        finally:
+            for t in timers:
+                t.model.adjust(seconds)
+
+    def set(self, values, names=None, role: Optional[str] = None) -> Optional[BatchResult]:
+        """
+        values: one "MM:SS" for every selected timer, or {name: "MM:SS"}
+        (then the dict keys are the selection). Neither starts nor pauses:
+        each model keeps its running flag, like ClockController.set_time.
+        """
+        if isinstance(values, dict):
+            timers = self.select(list(values), role)
+            per = {t.name: values[t.name] for t in timers}
+        else:
+            timers = self.select(names, role)
+            per = {t.name: values for t in timers}
+        cmds = [("SetCountdown", {"Input": t.input, "SelectedName": t.field, "Value": per[t.name]})
+                for t in timers]
+        if not cmds:
+            return None
+        try:
+            return self.group.send("set", cmds)
+        finally:
+            for t in timers:
+                secs = parse_clock(per[t.name])
+                if secs is not None:
+                    t.model.set(secs)
+
+    def observe(self, snap, skip: Iterable[str] = ()) -> None:
+        """StatePoller subscriber: resyncs every timer's model (except skip)"""
+        state = snap.state
+        for t in self:
+            if t.name in skip:
+                continue
+            inp = state.find_input(t.input)
+            if inp is not None:
+                t.model.observe(inp.get_field(t.field), at=snap.fetched_at)
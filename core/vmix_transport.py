@@ -0,0 +1,148 @@
+import threading
+import time
+import urllib.parse
+from collections import deque
+from concurrent.futures import Future
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def build_query(params: dict) -> str:
+    """
+    URL-encodes vMix function parameters, skipping None values:
+        {"Input": "SCOREBOARD UPPE", "Value": "5"} -> "Input=SCOREBOARD%20UPPE&Value=5"
+    Shared by the HTTP and TCP transports.
+    """
+    parts = []
+    for k, v in params.items():
+        if v is None:
+            continue
+        parts.append(f"{k}={urllib.parse.quote(str(v), safe='')}")
+    return "&".join(parts)
+
+
+class HttpTransport:
+    """
+    Keep-alive HTTP transport for the vMix Web API.
+
+    One requests.Session with a pooled adapter is reused for every call,
+    so a burst of SetText/StartCountdown pays the TCP handshake once.
+
+    Records:
+    - requests sent / new sockets opened -> reuse rate
+    - currently open (idle) sockets in the pool
+    - per-request latency (rolling window)
+    """
+
+    def __init__(self, host="127.0.0.1", port=8088,
+                 connect_timeout: float = 1.0,
+                 read_timeout: float = 3.0,
+                 pool_size: int = 4,
+                 latency_window: int = 200):
+        self.host = host
+        self.port = port
+        self.base_url = f"http://{self.host}:{self.port}/api/?"
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        self._adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            pool_block=False,
+            max_retries=0,
+        )
+        self._session = requests.Session()
+        self._session.mount("http://", self._adapter)
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)
+        self._requests = 0
+        self._errors = 0
+
+    # --------------------------------------------------
+    # Request
+    # --------------------------------------------------
+    def get(self, query: str) -> str:
+        url = self.base_url + query
+        t0 = time.perf_counter()
+        try:
+            r = self._session.get(url, timeout=(self.connect_timeout, self.read_timeout))
+            r.raise_for_status()
+        except Exception:
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            ms = (time.perf_counter() - t0) * 1000.0
+            with self._lock:
+                self._requests += 1
+                self._latencies.append(ms)
+        # vMix always answers UTF-8; don't let requests guess Latin-1
+        return r.content.decode("utf-8", errors="replace")
+
+    def call(self, function: str, params: dict) -> str:
+        query = build_query({"Function": function, **params})
+        return self.get(query)
+
+    def send(self, function: str, params: dict) -> Future:
+        """
+        HTTP has no pipelining: runs the call and returns a completed Future,
+        so callers can treat both transports the same way.
+        """
+        fut = Future()
+        try:
+            fut.set_result(self.call(function, params))
+        except Exception as e:
+            fut.set_exception(e)
+        return fut
+
+    def status_xml(self) -> str:
+        # vMix requires Function=None to return full XML
+        return self.get("Function=None")
+
+    def close(self):
+        self._session.close()
+
+    # --------------------------------------------------
+    # Pool statistics
+    # --------------------------------------------------
+    def _pools(self) -> list:
+        pools = self._adapter.poolmanager.pools
+        try:
+            return [pools[k] for k in pools.keys()]
+        except Exception:
+            return []
+
+    def stats(self) -> dict:
+        """
+        Snapshot of pool statistics, e.g. for a debug panel or log line.
+        """
+        new_conns = 0
+        open_sockets = 0
+        for pool in self._pools():
+            new_conns += getattr(pool, "num_connections", 0)
+            try:
+                for conn in list(pool.pool.queue):
+                    if conn is not None and getattr(conn, "sock", None) is not None:
+                        open_sockets += 1
+            except Exception:
+                pass
+
+        with self._lock:
+            n = self._requests
+            lat = list(self._latencies)
+            errors = self._errors
+
+        reused = max(0, n - new_conns)
+        return {
+            "requests": n,
+            "errors": errors,
+            "new_connections": new_conns,
+            "reused": reused,
+            "reuse_rate": (reused / n) if n else 0.0,
+            "open_sockets": open_sockets,
+            "last_ms": lat[-1] if lat else 0.0,
+            "avg_ms": (sum(lat) / len(lat)) if lat else 0.0,
+            "max_ms": max(lat) if lat else 0.0,
+        }
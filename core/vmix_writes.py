@@ -0,0 +1,98 @@
+import threading
+from typing import Dict, Optional, Set, Tuple
+
+from scoreboard_app.core.vmix_snapshot import Snapshot
+
+
+class WriteFilter:
+    """
+    Last-known value per (input key, field) for SetText/SetImage.
+
+    A write is skipped when the value equals what vMix is known to show:
+    - the last value we sent since the current snapshot was fetched, else
+    - the value in the most recent parsed snapshot, if it is younger than
+      trust_ms (countdowns change Time fields inside vMix behind our back).
+
+    A new snapshot reseeds the table (vMix is the authority again),
+    except for writes still in flight, which are newer than any snapshot.
+    reset() forgets everything, e.g. after a reconnect.
+    """
+
+    def __init__(self, trust_ms: float = 1000.0):
+        self.trust_ms = trust_ms
+        self._lock = threading.Lock()
+        self._table: Dict[Tuple[str, str], str] = {}
+        self._unknown: Set[Tuple[str, str]] = set()
+        self._inflight: Dict[Tuple[str, str], int] = {}
+        self._seed: Optional[Snapshot] = None
+
+        self.skipped = 0
+        self.passed = 0
+
+    def _reseed(self, snap: Optional[Snapshot]) -> None:
+        if snap is not self._seed:
+            self._table = {k: v for k, v in self._table.items() if k in self._inflight}
+            self._unknown = set()
+            self._seed = snap
+
+    def known(self, snap: Optional[Snapshot], input_key: str, field: str) -> Optional[str]:
+        with self._lock:
+            self._reseed(snap)
+            if (input_key, field) in self._unknown:
+                return None
+            value = self._table.get((input_key, field))
+        if value is not None:
+            return value
+        if snap is not None and snap.parsed and snap.age_ms <= self.trust_ms:
+            inp = snap.state.find_input(input_key)
+            if inp is not None:
+                return inp.get_field(field)
+        return None
+
+    def check(self, snap: Optional[Snapshot], input_key: str, field: str,
+              value: str, force: bool = False) -> bool:
+        """
+        True -> send the write (and it is recorded), False -> redundant, skip.
+        Every True must be followed by done() once the write completed.
+        """
+        value = "" if value is None else str(value)
+        if not force and self.known(snap, input_key, field) == value:
+            self.skipped += 1
+            return False
+
+        with self._lock:
+            self._reseed(snap)
+            key = (input_key, field)
+            self._table[key] = value
+            self._unknown.discard(key)
+            self._inflight[key] = self._inflight.get(key, 0) + 1
+        self.passed += 1
+        return True
+
+    def done(self, input_key: str, field: str, ok: bool = True) -> None:
+        key = (input_key, field)
+        with self._lock:
+            n = self._inflight.get(key, 0) - 1
+            if n > 0:
+                self._inflight[key] = n
+            else:
+                self._inflight.pop(key, None)
+        if not ok:
+            self.forget(input_key, field)
+
+    def forget(self, input_key: str, field: str) -> None:
+        """Called when a write failed: we no longer know what vMix shows"""
+        with self._lock:
+            self._table.pop((input_key, field), None)
+            # the snapshot value may be stale too; stop trusting it until reseed
+            self._unknown.add((input_key, field))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._table = {}
+            self._unknown = set()
+            self._inflight = {}
+            self._seed = None
+
+    def stats(self) -> dict:
+        return {"skipped": self.skipped, "passed": self.passed}
@@ -1,6 +1,12 @@
 import tkinter as tk
 from tkinter import ttk
 
+from scoreboard_app.gui.io_bridge import TkIO
+
+# local clock render rate (no vMix I/O, see core/vmix_clock.ClockModel)
+RENDER_MS = 100
+
+
 class ClockPanel(tk.Frame):
     """
     UI panel for controlling main game clock.
@@ -10,11 +16,18 @@ class ClockPanel(tk.Frame):
         self.controller.stop()
         self.controller.adjust(delta)
         self.controller.set_period(idx)
+
+    Every controller call runs through TkIO (never on the Tk thread).
+    The time label and the toggle text are rendered at 10 Hz from
+    controller.model; the poller (if given) only resyncs that model.
     """
 
-    def __init__(self, master, controller):
+    def __init__(self, master, controller, io: TkIO = None, poller=None):
         super().__init__(master)
         self.controller = controller
+        self.io = io or TkIO(self)
+        self.poller = poller
+        self._sub = None
 
         # --- buttons row ---
         tk.Button(self, text="-5", width=4, command=lambda: self._adjust(-5)).grid(row=0, column=0, padx=3)
@@ -36,31 +49,71 @@ class ClockPanel(tk.Frame):
                 command=lambda idx=i: self._set_period(idx)
             ).grid(row=2, column=i, padx=4, pady=8)
 
+        # --- live time (local model) ---
+        self.lbl_time = tk.Label(self, text="--:--", font=("Segoe UI", 28, "bold"))
+        self.lbl_time.grid(row=3, column=0, columnspan=4, pady=4)
+        self._shown = None
+
+        if self.poller is not None:
+            self._sub = self.poller.subscribe(self.controller.observe)
+        self.after(RENDER_MS, self._render)
+
+    def destroy(self):
+        if self._sub is not None:
+            self.poller.unsubscribe(self._sub)
+            self._sub = None
+        super().destroy()
+
+    def _render(self):
+        """10 Hz: only touches widgets whose text changed"""
+        try:
+            shown = (self.controller.display(), self.controller.running)
+            if shown != self._shown:
+                self._shown = shown
+                self.lbl_time.configure(text=shown[0])
+                if str(self.btn_toggle.cget("state")) != "disabled":
+                    self._sync_toggle()
+        except tk.TclError:
+            return  # panel destroyed
+        self.after(RENDER_MS, self._render)
+
     # ---------------------------------------------------------
 
     def _toggle_clock(self):
         """
         Toggle play/pause using new API.
         """
-        try:
-            self.controller.toggle_pause()
-        except:
-            print("[ClockPanel] ERROR toggle_pause")
+        # optimistic: show what the button will do next once this lands
+        pending = "START" if self.controller.running else "PAUSE"
+        self.io.run_button(
+            self.btn_toggle, self.controller.toggle_pause,
+            pending_text=pending,
+            on_done=lambda _: self._sync_toggle(),
+            on_error=lambda e: print("[ClockPanel] ERROR toggle_pause", e),
+        )
+
+    def _sync_toggle(self):
+        self.btn_toggle.configure(text="PAUSE" if self.controller.running else "START")
 
     def _adjust(self, seconds):
         """
         +/- seconds
         """
-        try:
-            self.controller.adjust(seconds)
-        except:
-            print("[ClockPanel] ERROR adjust")
+        self.io.submit(
+            self.controller.adjust, seconds,
+            on_error=lambda e: print("[ClockPanel] ERROR adjust", e),
+        )
 
     def _set_period(self, idx: int):
         """
         Change period => resets time
         """
         try:
-            self.controller.set_period(idx)
-        except:
+            fn = self.controller.set_period
+        except AttributeError:
             print("[ClockPanel] ERROR set_period")
+            return
+        self.io.submit(
+            fn, idx,
+            on_error=lambda e: print("[ClockPanel] ERROR set_period", e),
+        )
@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk
 
 from scoreboard_app.gui.player_select_dialog import PlayerSelectDialog
+from scoreboard_app.gui.io_bridge import TkIO
 
 
 class GoalPanel(ttk.Frame):
@@ -9,12 +10,13 @@ class GoalPanel(ttk.Frame):
     GUI for registering goals:
       - HOME goal
       - AWAY goal
-      - All logic delegated to GoalController
+      - All logic delegated to GoalController (on the TkIO worker)
     """
 
-    def __init__(self, master, controller):
+    def __init__(self, master, controller, io: TkIO = None):
         super().__init__(master)
         self.controller = controller  # GoalController instance
+        self.io = io or TkIO(self)
 
         self._build_ui()
 
@@ -66,10 +68,12 @@ class GoalPanel(ttk.Frame):
             player_name = f"#{player_number}"
 
         try:
-            self.controller.add_goal(
+            self.io.submit(
+                self.controller.add_goal,
                 team=team,
                 scorer_name=player_name,
-                scorer_number=player_number
+                scorer_number=player_number,
+                on_error=lambda e: print("[GoalPanel] ERROR add_goal:", e),
             )
         except Exception as e:
             print("[GoalPanel] ERROR add_goal:", e)
@@ -0,0 +1,78 @@
+import logging
+import tkinter as tk
+
+from scoreboard_app.core.vmix_io import IOWorker
+
+DRAIN_MS = 30
+
+
+class TkIO:
+    """
+    Glue between the Tk main loop and an IOWorker.
+
+    Panels call submit()/run_button() instead of the controllers directly;
+    the work runs on the worker threads and the callbacks come back on the
+    Tk thread via after(). Nothing here ever waits on the network.
+    """
+
+    def __init__(self, root: tk.Misc, worker: IOWorker = None, drain_ms: int = DRAIN_MS):
+        self.root = root
+        self.worker = worker or IOWorker()
+        self.drain_ms = drain_ms
+        self._closed = False
+        self.root.after(self.drain_ms, self._drain)
+
+    def _drain(self):
+        if self._closed:
+            return
+        self.worker.drain()
+        self.root.after(self.drain_ms, self._drain)
+
+    def submit(self, fn, *args, **kwargs):
+        return self.worker.submit(fn, *args, **kwargs)
+
+    def post(self, callback, arg=None):
+        """Runs callback(arg) on the Tk thread (safe to call from any thread)"""
+        self.worker.post(callback, arg)
+
+    def run_button(self, button, fn, *args,
+                   pending_text: str = None,
+                   on_done=None, on_error=None, **kwargs):
+        """
+        Optimistic button: shows pending_text (the expected outcome) and is
+        disabled right away; re-enabled when the call completed. On error the
+        old text comes back.
+        """
+        try:
+            old_text = button.cget("text")
+            button.configure(state="disabled", text=pending_text or old_text)
+        except tk.TclError:
+            old_text = None
+
+        def done(value):
+            self._restore(button, None)
+            if on_done is not None:
+                on_done(value)
+
+        def failed(exc):
+            self._restore(button, old_text)
+            if on_error is not None:
+                on_error(exc)
+            else:
+                logging.error(f"[IO] {getattr(fn, '__name__', fn)} failed: {exc}")
+
+        return self.worker.submit(fn, *args, on_done=done, on_error=failed, **kwargs)
+
+    @staticmethod
+    def _restore(button, text):
+        try:
+            if text is None:
+                button.configure(state="normal")
+            else:
+                button.configure(state="normal", text=text)
+        except tk.TclError:
+            pass  # button destroyed meanwhile
+
+    def close(self):
+        self._closed = True
+        self.worker.close()
@@ -2,6 +2,9 @@ import tkinter as tk
 from tkinter import ttk
 
 from scoreboard_app.core.vmix_client import VMixClient
+from scoreboard_app.core.vmix_events import VMixEventService
+from scoreboard_app.core.vmix_io import IOWorker
+from scoreboard_app.core.vmix_poller import StatePoller
 from scoreboard_app.config.config_loader import load_config, save_config
 
 # Controllers
@@ -15,6 +18,7 @@ from scoreboard_app.gui.clock_panel import ClockPanel
 from scoreboard_app.gui.goal_panel import GoalPanel
 from scoreboard_app.gui.penalty_panel import PenaltyPanel
 from scoreboard_app.gui.settings_dialog import open_settings_dialog
+from scoreboard_app.gui.io_bridge import TkIO
 
 
 class MainWindow(tk.Tk):
@@ -26,10 +30,23 @@ class MainWindow(tk.Tk):
         # Load config + Connect to vMix
         # --------------------------------------
         self.cfg = load_config()
-        host = self.cfg.get("vmix", {}).get("host", "127.0.0.1")
-        port = int(self.cfg.get("vmix", {}).get("port", 8088))
+        self.client = VMixClient.from_config(self.cfg)
 
-        self.client = VMixClient(host, port)
+        # Optional push events (TCP SUBSCRIBE TALLY/ACTS)
+        self.events = None
+        if self.cfg.get("connection", {}).get("subscribe_events"):
+            self.events = VMixEventService.from_config(self.cfg)
+            self.events.start()
+
+        # All vMix I/O runs on worker threads, results come back via after()
+        # ("penalty": clears fired by the PenaltyScheduler)
+        self.io = TkIO(self, IOWorker(lanes=("cmd", "read", "penalty")))
+
+        # ONE status poll for every live panel
+        self.poller = StatePoller.from_config(self.client, self.cfg)
+        if self.events is not None:
+            # TALLY/ACTS -> poll right away instead of waiting for the tick
+            self.events.subscribe(lambda ev: self.poller.poll_now())
 
         # --------------------------------------
         # Initialize controllers (NO EXTRA ARG)
@@ -37,7 +54,9 @@ class MainWindow(tk.Tk):
         self.clock = ClockController(self.client, self.cfg)
         self.scoreboard = ScoreboardController(self.client, self.cfg)
         self.goal = GoalController(self.client, self.cfg, self.scoreboard)
-        self.penalty = PenaltyController(self.client, self.cfg, self.scoreboard)
+        self.penalty = PenaltyController(self.client, self.cfg, self.scoreboard,
+                                         clock=self.clock, io=self.io.worker)
+        self.poller.subscribe(self.penalty.observe)
 
         # --------------------------------------
         # Build UI
@@ -45,9 +64,9 @@ class MainWindow(tk.Tk):
         nb = ttk.Notebook(self)
         nb.pack(expand=True, fill="both")
 
-        nb.add(ClockPanel(self, self.clock), text="CLOCK")
-        nb.add(GoalPanel(self, self.goal), text="GOALS")
-        nb.add(PenaltyPanel(self, self.penalty), text="PENALTIES")
+        nb.add(ClockPanel(self, self.clock, self.io, self.poller), text="CLOCK")
+        nb.add(GoalPanel(self, self.goal, self.io), text="GOALS")
+        nb.add(PenaltyPanel(self, self.penalty, self.poller, self.io), text="PENALTIES")
 
         # --------------------------------------
         # MENU + SETTINGS
@@ -1,6 +1,12 @@
 import tkinter as tk
 from tkinter import ttk
-import logging
+
+from scoreboard_app.gui.io_bridge import TkIO
+
+# staleness check of the cached snapshot (no vMix I/O)
+AGE_MS = 1000
+# snapshot older than this -> staleness shown under the table
+STALE_MS = 2000
 
 
 class PenaltyPanel(tk.Frame):
@@ -11,16 +17,17 @@ class PenaltyPanel(tk.Frame):
         cfg["penalties"]["home"] = [slot0, slot1]
         cfg["penalties"]["away"] = [slot0, slot1]
 
-    Controller interface:
-        controller.get_penalties() -> {
-            "home": [slot0, slot1],
-            "away": [slot0, slot1]
-        }
+    The panel runs no read loop of its own: it subscribes to StatePoller
+    deltas of the penalty fields and only touches the cells that changed.
+    Deltas stop when vMix stops answering, so a light timer checks the age
+    of the cached snapshot and shows it under the table once it is stale.
     """
 
-    def __init__(self, parent, controller):
+    def __init__(self, parent, controller, poller, io: TkIO = None):
         super().__init__(parent)
         self.controller = controller
+        self.io = io or TkIO(self)
+        self.poller = poller
         self.cfg = controller.cfg
 
         # CONFIG IS HERE NOW
@@ -28,8 +35,14 @@ class PenaltyPanel(tk.Frame):
 
         self._build_gui()
 
-        # refresh loop
-        self.after(1000, self._refresh)
+        self._cells = self._cell_vars()
+        self._sub = poller.subscribe_changes(
+            self._on_changes,
+            inputs=[controller.scoreboard_input],
+            fields=list(self._cells),
+            deliver=self.io.post,
+        )
+        self.after(AGE_MS, self._show_age)
 
     def _build_gui(self):
         """
@@ -41,7 +54,7 @@ class PenaltyPanel(tk.Frame):
         table = tk.Frame(self)
         table.pack(fill="x", padx=4, pady=4)
 
-        headers = ["TEAM", "TIME", "NUMBER", "NAME"]
+        headers = ["TEAM", "TIME", "NUMBER"]
         for c, h in enumerate(headers):
             tk.Label(table, text=h, font=("Arial", 10, "bold")).grid(row=0, column=c, padx=6)
 
@@ -57,10 +70,13 @@ class PenaltyPanel(tk.Frame):
             row_widgets = self._make_row(table, 3 + i, is_home=False, index=i)
             self.away_rows.append(row_widgets)
 
+        self.age_var = tk.StringVar(value="")
+        tk.Label(self, textvariable=self.age_var, fg="#a00").pack()
+
     def _make_row(self, parent, r, is_home, index):
         """
         Create a GUI row:
-           TEAM LABEL | TIME | NUMBER | NAME
+           TEAM LABEL | TIME | NUMBER
         """
         team_txt = "HOME" if is_home else "AWAY"
         team_label = tk.Label(parent, text=f"{team_txt} {index+1}")
@@ -68,39 +84,43 @@ class PenaltyPanel(tk.Frame):
 
         time_var = tk.StringVar(value="")
         nr_var = tk.StringVar(value="")
-        nm_var = tk.StringVar(value="")
 
         tk.Label(parent, textvariable=time_var).grid(row=r, column=1, padx=6)
         tk.Label(parent, textvariable=nr_var).grid(row=r, column=2, padx=6)
-        tk.Label(parent, textvariable=nm_var).grid(row=r, column=3, padx=6)
 
         return {
             "time": time_var,
             "nr": nr_var,
-            "name": nm_var
         }
 
-    def _refresh(self):
-        """
-        Pull latest penalty info from controller and display it.
-        """
-        try:
-            data = self.controller.get_penalties()
-
-            # HOME
-            for i, slot in enumerate(data["home"]):
-                self.home_rows[i]["time"].set(slot["time"])
-                self.home_rows[i]["nr"].set(slot["number"])
-                self.home_rows[i]["name"].set(slot["name"])
-
-            # AWAY
-            for i, slot in enumerate(data["away"]):
-                self.away_rows[i]["time"].set(slot["time"])
-                self.away_rows[i]["nr"].set(slot["number"])
-                self.away_rows[i]["name"].set(slot["name"])
-
-        except Exception as e:
-            logging.error(f"[PenaltyPanel] refresh error: {e}")
-
-        finally:
-            self.after(1000, self._refresh)
+    def _cell_vars(self):
+        """field name -> StringVar of its cell"""
+        rows = {"home": self.home_rows, "away": self.away_rows}
+        col = {"time": "time", "number": "nr"}
+        return {
+            field: rows[side][i][col[kind]]
+            for field, (side, i, kind) in self.controller.field_layout().items()
+            if i < len(rows[side])
+        }
+
+    def _on_changes(self, changes):
+        for c in changes:
+            var = self._cells.get(getattr(c, "field", None))
+            if var is not None:
+                var.set((c.new or "").strip())
+
+    def _show_age(self):
+        if not self.winfo_exists():
+            return  # panel destroyed
+        age = self.controller.snapshot_age_ms()
+        if age is None:
+            self.age_var.set("no vMix data")
+        elif age > STALE_MS:
+            self.age_var.set(f"vMix data {age / 1000.0:.1f} s old")
+        else:
+            self.age_var.set("")
+        self.after(AGE_MS, self._show_age)
+
+    def destroy(self):
+        self.poller.unsubscribe(self._sub)
+        super().destroy()
@@ -21,6 +21,7 @@ from __future__ import annotations
 from typing import Dict, Any, Optional
 
 from vmix_client import VMixClient
+from vmix_timers import Timer
 
 
 def _parse_time_to_seconds(value: str | None) -> Optional[int]:
@@ -62,10 +63,29 @@ class ScoreboardController:
         self._clock_running_flag: bool = False
         self._last_clock_secs: Optional[int] = None
         self._last_penalty_secs: Dict[str, Optional[int]] = {}
+        # get_changes: text-tabell och running-flagga som GUI:t senast fick
+        self._view_texts: Optional[Dict[str, str]] = None
+        self._view_running: Optional[bool] = None
+
+        # tidsmätning från senaste batch (wall_ms / serial_ms / skew_ms / errors)
+        self.last_batch: Optional[Dict[str, Any]] = None
+        # spridning (ms) för de senaste START/PAUS/justera-burstarna
+        self.timer_skew_ms: list = []
+        # väntande OverlayInputNOut för mål-grafiken (client.timers)
+        self._goal_off_timer: Optional[Timer] = None
 
     # ------------------------------------------------------------
     # Hjälpare
     # ------------------------------------------------------------
+    def _run_batch(self, commands: list) -> None:
+        """
+        Kör anropen parallellt via client.batch (samma fält i ordning)
+        och kastar första felet, som de sekventiella anropen gjorde.
+        """
+        self.last_batch = self.client.batch(commands)
+        if self.last_batch["errors"]:
+            raise self.last_batch["errors"][0][1]
+
     def _scoreboard_input_number(self) -> str:
         num = self.client.find_input_number(self.sb_input)
         if num is None:
@@ -160,16 +180,8 @@ class ScoreboardController:
     # ------------------------------------------------------------
     # State-läsning
     # ------------------------------------------------------------
-    def get_state(self) -> Dict[str, Any]:
-        """
-        Läser XML från vMix och bygger state:
-          - clock_raw / clock_secs
-          - clock_running (från intern flagga)
-          - mål
-          - period
-          - penalties: per slot time_raw, seconds, active, number
-          - auto-clear penalties vid 00:00 (endast om matchuret > 0)
-        """
+    def _read_texts(self) -> Dict[str, str]:
+        """Läser XML från vMix och returnerar SCOREBOARD-inputens text-tabell"""
         root = self.client.get_status_xml()
         sb_num = self._scoreboard_input_number()
 
@@ -181,77 +193,120 @@ class ScoreboardController:
         if sb_node is None:
             raise RuntimeError("Kunde inte hitta SCOREBOARD-input i XML.")
 
-        # Bygg text-tabell
         texts: Dict[str, str] = {}
         for t in sb_node.findall("text"):
             name = t.get("name") or ""
             texts[name] = (t.text or "").strip()
+        return texts
 
-        # Matchur
-        clock_field = self.sb_cfg["clock_field"]
-        clock_raw = texts.get(clock_field, "00:00")
+    def _clock_from_texts(self, texts: Dict[str, str]) -> Dict[str, Any]:
+        clock_raw = texts.get(self.sb_cfg["clock_field"], "00:00")
         clock_secs = _parse_time_to_seconds(clock_raw)
 
         if clock_secs == 0:
             # om vMix klocka är 0 → vår flagga är alltid False
             self._clock_running_flag = False
-        running = self._clock_running_flag
         self._last_clock_secs = clock_secs
+        return {
+            "clock_raw": clock_raw,
+            "clock_secs": clock_secs,
+            "clock_running": self._clock_running_flag,
+        }
 
-        # Mål & period
-        home_score = texts.get(self.sb_cfg["home_score_field"], "")
-        away_score = texts.get(self.sb_cfg["away_score_field"], "")
-        period = texts.get(self.sb_cfg["period_field"], "")
+    def _penalty_from_texts(self, slot: str, texts: Dict[str, str],
+                            clock_secs: Optional[int]) -> Dict[str, Any]:
+        fields = self._penalty_fields(slot)
+        tf = fields["time_field"]
+        nf = fields["number_field"]
 
-        # Utvisningar
-        penalties_state: Dict[str, Dict[str, Any]] = {}
-        pen_cfg = self.sb_cfg.get("penalties", {})
+        t_raw = texts.get(tf or "", "00:00") if tf else "00:00"
+        secs = _parse_time_to_seconds(t_raw)
+        pdata = {
+            "slot": slot,
+            "time_raw": t_raw,
+            "seconds": secs,
+            "active": secs is not None and secs > 0,
+            "number": texts.get(nf or "", ""),
+        }
 
-        for slot in pen_cfg.keys():
-            fields = self._penalty_fields(slot)
-            tf = fields["time_field"]
-            nf = fields["number_field"]
+        # Auto-clear när utvisningen gått från >0 till 0
+        # MEN endast om matchuret inte står på 0 (under pågående period).
+        prev = self._last_penalty_secs.get(slot)
+        if secs == 0 and prev is not None and prev > 0 and (clock_secs is None or clock_secs > 0):
+            # penalty har tickat ner till 0 under spel → släck
+            self.clear_penalty(slot)
+            pdata.update(active=False, time_raw="00:00", seconds=0)
+        self._last_penalty_secs[slot] = secs
+        return pdata
 
-            t_raw = texts.get(tf or "", "00:00") if tf else "00:00"
-            secs = _parse_time_to_seconds(t_raw)
-            active = secs is not None and secs > 0
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Läser XML från vMix och bygger state:
+          - clock_raw / clock_secs
+          - clock_running (från intern flagga)
+          - mål
+          - period
+          - penalties: per slot time_raw, seconds, active, number
+          - auto-clear penalties vid 00:00 (endast om matchuret > 0)
+        """
+        texts = self._read_texts()
+        state = self._clock_from_texts(texts)
+        state.update(
+            home_score=texts.get(self.sb_cfg["home_score_field"], ""),
+            away_score=texts.get(self.sb_cfg["away_score_field"], ""),
+            period=texts.get(self.sb_cfg["period_field"], ""),
+            penalties={
+                slot: self._penalty_from_texts(slot, texts, state["clock_secs"])
+                for slot in self.sb_cfg.get("penalties", {})
+            },
+        )
+        return state
 
-            penalties_state[slot] = {
-                "slot": slot,
-                "time_raw": t_raw,
-                "seconds": secs,
-                "active": active,
-                "number": texts.get(nf or "", ""),
-            }
+    def get_changes(self) -> Dict[str, Any]:
+        """
+        Fält-delta för GUI:t (en gång per poll). Jämför SCOREBOARD-inputens
+        text-tabell med förra anropets och returnerar bara nycklarna vars
+        fält ändrats, i get_state-form:
+          - clock_raw/clock_secs/clock_running om klockfältet eller
+            running-flaggan ändrats
+          - home_score / away_score / period om respektive fält ändrats
+          - penalties: bara slots vars tid- eller nummerfält ändrats;
+            auto-clear körs bara för dem
+        Första anropet ger allt. Tom dict = inget nytt.
+        """
+        texts = self._read_texts()
+        prev, self._view_texts = self._view_texts, texts
+        changed = None if prev is None else {
+            k for k in texts.keys() | prev.keys() if texts.get(k) != prev.get(k)
+        }
 
-        # Auto-clear penalties när de gått från >0 till 0
-        # MEN endast om matchuret inte står på 0 (under pågående period).
-        for slot, pdata in penalties_state.items():
-            secs = pdata.get("seconds")
-            prev = self._last_penalty_secs.get(slot)
-            if (
-                secs == 0
-                and prev is not None
-                and prev > 0
-                and (clock_secs is None or clock_secs > 0)
-            ):
-                # penalty har tickat ner till 0 under spel → släck
-                self.clear_penalty(slot)
-                pdata["active"] = False
-                pdata["time_raw"] = "00:00"
-                pdata["seconds"] = 0
-
-            self._last_penalty_secs[slot] = secs
+        def hit(*names) -> bool:
+            return changed is None or any(n in changed for n in names if n)
 
-        return {
-            "clock_raw": clock_raw,
-            "clock_secs": clock_secs,
-            "clock_running": running,
-            "home_score": home_score,
-            "away_score": away_score,
-            "period": period,
-            "penalties": penalties_state,
-        }
+        out: Dict[str, Any] = {}
+        if hit(self.sb_cfg["clock_field"]) or self._clock_running_flag != self._view_running:
+            out.update(self._clock_from_texts(texts))
+            self._view_running = out["clock_running"]
+
+        for key, cfg_key in (("home_score", "home_score_field"),
+                             ("away_score", "away_score_field"),
+                             ("period", "period_field")):
+            if hit(self.sb_cfg[cfg_key]):
+                out[key] = texts.get(self.sb_cfg[cfg_key], "")
+
+        penalties = {}
+        clock_secs = _parse_time_to_seconds(texts.get(self.sb_cfg["clock_field"], "00:00"))
+        for slot in self.sb_cfg.get("penalties", {}):
+            fields = self._penalty_fields(slot)
+            if hit(fields["time_field"], fields["number_field"]):
+                penalties[slot] = self._penalty_from_texts(slot, texts, clock_secs)
+        if penalties:
+            out["penalties"] = penalties
+        return out
+
+    def resend_clock(self) -> None:
+        """Nästa get_changes tar med klockan även om fältet inte ändrats"""
+        self._view_running = None
 
     # ------------------------------------------------------------
     # Matchur – START/STOP + 00:00
@@ -259,58 +314,53 @@ class ScoreboardController:
     def toggle_clock(self) -> None:
         """
         START/STOP för matchur OCH alla penalties med tid > 0.
+        Allt går i EN burst från cachat state (senaste poll), ingen extra läsning.
         """
-        state = self.get_state()
-        sb_num = self._scoreboard_input_number()
-        clock_field = self.sb_cfg["clock_field"]
-        clock_secs = state.get("clock_secs")
+        if self._last_clock_secs is None:
+            self.get_state()
 
         if self._clock_running_flag:
             # PAUS – paus både matchur och alla aktiva utvisningar
-            self.client.call_function(
-                "PauseCountdown",
-                Input=sb_num,
-                SelectedName=clock_field,
-            )
-            for slot, pdata in state["penalties"].items():
-                if pdata.get("seconds") and pdata["seconds"] > 0:
-                    fields = self._penalty_fields(slot)
-                    tf = fields["time_field"]
-                    if tf:
-                        self.client.call_function(
-                            "PauseCountdown",
-                            Input=sb_num,
-                            SelectedName=tf,
-                        )
+            self._timer_burst("PauseCountdown")
             self._clock_running_flag = False
             return
 
         # START
-        if clock_secs is None or clock_secs <= 0:
+        if self._last_clock_secs is None or self._last_clock_secs <= 0:
             # ingen tid = GUI får hindra start
             self._clock_running_flag = False
             return
 
-        # starta matchur
-        self.client.call_function(
-            "StartCountdown",
-            Input=sb_num,
-            SelectedName=clock_field,
-        )
+        self._timer_burst("StartCountdown")
+        self._clock_running_flag = True
 
-        # starta alla penalties med tid > 0
-        for slot, pdata in state["penalties"].items():
-            if pdata.get("seconds") and pdata["seconds"] > 0:
-                fields = self._penalty_fields(slot)
-                tf = fields["time_field"]
-                if tf:
-                    self.client.call_function(
-                        "StartCountdown",
-                        Input=sb_num,
-                        SelectedName=tf,
-                    )
+    def _timer_burst(self, function: str, value: Optional[str] = None,
+                     clock: bool = True) -> None:
+        """
+        Skickar function till matchur + alla utvisningar med tid > 0
+        samtidigt (en tråd per fält) och sparar spridningen i timer_skew_ms.
+        """
+        sb_num = self._scoreboard_input_number()
+        fields = [self.sb_cfg["clock_field"]] if clock else []
+        for slot, secs in self._last_penalty_secs.items():
+            tf = self._penalty_fields(slot)["time_field"]
+            if tf and secs and secs > 0:
+                fields.append(tf)
+
+        cmds = []
+        for f in fields:
+            params = {"Input": sb_num, "SelectedName": f}
+            if value is not None:
+                params["Value"] = value
+            cmds.append((function, params))
+        if not cmds:
+            return
 
-        self._clock_running_flag = True
+        self.last_batch = self.client.batch(cmds, max_workers=len(cmds))
+        self.timer_skew_ms.append(self.last_batch["skew_ms"])
+        del self.timer_skew_ms[:-200]
+        if self.last_batch["errors"]:
+            raise self.last_batch["errors"][0][1]
 
     def stop_clock_and_penalties_at_zero(self) -> None:
         """
@@ -351,41 +401,17 @@ class ScoreboardController:
     # ------------------------------------------------------------
     def adjust_times(self, delta_sec: int) -> None:
         """
-        Justerar matchur + alla penalties med AdjustCountdown (±delta_sec).
+        Justerar matchur + alla penalties med AdjustCountdown (±delta_sec),
+        i en burst från cachat state.
         """
         if delta_sec == 0:
             return
-
-        sb_num = self._scoreboard_input_number()
-        val = str(delta_sec)
-        clock_field = self.sb_cfg["clock_field"]
+        if self._last_clock_secs is None:
+            self.get_state()
 
         # matchur – bara om giltig tid
-        cur = self.client.get_text_from_title(sb_num, clock_field)
-        secs = _parse_time_to_seconds(cur)
-        if secs is not None and secs > 0:
-            self.client.call_function(
-                "AdjustCountdown",
-                Input=sb_num,
-                SelectedName=clock_field,
-                Value=val,
-            )
-
-        # penalties
-        for slot in self.sb_cfg.get("penalties", {}).keys():
-            fields = self._penalty_fields(slot)
-            tf = fields["time_field"]
-            if not tf:
-                continue
-            cur = self.client.get_text_from_title(sb_num, tf)
-            secs = _parse_time_to_seconds(cur)
-            if secs is not None and secs > 0:
-                self.client.call_function(
-                    "AdjustCountdown",
-                    Input=sb_num,
-                    SelectedName=tf,
-                    Value=val,
-                )
+        clock_ok = self._last_clock_secs is not None and self._last_clock_secs > 0
+        self._timer_burst("AdjustCountdown", str(delta_sec), clock=clock_ok)
 
     # ------------------------------------------------------------
     # Period & matchtid
@@ -449,25 +475,40 @@ class ScoreboardController:
 
         inp_num = self.client.find_input_number(goal_input) or goal_input
 
-        def worker():
-            import time as _t
+        # Ett väntande Out per grafik: nytt mål medan grafiken är uppe
+        # förlänger den i stället för att tända den igen.
+        pending = self._goal_off_timer
+        if pending is not None and pending.reschedule(duration_ms / 1000.0):
+            return
 
-            try:
-                self.client.call_function(
-                    f"OverlayInput{goal_channel}In",
-                    Input=inp_num,
-                )
-                _t.sleep(duration_ms / 1000.0)
-                self.client.call_function(
-                    f"OverlayInput{goal_channel}Out",
-                    Input=inp_num,
-                )
-            except Exception:
-                pass
+        try:
+            self.client.call_function(
+                f"OverlayInput{goal_channel}In",
+                Input=inp_num,
+            )
+        except Exception:
+            return
 
-        import threading as _th
+        self._goal_off_timer = self.client.after_delay(
+            duration_ms, self._goal_graphic_off, goal_channel, inp_num, name="goal off"
+        )
 
-        _th.Thread(target=worker, daemon=True).start()
+    def _goal_graphic_off(self, channel: int, inp_num) -> None:
+        # körs i klientens pool för fördröjda anrop, aldrig i GUI-tråden
+        try:
+            self.client.call_function(f"OverlayInput{channel}Out", Input=inp_num)
+        except Exception:
+            pass
+
+    def cancel_goal_graphic(self) -> None:
+        """
+        Släcker mål-grafiken direkt (t.ex. ångrat mål). Out skickas av
+        timer-tråden, GUI-tråden väntar inte på vMix.
+        """
+        pending = self._goal_off_timer
+        self._goal_off_timer = None
+        if pending is not None:
+            pending.reschedule(0.0)
 
     # ------------------------------------------------------------
     # Utvisningar
@@ -495,45 +536,31 @@ class ScoreboardController:
 
         sb_num = self._scoreboard_input_number()
 
-        # nollställ intern timer → sätt ny countdown
-        self.client.call_function(
-            "StopCountdown",
-            Input=sb_num,
-            SelectedName=tf,
-        )
-        self.client.call_function(
-            "SetCountdown",
-            Input=sb_num,
-            SelectedName=tf,
-            Value=t_str,
-        )
-        self.client.set_text(sb_num, tf, t_str)
-
-        # nummer
-        self.client.set_text(sb_num, nf, number or "")
-
-        # synlighet: tid/nummer + bakgrunder
-        self.client.call_function("SetTextVisibleOn", Input=sb_num, SelectedName=tf)
-        self.client.call_function("SetTextVisibleOn", Input=sb_num, SelectedName=nf)
+        # tidfältets anrop körs i ordning, nummer/bakgrunder parallellt
+        cmds = [
+            # nollställ intern timer → sätt ny countdown
+            ("StopCountdown", {"Input": sb_num, "SelectedName": tf}),
+            ("SetCountdown", {"Input": sb_num, "SelectedName": tf, "Value": t_str}),
+            ("SetText", {"Input": sb_num, "SelectedName": tf, "Value": t_str}),
+            # nummer
+            ("SetText", {"Input": sb_num, "SelectedName": nf, "Value": number or ""}),
+            # synlighet: tid/nummer + bakgrunder
+            ("SetTextVisibleOn", {"Input": sb_num, "SelectedName": tf}),
+            ("SetTextVisibleOn", {"Input": sb_num, "SelectedName": nf}),
+        ]
 
         tbg = fields["time_bg_field"]
         nbg = fields["number_bg_field"]
         if tbg:
-            self.client.call_function(
-                "SetImageVisibleOn", Input=sb_num, SelectedName=tbg
-            )
+            cmds.append(("SetImageVisibleOn", {"Input": sb_num, "SelectedName": tbg}))
         if nbg:
-            self.client.call_function(
-                "SetImageVisibleOn", Input=sb_num, SelectedName=nbg
-            )
+            cmds.append(("SetImageVisibleOn", {"Input": sb_num, "SelectedName": nbg}))
 
         # starta bara om matchuret går
         if self._clock_running_flag and secs > 0:
-            self.client.call_function(
-                "StartCountdown",
-                Input=sb_num,
-                SelectedName=tf,
-            )
+            cmds.append(("StartCountdown", {"Input": sb_num, "SelectedName": tf}))
+
+        self._run_batch(cmds)
 
         self._last_penalty_secs[slot] = secs
 
@@ -554,35 +581,25 @@ class ScoreboardController:
 
         sb_num = self._scoreboard_input_number()
 
-        # stoppa + nollställ
-        self.client.call_function(
-            "StopCountdown",
-            Input=sb_num,
-            SelectedName=tf,
-        )
-        self.client.call_function(
-            "SetCountdown",
-            Input=sb_num,
-            SelectedName=tf,
-            Value="00:00",
-        )
-        self.client.set_text(sb_num, tf, "00:00")
-        self.client.set_text(sb_num, nf, "")
-
-        # synlighet AV
-        self.client.call_function("SetTextVisibleOff", Input=sb_num, SelectedName=tf)
-        self.client.call_function("SetTextVisibleOff", Input=sb_num, SelectedName=nf)
+        cmds = [
+            # stoppa + nollställ
+            ("StopCountdown", {"Input": sb_num, "SelectedName": tf}),
+            ("SetCountdown", {"Input": sb_num, "SelectedName": tf, "Value": "00:00"}),
+            ("SetText", {"Input": sb_num, "SelectedName": tf, "Value": "00:00"}),
+            ("SetText", {"Input": sb_num, "SelectedName": nf, "Value": ""}),
+            # synlighet AV
+            ("SetTextVisibleOff", {"Input": sb_num, "SelectedName": tf}),
+            ("SetTextVisibleOff", {"Input": sb_num, "SelectedName": nf}),
+        ]
 
         tbg = fields["time_bg_field"]
         nbg = fields["number_bg_field"]
         if tbg:
-            self.client.call_function(
-                "SetImageVisibleOff", Input=sb_num, SelectedName=tbg
-            )
+            cmds.append(("SetImageVisibleOff", {"Input": sb_num, "SelectedName": tbg}))
         if nbg:
-            self.client.call_function(
-                "SetImageVisibleOff", Input=sb_num, SelectedName=nbg
-            )
+            cmds.append(("SetImageVisibleOff", {"Input": sb_num, "SelectedName": nbg}))
+
+        self._run_batch(cmds)
 
         self._last_penalty_secs[slot] = 0
 
@@ -591,29 +608,11 @@ class ScoreboardController:
     # ------------------------------------------------------------
     def pause_clock_and_penalties(self) -> None:
         """
-        Pausar matchur + alla penalties med tid > 0 (vid MÅL).
+        Pausar matchur + alla penalties med tid > 0 (vid MÅL), i en burst.
         """
-        state = self.get_state()
-        sb_num = self._scoreboard_input_number()
-        clock_field = self.sb_cfg["clock_field"]
-
-        self.client.call_function(
-            "PauseCountdown",
-            Input=sb_num,
-            SelectedName=clock_field,
-        )
-
-        for slot, pdata in state["penalties"].items():
-            if pdata.get("seconds") and pdata["seconds"] > 0:
-                fields = self._penalty_fields(slot)
-                tf = fields["time_field"]
-                if tf:
-                    self.client.call_function(
-                        "PauseCountdown",
-                        Input=sb_num,
-                        SelectedName=tf,
-                    )
-
+        if self._last_clock_secs is None:
+            self.get_state()
+        self._timer_burst("PauseCountdown")
         self._clock_running_flag = False
 
     # ------------------------------------------------------------
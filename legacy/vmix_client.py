@@ -10,8 +10,13 @@ import urllib.parse
 import urllib.request
 import xml.etree.ElementTree as ET
 import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+from vmix_timers import Timer, TimerHeap
+
 
 class VMixClient:
     """
@@ -29,6 +34,18 @@ class VMixClient:
         self.password = password
         self.timeout = timeout
 
+        # Input-cache: namn/korttitel/key/nummer (lowercase) -> (nummer, key).
+        # Byggs om automatiskt när <preset> eller mängden input-keys ändras.
+        self._input_cache: dict[str, tuple[str, str]] = {}
+        self._input_sig = None
+
+        # Fördröjda anrop (after_delay): en timer-tråd, anropen körs i en
+        # liten pool så ett segt vMix-svar inte håller upp nästa timer.
+        self._delayed = ThreadPoolExecutor(max_workers=2, thread_name_prefix="vmix-delayed")
+        self.timers = TimerHeap(dispatch=self._delayed.submit)
+        # batch(): en pool för alla batchar, inte en ny per anrop
+        self._batch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="vmix-batch")
+
     # ---------------------------------------------------------
     # Hjälpfunktioner – HTTP
     # ---------------------------------------------------------
@@ -66,8 +83,50 @@ class VMixClient:
             root = ET.fromstring(text)
         except ET.ParseError as e:
             raise RuntimeError(f"Kunde inte tolka vMix XML: {e}") from e
+        self._update_input_cache(root)
         return root
 
+    def _update_input_cache(self, root: ET.Element) -> None:
+        inputs = root.findall("./inputs/input")
+        sig = (
+            (root.findtext("preset") or "").strip(),
+            # namnbyte/omordning behåller nyckelmängden men måste bygga om
+            tuple(
+                (inp.get("key") or "", inp.get("number") or "",
+                 inp.get("title") or "", inp.get("shortTitle") or "")
+                for inp in inputs
+            ),
+        )
+        if sig == self._input_sig:
+            return
+
+        cache: dict[str, tuple[str, str]] = {}
+        for inp in inputs:
+            entry = (inp.get("number") or "", (inp.get("key") or "").strip())
+            for nm in (
+                inp.get("number"),
+                inp.get("key"),
+                inp.get("title"),
+                inp.get("shortTitle"),
+            ):
+                nm = (nm or "").strip().lower()
+                if nm:
+                    cache.setdefault(nm, entry)
+
+        self._input_cache = cache
+        self._input_sig = sig
+
+    def _lookup_input(self, name_or_number: str | int) -> Optional[tuple[str, str]]:
+        """
+        (nummer, key) från cachen; hämtar XML bara om namnet är okänt.
+        """
+        s = str(name_or_number).strip().lower()
+        hit = self._input_cache.get(s)
+        if hit is None:
+            self.get_status_xml()
+            hit = self._input_cache.get(s)
+        return hit
+
     # ---------------------------------------------------------
     # Inputs och fields
     # ---------------------------------------------------------
@@ -83,12 +142,33 @@ class VMixClient:
         if s.isdigit():
             return s
 
-        root = self.get_status_xml()
-        inputs = root.findall("./inputs/input")
+        hit = self._lookup_input(s)
+        return hit[0] if hit else None
+
+    def find_input_key(self, name_or_number: str | int) -> Optional[str]:
+        """
+        Som find_input_number men returnerar inputens stabila key (GUID).
+        Faller tillbaka på numret om key saknas.
+        """
+        hit = self._lookup_input(name_or_number)
+        if hit is None:
+            return None
+        return hit[1] or hit[0]
+
+    @staticmethod
+    def _match_input(root: ET.Element, name_or_number: str | int) -> Optional[ET.Element]:
+        """
+        Letar upp <input> i en redan hämtad XML via nummer, titel, korttitel eller key.
+        """
+        s = str(name_or_number).strip()
         s_lower = s.lower()
 
-        for inp in inputs:
-            num = inp.get("number")
+        for inp in root.findall("./inputs/input"):
+            if s.isdigit():
+                if inp.get("number") == s:
+                    return inp
+                continue
+
             title = (inp.get("title") or "").strip()
             short_title = (inp.get("shortTitle") or "").strip()
             key = (inp.get("key") or "").strip()
@@ -98,18 +178,12 @@ class VMixClient:
                 or short_title.lower() == s_lower
                 or key.lower() == s_lower
             ):
-                return num
+                return inp
         return None
 
     def _find_input_node(self, name_or_number: str | int) -> Optional[ET.Element]:
-        num = self.find_input_number(name_or_number)
-        if num is None:
-            return None
-        root = self.get_status_xml()
-        for inp in root.findall("./inputs/input"):
-            if inp.get("number") == num:
-                return inp
-        return None
+        # EN nedladdning: slå upp input direkt i samma XML
+        return self._match_input(self.get_status_xml(), name_or_number)
 
     def get_text_from_title(self, input_name_or_number: str | int, field_name: str) -> str:
         """
@@ -130,7 +204,7 @@ class VMixClient:
         """
         Sätter text i Title (TitleText-fält) via Function=SetText.
         """
-        inp_num = self.find_input_number(input_name_or_number)
+        inp_num = self.find_input_key(input_name_or_number)
         if inp_num is None:
             raise ValueError(f"Kunde inte hitta input: {input_name_or_number}")
 
@@ -146,7 +220,7 @@ class VMixClient:
         Sätter vMix interna countdown-värde (starttid) i ett fält.
         Exempel: '20:00'.
         """
-        inp_num = self.find_input_number(input_name_or_number)
+        inp_num = self.find_input_key(input_name_or_number)
         if inp_num is None:
             raise ValueError(f"Kunde inte hitta input: {input_name_or_number}")
 
@@ -175,6 +249,98 @@ class VMixClient:
         url = self._build_url("/api/", q)
         _ = self._http_get(url)  # vi bryr oss inte om svaret här
 
+    # ---------------------------------------------------------
+    # Fördröjda anrop
+    # ---------------------------------------------------------
+    def after_delay(self, delay_ms: float, fn, *args, name: str = "") -> Timer:
+        """
+        Kör fn(*args) efter delay_ms. Timern kan avbrytas (cancel) eller
+        flyttas (reschedule).
+        """
+        return self.timers.call_later(float(delay_ms) / 1000.0, fn, *args, name=name)
+
+    # ---------------------------------------------------------
+    # BATCH – oberoende anrop parallellt
+    # ---------------------------------------------------------
+    def batch(self, commands: list, ordered_groups: list | None = None, max_workers: int = 4) -> dict:
+        """
+        Kör flera Functions samtidigt:
+          batch([("StopCountdown", {"Input": 1, "SelectedName": "HomeP1time.Text"}), ...])
+
+        Anrop på samma (Input, SelectedName) hamnar i samma kedja,
+        ordered_groups ([[0, 3], ...], index i commands) slår ihop kedjor.
+        En kedja körs i listordning, kedjorna parallellt (max max_workers,
+        högst klientens fyra batch-trådar).
+
+        Returnerar {"wall_ms", "serial_ms", "skew_ms", "errors": [(index, fel), ...]}.
+        skew_ms = tid mellan första och sista anropets start.
+        """
+        n = len(commands)
+        parent = list(range(n))
+
+        def root(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        # samma fält -> samma kedja
+        by_field: dict = {}
+        for i, (_, params) in enumerate(commands):
+            k = (str(params.get("Input")).strip().lower(), params.get("SelectedName"))
+            if k in by_field:
+                parent[root(i)] = root(by_field[k])
+            by_field[k] = i
+
+        for group in ordered_groups or []:
+            for a, b in zip(group, group[1:]):
+                parent[root(b)] = root(a)
+
+        chains: dict = {}
+        for i in range(n):
+            chains.setdefault(root(i), []).append(i)
+
+        lat = [0.0] * n
+        started: list = [None] * n
+        errors = []
+
+        def run_chain(idx: list) -> None:
+            for i in idx:
+                function, params = commands[i]
+                t = time.perf_counter()
+                started[i] = t
+                try:
+                    self.call_function(function, **params)
+                except Exception as e:
+                    errors.append((i, e))
+                    return  # resten av kedjan beror på detta anrop
+                finally:
+                    lat[i] = (time.perf_counter() - t) * 1000.0
+
+        # max_workers arbetare på den delade poolen hämtar kedjor tills de är slut
+        todo = iter(list(chains.values()))
+        take = threading.Lock()
+
+        def worker() -> None:
+            while True:
+                with take:
+                    idx = next(todo, None)
+                if idx is None:
+                    return
+                run_chain(idx)
+
+        t0 = time.perf_counter()
+        width = max(1, min(max_workers, len(chains) or 1))
+        for fut in [self._batch_pool.submit(worker) for _ in range(width)]:
+            fut.result()
+        starts = [t for t in started if t is not None]
+        return {
+            "wall_ms": (time.perf_counter() - t0) * 1000.0,
+            "serial_ms": sum(lat),
+            "skew_ms": (max(starts) - min(starts)) * 1000.0 if starts else 0.0,
+            "errors": errors,
+        }
+
     # ---------------------------------------------------------
     # Overlay-hjälpare (valfria)
     # ---------------------------------------------------------
@@ -182,7 +348,7 @@ class VMixClient:
         """
         Slår på en input som overlay på given kanal (1–4).
         """
-        inp_num = self.find_input_number(input_name_or_number)
+        inp_num = self.find_input_key(input_name_or_number)
         if inp_num is None:
             raise ValueError(f"Kunde inte hitta input: {input_name_or_number}")
         func = f"OverlayInput{int(channel)}In"
@@ -192,7 +358,7 @@ class VMixClient:
         """
         Slår av en input från overlay på given kanal (1–4).
         """
-        inp_num = self.find_input_number(input_name_or_number)
+        inp_num = self.find_input_key(input_name_or_number)
         if inp_num is None:
             raise ValueError(f"Kunde inte hitta input: {input_name_or_number}")
         func = f"OverlayInput{int(channel)}Out"
@@ -22,6 +22,8 @@
 #       - Mobile-permissions för framtida webb-GUI
 # ------------------------------------------------------------
 
+import queue
+import threading
 import time
 import tkinter as tk
 from tkinter import ttk, messagebox
@@ -31,6 +33,7 @@ from vmix_config import load_config, save_config
 from scoreboard_controller import ScoreboardController, _parse_time_to_seconds
 
 POLL_INTERVAL_MS = 1100
+IO_DRAIN_MS = 30
 DEFAULT_PERIOD_TIME = "20:00"
 DEFAULT_OT_TIME = "05:00"
 
@@ -61,6 +64,14 @@ class ScoreboardApp(tk.Tk):
         DEFAULT_PERIOD_TIME = sb_cfg.get("default_period_time", DEFAULT_PERIOD_TIME)
         DEFAULT_OT_TIME = sb_cfg.get("ot_time", DEFAULT_OT_TIME)
 
+        # vMix-anrop körs i en bakgrundstråd – GUI-tråden väntar aldrig på nätet.
+        # Svar/fel kommer tillbaka via _io_results som töms med after().
+        self._io_jobs: queue.Queue = queue.Queue()
+        self._io_results: queue.Queue = queue.Queue()
+        self._poll_busy = False
+        threading.Thread(target=self._io_worker, daemon=True).start()
+        self.after(IO_DRAIN_MS, self._io_drain)
+
         self._build_login()
         self.after(POLL_INTERVAL_MS, self._poll_loop)
 
@@ -68,6 +79,46 @@ class ScoreboardApp(tk.Tk):
     def _log(self, msg: str) -> None:
         print(f"[LOG] {msg}")
 
+    # --------------------------------------------------------
+    # Bakgrunds-IO
+    # --------------------------------------------------------
+    def _run_io(self, fn, on_done=None, on_error=None, err_msg: str | None = None) -> None:
+        """
+        Köar fn() till IO-tråden. on_done(resultat) / on_error(fel) körs
+        sedan i GUI-tråden. Utan on_error loggas felet (+ dialog om err_msg).
+        """
+        if on_error is None:
+            def on_error(e, _msg=err_msg):
+                if _msg:
+                    self._log(f"{_msg}: {e}")
+                    messagebox.showerror("Fel", f"{_msg}: {e}")
+                else:
+                    self._log(f"IO-fel: {e}")
+        self._io_jobs.put((fn, on_done, on_error))
+
+    def _io_worker(self) -> None:
+        while True:
+            fn, on_done, on_error = self._io_jobs.get()
+            try:
+                res = fn()
+            except Exception as e:
+                self._io_results.put((on_error, e))
+            else:
+                if on_done is not None:
+                    self._io_results.put((on_done, res))
+
+    def _io_drain(self) -> None:
+        while True:
+            try:
+                cb, arg = self._io_results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                cb(arg)
+            except Exception as e:
+                self._log(f"Fel i GUI-callback: {e}")
+        self.after(IO_DRAIN_MS, self._io_drain)
+
     # --------------------------------------------------------
     # LOGIN
     # --------------------------------------------------------
@@ -94,11 +145,12 @@ class ScoreboardApp(tk.Tk):
         self.port_entry.insert(0, str(self.cfg["vmix"].get("port", 8088)))
         self.port_entry.grid(row=0, column=3, padx=4)
 
-        ttk.Button(
+        self._connect_btn = ttk.Button(
             self.login_frame,
             text="Anslut",
             command=self._on_connect_clicked,
-        ).pack(pady=15)
+        )
+        self._connect_btn.pack(pady=15)
 
     def _on_connect_clicked(self) -> None:
         try:
@@ -108,27 +160,35 @@ class ScoreboardApp(tk.Tk):
             messagebox.showerror("Fel", "Ogiltig port.")
             return
 
-        try:
-            self.client = VMixClient(host, port)
-            self.client.get_status_xml()  # test-anrop
-            self.controller = ScoreboardController(self.client, self.cfg)
-        except Exception as e:
+        def connect():
+            client = VMixClient(host, port)
+            client.get_status_xml()  # test-anrop
+            return client, ScoreboardController(client, self.cfg)
+
+        def connected(res) -> None:
+            self.client, self.controller = res
+            self._connected = True
+            self.login_frame.destroy()
+            self._build_main_ui()
+
+            # Läs overlay-läge från vMix och synka knappen
+            self._run_io(
+                self.controller.is_scoreboard_overlay_active,
+                self._on_overlay_state,
+                lambda e: self._log(f"Kunde inte läsa overlay-state: {e}"),
+            )
+
+        def failed(e) -> None:
+            self._connect_btn.configure(state="normal")
             messagebox.showerror("Fel", f"Kunde inte ansluta till vMix: {e}")
-            return
 
-        self._connected = True
-        self.login_frame.destroy()
-        self._build_main_ui()
+        # knappen spärras tills test-anropet svarat
+        self._connect_btn.configure(state="disabled")
+        self._run_io(connect, connected, failed)
 
-        # Läs overlay-läge från vMix och synka knappen
-        try:
-            if self.controller.is_scoreboard_overlay_active():
-                self._scoreboard_visible = True
-            else:
-                self._scoreboard_visible = False
-            self._update_scoreboard_button()
-        except Exception as e:
-            self._log(f"Kunde inte läsa overlay-state: {e}")
+    def _on_overlay_state(self, active: bool) -> None:
+        self._scoreboard_visible = bool(active)
+        self._update_scoreboard_button()
 
     # --------------------------------------------------------
     # HUVUD-UI
@@ -314,62 +374,44 @@ class ScoreboardApp(tk.Tk):
     # POLL-LOOP
     # --------------------------------------------------------
     def _poll_loop(self) -> None:
-        if self._connected and self.controller:
-            try:
-                state = self.controller.get_state()
-                self._update_from_state(state)
-            except Exception as e:
+        # hoppa över om förra pollen fortfarande väntar på vMix
+        if self._connected and self.controller and not self._poll_busy:
+            self._poll_busy = True
+
+            def done(changes):
+                self._poll_busy = False
+                self._apply_changes(changes)
+
+            def failed(e):
+                self._poll_busy = False
                 self._log(f"Fel vid Poll: {e}")
 
+            self._run_io(self.controller.get_changes, done, failed)
+
         self.after(POLL_INTERVAL_MS, self._poll_loop)
 
     # --------------------------------------------------------
     # STATE → GUI
     # --------------------------------------------------------
-    def _update_from_state(self, state: dict) -> None:
-        clock_raw = state.get("clock_raw", "") or "--:--"
-        secs = state.get("clock_secs")
-        running = bool(state.get("clock_running", False))
-
-        # uppdatera START/STOP-knapp
-        self._update_clock_button(clock_raw, running)
-
-        # 00:00-hantering (periodslut)
-        if secs == 0:
-            if not self._zero_handled:
-                self._zero_handled = True
-
-                # Dölj scoreboard-overlay vid periodslut
-                try:
-                    self.controller.set_scoreboard_overlay(False)
-                    self._scoreboard_visible = False
-                    self._update_scoreboard_button()
-                except Exception as e:
-                    self._log(f"Fel vid dölja scoreboard vid 00:00: {e}")
-
-                # Stoppa matchur + pausa utvisningar
-                try:
-                    self.controller.stop_clock_and_penalties_at_zero()
-                except Exception as e:
-                    self._log(f"Fel vid stop_clock_and_penalties_at_zero: {e}")
-
-                # Fråga om ny period
-                self.after(200, self._ask_new_period)
-        else:
-            self._zero_handled = False
-
-        # Utvisningar
-        for slot, pdata in state.get("penalties", {}).items():
+    def _apply_changes(self, changes: dict) -> None:
+        """
+        Fält-delta från controller.get_changes(): bara nycklar vars
+        vMix-fält ändrats finns med, så bara de widgetarna rörs.
+        """
+        if "clock_raw" in changes:
+            self._apply_clock(changes)
+
+        # Utvisningar (bara ändrade slots)
+        for slot, pdata in changes.get("penalties", {}).items():
             btn = self._penalty_buttons.get(slot)
             if not btn:
                 continue
             t_raw = pdata.get("time_raw") or "00:00"
             active = bool(pdata.get("active"))
-            btn.configure(text=f"{slot}\n{t_raw}")
-            btn.configure(bg="yellow" if active else "lightgrey")
+            btn.configure(text=f"{slot}\n{t_raw}", bg="yellow" if active else "lightgrey")
 
         # Period (från grafik)
-        per = state.get("period")
+        per = changes.get("period")
         if per:
             try:
                 idx = 4 if str(per).upper() == "OT" else int(per)
@@ -380,13 +422,44 @@ class ScoreboardApp(tk.Tk):
                 pass
 
         # Målställning
-        try:
-            hs = str(state.get("home_score") or "0")
-            aw = str(state.get("away_score") or "0")
+        if "home_score" in changes:
+            hs = str(changes["home_score"] or "0")
             self._goal_home_btn.config(text=f"MÅL\n{hs}\nHEMMA")
+        if "away_score" in changes:
+            aw = str(changes["away_score"] or "0")
             self._goal_away_btn.config(text=f"MÅL\n{aw}\nBORTA")
-        except Exception:
-            pass
+
+    def _apply_clock(self, changes: dict) -> None:
+        clock_raw = changes.get("clock_raw", "") or "--:--"
+        secs = changes.get("clock_secs")
+        running = bool(changes.get("clock_running", False))
+
+        # uppdatera START/STOP-knapp
+        self._update_clock_button(clock_raw, running)
+
+        # 00:00-hantering (periodslut), en gång per nedräkning
+        if secs == 0:
+            if not self._zero_handled:
+                self._zero_handled = True
+
+                # Dölj scoreboard-overlay vid periodslut
+                self._scoreboard_visible = False
+                self._update_scoreboard_button()
+                self._run_io(
+                    lambda: self.controller.set_scoreboard_overlay(False),
+                    on_error=lambda e: self._log(f"Fel vid dölja scoreboard vid 00:00: {e}"),
+                )
+
+                # Stoppa matchur + pausa utvisningar
+                self._run_io(
+                    self.controller.stop_clock_and_penalties_at_zero,
+                    on_error=lambda e: self._log(f"Fel vid stop_clock_and_penalties_at_zero: {e}"),
+                )
+
+                # Fråga om ny period
+                self.after(200, self._ask_new_period)
+        else:
+            self._zero_handled = False
 
     # --------------------------------------------------------
     # Klock-knapp
@@ -407,45 +480,69 @@ class ScoreboardApp(tk.Tk):
         if not self._require_controller():
             return
 
-        # Kolla aktuell tid direkt från title-fältet
-        try:
-            sb_input = self.controller.sb_input
-            clock_field = self.cfg["scoreboard"]["clock_field"]
-            cur_raw = self.controller.client.get_text_from_title(
-                self.controller.client.find_input_number(sb_input) or sb_input,
-                clock_field,
-            )
-        except Exception:
-            cur_raw = "00:00"
+        was_running = self._clock_running_ui
+        show_sb = not was_running and not self._scoreboard_visible
+        old_text = self._clock_btn.cget("text")
 
-        secs = _parse_time_to_seconds(cur_raw)
+        # optimistiskt: visa nya läget direkt, knappen låst tills vMix svarat
+        self._clock_btn.config(
+            text="START\n…" if was_running else "STOPP\n…",
+            state="disabled",
+        )
 
-        # Försök starta med 00:00 -> blockera, tvinga användaren sätta tid
-        if not self._clock_running_ui and (secs is None or secs == 0):
-            messagebox.showwarning(
-                "Ingen tid",
-                "Matchuret står på 00:00.\nSätt matchtid i Inställningar eller via perioddialogen innan du startar.",
-            )
-            return
+        def work():
+            # Kolla aktuell tid direkt från title-fältet
+            try:
+                sb_input = self.controller.sb_input
+                clock_field = self.cfg["scoreboard"]["clock_field"]
+                cur_raw = self.controller.client.get_text_from_title(
+                    self.controller.client.find_input_number(sb_input) or sb_input,
+                    clock_field,
+                )
+            except Exception:
+                cur_raw = "00:00"
 
-        was_running = self._clock_running_ui
+            secs = _parse_time_to_seconds(cur_raw)
+
+            # Försök starta med 00:00 -> blockera, tvinga användaren sätta tid
+            if not was_running and (secs is None or secs == 0):
+                return "no_time"
 
-        try:
             self.controller.toggle_clock()
-        except Exception as e:
+
+            # Om vi gick från stopp → start: tänd scoreboard automatiskt
+            if show_sb:
+                try:
+                    self.controller.set_scoreboard_overlay(True)
+                except Exception as e:
+                    return e
+            return "ok"
+
+        def done(res):
+            self._clock_btn.config(state="normal")
+            # optimistisk text: nästa poll ska skriva över den
+            self._run_io(self.controller.resend_clock)
+            if res == "no_time":
+                self._clock_btn.config(text=old_text)
+                messagebox.showwarning(
+                    "Ingen tid",
+                    "Matchuret står på 00:00.\nSätt matchtid i Inställningar eller via perioddialogen innan du startar.",
+                )
+                return
+            self._clock_running_ui = not was_running
+            self._update_penalty_buttons_state()
+            if isinstance(res, Exception):
+                self._log(f"Fel vid auto-tända scoreboard vid start: {res}")
+            elif show_sb:
+                self._scoreboard_visible = True
+                self._update_scoreboard_button()
+
+        def failed(e):
+            self._clock_btn.config(state="normal", text=old_text)
             messagebox.showerror("Fel", f"Kunde inte toggla klocka: {e}")
             self._log(f"ToggleClock-fel: {e}")
-            return
 
-        # Om vi gick från stopp → start: tänd scoreboard automatiskt
-        if not was_running:
-            try:
-                if not self._scoreboard_visible:
-                    self.controller.set_scoreboard_overlay(True)
-                    self._scoreboard_visible = True
-                    self._update_scoreboard_button()
-            except Exception as e:
-                self._log(f"Fel vid auto-tända scoreboard vid start: {e}")
+        self._run_io(work, done, failed)
 
     # --------------------------------------------------------
     # Justera mål utan MÅÅL-grafik
@@ -453,21 +550,20 @@ class ScoreboardApp(tk.Tk):
     def _on_adjust_score(self, home: bool, delta: int) -> None:
         if not self._require_controller():
             return
-        try:
-            # Använd controllerns interna score-funktion utan grafik
-            field = (
-                self.controller.sb_cfg["home_score_field"]
-                if home
-                else self.controller.sb_cfg["away_score_field"]
-            )
-            # _increment_score finns i ScoreboardController
-            self.controller._increment_score(field, delta)
-            self._log(
+        # Använd controllerns interna score-funktion utan grafik
+        field = (
+            self.controller.sb_cfg["home_score_field"]
+            if home
+            else self.controller.sb_cfg["away_score_field"]
+        )
+        # _increment_score finns i ScoreboardController
+        self._run_io(
+            lambda: self.controller._increment_score(field, delta),
+            lambda _: self._log(
                 f"Justering av {'HEMMA' if home else 'BORTA'}-mål med {delta:+d} (utan grafik)."
-            )
-        except Exception as e:
-            self._log(f"Kunde inte justera mål: {e}")
-            messagebox.showerror("Fel", f"Kunde inte justera mål: {e}")
+            ),
+            err_msg="Kunde inte justera mål",
+        )
 
     # --------------------------------------------------------
     # Period
@@ -479,12 +575,11 @@ class ScoreboardApp(tk.Tk):
             return
 
         val = "OT" if idx == 4 else str(idx)
-        try:
-            self.controller.set_period(val)
-            self._log(f"Period satt till {val}.")
-        except Exception as e:
-            self._log(f"Kunde inte sätta period: {e}")
-            messagebox.showerror("Fel", f"Kunde inte sätta period: {e}")
+        self._run_io(
+            lambda: self.controller.set_period(val),
+            lambda _: self._log(f"Period satt till {val}."),
+            err_msg="Kunde inte sätta period",
+        )
 
     def _update_period_buttons(self) -> None:
         for idx, btn in self._period_buttons.items():
@@ -500,17 +595,22 @@ class ScoreboardApp(tk.Tk):
         if not self._require_controller():
             return
 
-        self._scoreboard_visible = not self._scoreboard_visible
-        try:
-            self.controller.set_scoreboard_overlay(self._scoreboard_visible)
-            self._log(
-                "Scoreboard overlay PÅ" if self._scoreboard_visible else "Scoreboard overlay AV"
-            )
-        except Exception as e:
+        # optimistiskt: knappen visar nya läget direkt, backas vid fel
+        visible = not self._scoreboard_visible
+        self._scoreboard_visible = visible
+        self._update_scoreboard_button()
+
+        def failed(e):
+            self._scoreboard_visible = not visible
+            self._update_scoreboard_button()
             self._log(f"Kunde inte toggla scoreboard: {e}")
             messagebox.showerror("Fel", f"Kunde inte toggla scoreboard: {e}")
 
-        self._update_scoreboard_button()
+        self._run_io(
+            lambda: self.controller.set_scoreboard_overlay(visible),
+            lambda _: self._log("Scoreboard overlay PÅ" if visible else "Scoreboard overlay AV"),
+            failed,
+        )
 
     def _update_scoreboard_button(self) -> None:
         if self._scoreboard_visible:
@@ -524,12 +624,11 @@ class ScoreboardApp(tk.Tk):
     def _on_adjust(self, delta: int) -> None:
         if not self._require_controller():
             return
-        try:
-            self.controller.adjust_times(delta)
-            self._log(f"Justering {delta:+d} sek på klocka och utvisningar.")
-        except Exception as e:
-            self._log(f"Kunde inte justera tid: {e}")
-            messagebox.showerror("Fel", f"Kunde inte justera tid: {e}")
+        self._run_io(
+            lambda: self.controller.adjust_times(delta),
+            lambda _: self._log(f"Justering {delta:+d} sek på klocka och utvisningar."),
+            err_msg="Kunde inte justera tid",
+        )
 
     # --------------------------------------------------------
     # MÅL
@@ -537,7 +636,7 @@ class ScoreboardApp(tk.Tk):
     def _on_goal(self, home: bool) -> None:
         if not self._require_controller():
             return
-        try:
+        def work():
             self.controller.pause_clock_and_penalties()
             if home:
                 self.controller.home_goal()
@@ -546,10 +645,12 @@ class ScoreboardApp(tk.Tk):
             # Här används fortfarande trigger_goal_graphic (MÅÅL),
             # efter-mål-grafik kopplas in via graphics_controller.
             self.controller.trigger_goal_graphic()
-            self._log("MÅL HEMMA" if home else "MÅL BORTA")
-        except Exception as e:
-            self._log(f"Fel vid MÅL: {e}")
-            messagebox.showerror("Fel", f"Fel vid MÅL: {e}")
+
+        self._run_io(
+            work,
+            lambda _: self._log("MÅL HEMMA" if home else "MÅL BORTA"),
+            err_msg="Fel vid MÅL",
+        )
 
     # --------------------------------------------------------
     # EMPTY GOAL
@@ -557,24 +658,22 @@ class ScoreboardApp(tk.Tk):
     def _on_empty_home_toggle(self) -> None:
         if not self._require_controller():
             return
-        self._empty_home_active = not self._empty_home_active
-        try:
-            self.controller.set_empty_net_home(self._empty_home_active)
-        except Exception as e:
-            self._log(f"Fel vid Empty goal hemma: {e}")
-            messagebox.showerror("Fel", f"Empty goal hemma misslyckades: {e}")
+        self._empty_home_active = active = not self._empty_home_active
         self._update_empty_buttons()
+        self._run_io(
+            lambda: self.controller.set_empty_net_home(active),
+            err_msg="Empty goal hemma misslyckades",
+        )
 
     def _on_empty_away_toggle(self) -> None:
         if not self._require_controller():
             return
-        self._empty_away_active = not self._empty_away_active
-        try:
-            self.controller.set_empty_net_away(self._empty_away_active)
-        except Exception as e:
-            self._log(f"Fel vid Empty goal borta: {e}")
-            messagebox.showerror("Fel", f"Empty goal borta misslyckades: {e}")
+        self._empty_away_active = active = not self._empty_away_active
         self._update_empty_buttons()
+        self._run_io(
+            lambda: self.controller.set_empty_net_away(active),
+            err_msg="Empty goal borta misslyckades",
+        )
 
     def _update_empty_buttons(self) -> None:
         if getattr(self, "_empty_home_btn", None):
@@ -628,22 +727,20 @@ class ScoreboardApp(tk.Tk):
                     "Fel", "Ogiltig tid – skriv t.ex. 2:00 eller 02:00."
                 )
                 return
-            try:
-                # name lämnas tomt (hanteras inte i SCOREBOARD UPPE)
-                self.controller.set_penalty(slot, num, "", tval)
-                self._log(f"Utvisning {slot}: {num} {tval}")
-            except Exception as e:
-                self._log(f"Kunde inte sätta utvisning: {e}")
-                messagebox.showerror("Fel", f"Kunde inte sätta utvisning: {e}")
+            # name lämnas tomt (hanteras inte i SCOREBOARD UPPE)
+            self._run_io(
+                lambda: self.controller.set_penalty(slot, num, "", tval),
+                lambda _: self._log(f"Utvisning {slot}: {num} {tval}"),
+                err_msg="Kunde inte sätta utvisning",
+            )
             win.destroy()
 
         def on_clear() -> None:
-            try:
-                self.controller.clear_penalty(slot)
-                self._log(f"Utvisning {slot} rensad.")
-            except Exception as e:
-                self._log(f"Kunde inte rensa utvisning: {e}")
-                messagebox.showerror("Fel", f"Kunde inte rensa utvisning: {e}")
+            self._run_io(
+                lambda: self.controller.clear_penalty(slot),
+                lambda _: self._log(f"Utvisning {slot} rensad."),
+                err_msg="Kunde inte rensa utvisning",
+            )
             win.destroy()
 
         btn_row = tk.Frame(win)
@@ -656,25 +753,47 @@ class ScoreboardApp(tk.Tk):
     # --------------------------------------------------------
     # Inställningar (BAS / AVANCERAT)
     # --------------------------------------------------------
+    def _read_settings_lists(self, sb_input_name: str) -> tuple:
+        """
+        IO-tråden: (input-titlar, text-fält, image-fält) för inställnings-
+        dialogens dropdowns. Fälten är SCOREBOARD-inputens.
+        """
+        client = self.controller.client
+        root = client.get_status_xml()
+
+        input_names = set()
+        for inp in root.findall("./inputs/input"):
+            title = inp.get("title") or inp.get("shortTitle") or inp.get("number")
+            if title:
+                input_names.add(title)
+
+        sb_inp_num = client.find_input_number(sb_input_name) or sb_input_name
+        sb_node = None
+        for inp in root.findall("./inputs/input"):
+            if inp.get("number") == str(sb_inp_num) or inp.get("title") == sb_input_name:
+                sb_node = inp
+                break
+
+        text_fields = set()
+        image_fields = set()
+        if sb_node is not None:
+            text_fields = {t.get("name") for t in sb_node.findall("text") if t.get("name")}
+            image_fields = {im.get("name") for im in sb_node.findall("image") if im.get("name")}
+
+        return sorted(input_names), sorted(text_fields), sorted(image_fields)
+
     def _open_settings(self) -> None:
         win = tk.Toplevel(self)
         win.title("Inställningar – Version 15.1")
         win.geometry("650x540")
         win.grab_set()
 
-        # Hämta lista med alla input-titlar från vMix (för dropdowns)
+        # Input-titlar (dropdowns) och SCOREBOARD-fält läses i IO-tråden,
+        # se _read_settings_lists; listorna fylls i när svaret kommer.
         input_names: list[str] = []
-        try:
-            if self.controller:
-                root = self.controller.client.get_status_xml()
-                for inp in root.findall("./inputs/input"):
-                    title = inp.get("title") or inp.get("shortTitle") or inp.get("number")
-                    if title:
-                        input_names.append(title)
-            input_names = sorted(set(input_names))
-        except Exception as e:
-            self._log(f"Kunde inte läsa input-lista från vMix: {e}")
-            input_names = []
+        input_boxes: list[ttk.Combobox] = []
+        text_boxes: list[ttk.Combobox] = []
+        image_boxes: list[ttk.Combobox] = []
 
         overlay_channels = [str(i) for i in range(1, 9)]
 
@@ -708,13 +827,15 @@ class ScoreboardApp(tk.Tk):
 
         tk.Label(goal_frame, text="Input-namn:").grid(row=0, column=0, padx=5, sticky="e")
         goal_var = tk.StringVar(value=sb_cfg.get("goal_graphic_input", ""))
-        ttk.Combobox(
+        box = ttk.Combobox(
             goal_frame,
             textvariable=goal_var,
             values=input_names,
             state="readonly",
             width=27,
-        ).grid(row=0, column=1, padx=5, sticky="w")
+        )
+        box.grid(row=0, column=1, padx=5, sticky="w")
+        input_boxes.append(box)
 
         tk.Label(goal_frame, text="Overlay-kanal:").grid(row=1, column=0, padx=5, sticky="e")
         goal_ch_var = tk.StringVar(value=str(sb_cfg.get("goal_overlay_channel", 2)))
@@ -749,12 +870,12 @@ class ScoreboardApp(tk.Tk):
         # Snabbknappar periodtid
         def set_period_time(val: str) -> None:
             period_time_var.set(val)
-            try:
-                if self._require_controller():
-                    self.controller.set_match_time(val)
-                    self._log(f"Matchtid satt via snabbknapp: {val}")
-            except Exception as e:
-                self._log(f"Fel vid set_match_time i settings: {e}")
+            if self._require_controller():
+                self._run_io(
+                    lambda: self.controller.set_match_time(val),
+                    lambda _: self._log(f"Matchtid satt via snabbknapp: {val}"),
+                    lambda e: self._log(f"Fel vid set_match_time i settings: {e}"),
+                )
 
         btns = tk.Frame(time_frame)
         btns.grid(row=0, column=2, rowspan=2, padx=8)
@@ -775,13 +896,15 @@ class ScoreboardApp(tk.Tk):
 
         tk.Label(adv_inner, text="Input-namn:").grid(row=1, column=0, padx=5, sticky="e")
         after_goal_var = tk.StringVar(value=sb_cfg.get("after_goal_graphic_input", ""))
-        ttk.Combobox(
+        box = ttk.Combobox(
             adv_inner,
             textvariable=after_goal_var,
             values=input_names,
             state="readonly",
             width=27,
-        ).grid(row=1, column=1, padx=5, sticky="w")
+        )
+        box.grid(row=1, column=1, padx=5, sticky="w")
+        input_boxes.append(box)
 
         tk.Label(adv_inner, text="Overlay-kanal:").grid(row=1, column=2, padx=5, sticky="e")
         after_goal_ch_var = tk.StringVar(value=str(sb_cfg.get("after_goal_overlay_channel", 2)))
@@ -823,40 +946,11 @@ class ScoreboardApp(tk.Tk):
         tk.Label(pen_frame, text="BG tid (Image)").grid(row=0, column=3, padx=3, pady=2)
         tk.Label(pen_frame, text="BG nr (Image)").grid(row=0, column=4, padx=3, pady=2)
 
-        # Försök läsa alla text/image-fält från SCOREBOARD-inputen
-        text_fields = []
-        image_fields = []
+        # text/image-fälten från SCOREBOARD-inputen fylls i av _read_settings_lists
+        text_fields: list[str] = []
+        image_fields: list[str] = []
         slot_vars: dict[str, dict[str, tk.StringVar]] = {}
 
-        try:
-            if self.controller:
-                root = self.controller.client.get_status_xml()
-                sb_input_name = sb_var.get().strip() or sb_cfg.get("input", "")
-                sb_inp_num = self.controller.client.find_input_number(sb_input_name) or sb_input_name
-
-                sb_node = None
-                for inp in root.findall("./inputs/input"):
-                    if inp.get("number") == str(sb_inp_num) or inp.get("title") == sb_input_name:
-                        sb_node = inp
-                        break
-
-                if sb_node is not None:
-                    for t in sb_node.findall("text"):
-                        name = t.get("name")
-                        if name:
-                            text_fields.append(name)
-                    for im in sb_node.findall("image"):
-                        name = im.get("name")
-                        if name:
-                            image_fields.append(name)
-
-            text_fields = sorted(set(text_fields))
-            image_fields = sorted(set(image_fields))
-        except Exception as e:
-            self._log(f"Kunde inte läsa fält från SCOREBOARD-input: {e}")
-            text_fields = []
-            image_fields = []
-
         penalties_cfg = sb_cfg.get("penalties", {})
         slots = ["H1", "H2", "A1", "A2"]
 
@@ -897,37 +991,45 @@ class ScoreboardApp(tk.Tk):
                 pass
 
             # Comboboxar
-            ttk.Combobox(
+            box = ttk.Combobox(
                 pen_frame,
                 textvariable=slot_vars[slot]["time"],
                 values=text_fields,
                 state="readonly",
                 width=20,
-            ).grid(row=r, column=1, padx=3, pady=2)
+            )
+            box.grid(row=r, column=1, padx=3, pady=2)
+            text_boxes.append(box)
 
-            ttk.Combobox(
+            box = ttk.Combobox(
                 pen_frame,
                 textvariable=slot_vars[slot]["nr"],
                 values=text_fields,
                 state="readonly",
                 width=20,
-            ).grid(row=r, column=2, padx=3, pady=2)
+            )
+            box.grid(row=r, column=2, padx=3, pady=2)
+            text_boxes.append(box)
 
-            ttk.Combobox(
+            box = ttk.Combobox(
                 pen_frame,
                 textvariable=slot_vars[slot]["bg_time"],
                 values=image_fields,
                 state="readonly",
                 width=20,
-            ).grid(row=r, column=3, padx=3, pady=2)
+            )
+            box.grid(row=r, column=3, padx=3, pady=2)
+            image_boxes.append(box)
 
-            ttk.Combobox(
+            box = ttk.Combobox(
                 pen_frame,
                 textvariable=slot_vars[slot]["bg_nr"],
                 values=image_fields,
                 state="readonly",
                 width=20,
-            ).grid(row=r, column=4, padx=3, pady=2)
+            )
+            box.grid(row=r, column=4, padx=3, pady=2)
+            image_boxes.append(box)
 
         # Mobile permissions (för framtida webb-UI)
         tk.Label(adv_inner, text="Mobil-/webb-behörigheter",
@@ -957,6 +1059,26 @@ class ScoreboardApp(tk.Tk):
                 row=i // 2, column=i % 2, sticky="w", padx=5, pady=2
             )
 
+        # Dropdown-listorna från vMix: läses i IO-tråden, fylls i här
+        def fill_lists(res) -> None:
+            if not win.winfo_exists():
+                return
+            names, texts, images = res
+            for b in input_boxes:
+                b.configure(values=names)
+            for b in text_boxes:
+                b.configure(values=texts)
+            for b in image_boxes:
+                b.configure(values=images)
+
+        if self.controller:
+            sb_input_name = sb_var.get().strip() or sb_cfg.get("input", "")
+            self._run_io(
+                lambda: self._read_settings_lists(sb_input_name),
+                fill_lists,
+                lambda e: self._log(f"Kunde inte läsa input-lista/fält från vMix: {e}"),
+            )
+
         # Spara-knapp
         def on_save() -> None:
             # Validera tider
@@ -1049,20 +1171,20 @@ class ScoreboardApp(tk.Tk):
             self._update_period_buttons()
 
             if self._require_controller():
-                try:
-                    # skriv period till scoreboard
-                    val = "OT" if self._current_period == 4 else str(self._current_period)
-                    self.controller.set_period(val)
-                except Exception as e:
-                    self._log(f"Fel vid set_period i _ask_new_period: {e}")
+                # skriv period till scoreboard
+                val = "OT" if self._current_period == 4 else str(self._current_period)
+                self._run_io(
+                    lambda: self.controller.set_period(val),
+                    on_error=lambda e: self._log(f"Fel vid set_period i _ask_new_period: {e}"),
+                )
 
                 # Välj rätt tid för nästa period
                 period_time = DEFAULT_OT_TIME if self._current_period == 4 else DEFAULT_PERIOD_TIME
-                try:
-                    self.controller.set_match_time(period_time)
-                    self._log(f"Ny periodtid satt: {period_time}")
-                except Exception as e:
-                    self._log(f"Kunde inte sätta ny periodtid: {e}")
+                self._run_io(
+                    lambda: self.controller.set_match_time(period_time),
+                    lambda _: self._log(f"Ny periodtid satt: {period_time}"),
+                    lambda e: self._log(f"Kunde inte sätta ny periodtid: {e}"),
+                )
         else:
             self._log("Användaren valde att inte starta ny period.")
 
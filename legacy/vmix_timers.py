@@ -0,0 +1,191 @@
+# vmix_timers.py – fördröjda vMix-anrop på EN tråd.
+#
+# Används av VMixClient.after_delay (t.ex. OverlayInputNOut efter en mål-
+# grafik). Varje väntande anrop är en Timer som kan avbrytas (cancel) eller
+# flyttas (reschedule) – ingen sovande tråd per anrop.
+#
+# Timer-tråden gör inget nätverksarbete själv: när ett anrop är moget lämnas
+# det till dispatch (klientens lilla trådpool), så ett segt vMix-svar aldrig
+# försenar nästa timer.
+#
+# stats() / inspect() som core/vmix_scheduler.TimerHeap: antal körda, fel,
+# avbrutna, flyttade och jitter (hur sent varje timer startade).
+
+import heapq
+import itertools
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+
+class Timer:
+    """Handtag från TimerHeap.call_later."""
+
+    __slots__ = ("due", "fn", "args", "name", "cancelled", "fired", "_heap")
+
+    def __init__(self, heap: "TimerHeap", due: float, fn: Callable, args: tuple, name: str):
+        self._heap = heap
+        self.due = due
+        self.fn = fn
+        self.args = args
+        self.name = name
+        self.cancelled = False
+        self.fired = False
+
+    @property
+    def pending(self) -> bool:
+        return not self.cancelled and not self.fired
+
+    def cancel(self) -> bool:
+        """True om timern fortfarande väntade."""
+        was = self.pending
+        self.cancelled = True
+        if was:
+            self._heap.cancelled += 1
+        return was
+
+    def reschedule(self, delay_s: float) -> bool:
+        """Flyttar en väntande timer till nu + delay_s (False: redan körd/avbruten)."""
+        return self._heap.reschedule(self, time.monotonic() + max(0.0, delay_s))
+
+
+class TimerHeap:
+    """En tråd, en heap av (due, seq, Timer) på time.monotonic()."""
+
+    def __init__(self, dispatch: Optional[Callable] = None, name: str = "vmix-timers",
+                 history: int = 500):
+        # dispatch(fn, *args) kör själva anropet; None = direkt på timer-tråden
+        self._dispatch = dispatch
+        self.name = name
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = False
+
+        self.fired = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.rescheduled = 0
+        # ms sent per timer (senaste `history`)
+        self.late_ms: deque = deque(maxlen=history)
+
+    def call_later(self, delay_s: float, fn: Callable, *args, name: str = "") -> Timer:
+        timer = Timer(self, time.monotonic() + max(0.0, delay_s), fn, args,
+                      name or getattr(fn, "__name__", "timer"))
+        with self._cond:
+            heapq.heappush(self._heap, (timer.due, next(self._seq), timer))
+            self._ensure_thread()
+            self._cond.notify()
+        return timer
+
+    def reschedule(self, timer: Timer, due: float) -> bool:
+        with self._cond:
+            if not timer.pending:
+                return False
+            # gamla posten blir inaktuell och hoppas över
+            timer.due = due
+            heapq.heappush(self._heap, (due, next(self._seq), timer))
+            self.rescheduled += 1
+            self._cond.notify()
+        return True
+
+    def _live(self) -> List[Timer]:
+        # en post per väntande timer (inaktuella reschedule-poster hoppas över)
+        return [t for due, _, t in self._heap if t.pending and due == t.due]
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._live())
+
+    def inspect(self) -> List[Dict]:
+        """Väntande timers i tidsordning: [{"name", "due_in_ms"}]"""
+        now = time.monotonic()
+        with self._cond:
+            live = sorted(self._live(), key=lambda t: t.due)
+        return [{"name": t.name, "due_in_ms": (t.due - now) * 1000.0} for t in live]
+
+    def stats(self) -> Dict[str, float]:
+        late = list(self.late_ms)
+        out = {
+            "fired": self.fired,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "rescheduled": self.rescheduled,
+            "pending": self.pending(),
+        }
+        if late:
+            late.sort()
+            out.update({
+                "jitter_ms_mean": statistics.fmean(late),
+                "jitter_ms_p95": late[min(len(late) - 1, int(len(late) * 0.95))],
+                "jitter_ms_max": late[-1],
+            })
+        return out
+
+    def close(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop = False
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    @staticmethod
+    def _stale(entry) -> bool:
+        due, _, timer = entry
+        return not timer.pending or due != timer.due
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stop:
+                    while self._heap and self._stale(self._heap[0]):
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    wait = self._heap[0][0] - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                if self._stop:
+                    return
+                entry = heapq.heappop(self._heap)
+                if self._stale(entry):
+                    continue
+                timer = entry[2]
+                timer.fired = True
+                self.late_ms.append((time.monotonic() - timer.due) * 1000.0)
+
+            try:
+                if self._dispatch is None:
+                    timer.fn(*timer.args)
+                    self._finished(timer, None)
+                    continue
+                fut = self._dispatch(timer.fn, *timer.args)
+                if isinstance(fut, Future):
+                    # felet i själva anropet hamnar i poolens Future
+                    fut.add_done_callback(lambda f, t=timer: self._finished(t, f.exception()))
+                else:
+                    self._finished(timer, None)
+            except Exception as e:
+                self._finished(timer, e)
+
+    def _finished(self, timer: Timer, error: Optional[BaseException]) -> None:
+        with self._cond:
+            if error is None:
+                self.fired += 1
+            else:
+                self.errors += 1
+        if error is not None:
+            log.error(f"[TIMER] {timer.name} misslyckades: {error}")
@@ -0,0 +1,14 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+# The checkout is the scoreboard_app package itself; register it under
+# that name whatever the clone directory is called.
+ROOT = Path(__file__).resolve().parent.parent
+
+if "scoreboard_app" not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        "scoreboard_app", ROOT / "__init__.py", submodule_search_locations=[str(ROOT)])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["scoreboard_app"] = module
+    spec.loader.exec_module(module)
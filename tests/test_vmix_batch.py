@@ -0,0 +1,156 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pytest
+
+from scoreboard_app.core.vmix_batch import dependencies, run_batch, topo_order
+
+
+def _set(inp, field, value="x"):
+    return "SetText", {"Input": inp, "SelectedName": field, "Value": value}
+
+
+class FakeSend:
+    """Blocking send (HTTP-like) that records start/end and concurrency"""
+
+    def __init__(self, delay=0.03, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.log = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, function, params):
+        tag = (function, params.get("Input"), params.get("SelectedName"))
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.log.append(("start", tag))
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+            self.log.append(("end", tag))
+        fut = Future()
+        if function in self.fail:
+            fut.set_exception(RuntimeError(f"{function} ER"))
+        else:
+            fut.set_result("OK")
+        return fut
+
+    def index(self, event, tag):
+        return self.log.index((event, tag))
+
+
+# ------------------------------------------------------------
+# Dependencies
+# ------------------------------------------------------------
+
+def test_same_field_keeps_list_order():
+    cmds = [_set("SB", "A.Text"), _set("sb ", "A.Text"), _set("SB", "B.Text")]
+    assert dependencies(cmds) == [[], [0], []]
+
+
+def test_whole_input_command_orders_against_its_fields():
+    cmds = [
+        _set("SB", "A.Text"),
+        _set("SB", "B.Text"),
+        ("ResetCountdowns", {"Input": "SB"}),
+        _set("SB", "A.Text"),
+        _set("Other", "A.Text"),
+    ]
+    assert dependencies(cmds) == [[], [], [0, 1], [2], []]
+
+
+def test_ordered_groups_and_topo_order():
+    cmds = [_set("1", "A"), _set("2", "B"), _set("3", "C")]
+    deps = dependencies(cmds, [[2, 0]])
+    assert deps == [[2], [], []]
+    assert topo_order(deps) == [1, 2, 0]
+
+
+@pytest.mark.parametrize("groups", [[[0, 0]], [[0, 5]]])
+def test_bad_ordered_groups(groups):
+    with pytest.raises(ValueError):
+        dependencies([_set("1", "A"), _set("2", "B")], groups)
+
+
+def test_cycle_is_rejected():
+    deps = dependencies([_set("1", "A"), _set("2", "B")], [[0, 1], [1, 0]])
+    with pytest.raises(ValueError):
+        topo_order(deps)
+
+
+# ------------------------------------------------------------
+# Pool mode
+# ------------------------------------------------------------
+
+def test_dependent_command_waits_independent_ones_overlap():
+    send = FakeSend()
+    cmds = [
+        ("StopCountdown", {"Input": "SB", "SelectedName": "T.Text"}),
+        ("SetCountdown", {"Input": "SB", "SelectedName": "T.Text", "Value": "02:00"}),
+        _set("SB", "Nr.Text"),
+        _set("SB", "Other.Text"),
+    ]
+    res = run_batch(send, cmds, max_workers=4)
+    assert res.ok and res.mode == "pool"
+    stop = ("StopCountdown", "SB", "T.Text")
+    assert send.index("end", stop) < send.index("start", ("SetCountdown", "SB", "T.Text"))
+    assert send.peak >= 3
+    assert res.wall_ms < res.serial_ms
+
+
+def test_width_is_capped_on_a_shared_executor():
+    send = FakeSend()
+    pool = ThreadPoolExecutor(max_workers=8)
+    try:
+        res = run_batch(send, [_set(str(i), "A") for i in range(6)], max_workers=2, executor=pool)
+        assert res.ok
+        assert send.peak == 2
+        # the shared executor is still usable afterwards
+        assert run_batch(send, [_set("1", "A")], executor=pool).ok
+    finally:
+        pool.shutdown()
+
+
+def test_failed_dependency_is_not_sent():
+    send = FakeSend(fail={"StopCountdown"})
+    cmds = [
+        ("StopCountdown", {"Input": "SB", "SelectedName": "T.Text"}),
+        ("SetCountdown", {"Input": "SB", "SelectedName": "T.Text", "Value": "02:00"}),
+        _set("SB", "Nr.Text"),
+    ]
+    res = run_batch(send, cmds)
+    assert [type(r) for r in res.results] == [RuntimeError, RuntimeError, str]
+    assert res.sent_ms[1] is None
+    assert [c[0][0] for c in res.errors] == ["StopCountdown", "SetCountdown"]
+
+
+def test_closed_executor_fails_instead_of_hanging():
+    pool = ThreadPoolExecutor(max_workers=2)
+    pool.shutdown()
+    res = run_batch(FakeSend(delay=0), [_set("1", "A"), _set("1", "A")], executor=pool)
+    assert not res.ok
+    assert len(res.errors) == 2
+
+
+# ------------------------------------------------------------
+# Pipelined mode
+# ------------------------------------------------------------
+
+def test_pipelined_writes_in_dependency_order():
+    sent = []
+
+    def send(function, params):
+        sent.append(params["Value"])
+        fut = Future()
+        fut.set_result("OK")
+        return fut
+
+    cmds = [_set("1", "A", "a"), _set("2", "B", "b"), _set("3", "C", "c")]
+    res = run_batch(send, cmds, ordered_groups=[[2, 0]], pipelined=True)
+    assert res.ok and res.mode == "pipelined"
+    assert sent == ["b", "c", "a"]
+    assert all(t is not None for t in res.done_ms)
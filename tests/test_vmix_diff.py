@@ -0,0 +1,106 @@
+from scoreboard_app.core.vmix_diff import FieldChanged, SnapshotDiff, capture, diff_states
+from scoreboard_app.core.vmix_events import OverlayChanged, TallyChanged
+from scoreboard_app.core.vmix_parser import parse_status_xml
+from scoreboard_app.core.vmix_snapshot import SnapshotCache
+
+
+def _xml(home="2", away="1", logo="C:\\home.png", overlay="", active=1, preview=2):
+    return (
+        '<vmix><version>27</version><inputs>'
+        '<input key="K1" number="1" title="SB">'
+        f'<text name="HomeScore.Text">{home}</text>'
+        f'<text name="AwayScore.Text">{away}</text>'
+        f'<image name="HomeLogo.Source">{logo}</image>'
+        '</input>'
+        '<input key="K2" number="2" title="GOAL"><text name="Name.Text">x</text></input>'
+        '</inputs>'
+        f'<overlays><overlay number="1">{overlay}</overlay></overlays>'
+        f'<active>{active}</active><preview>{preview}</preview></vmix>'
+    )
+
+
+def test_first_state_gives_every_field_without_events():
+    changes = diff_states(None, parse_status_xml(_xml()))
+    assert all(isinstance(c, FieldChanged) and c.old is None for c in changes)
+    assert {(c.input, c.field, c.new) for c in changes} == {
+        ("SB", "HomeScore.Text", "2"),
+        ("SB", "AwayScore.Text", "1"),
+        ("SB", "HomeLogo.Source", "C:\\home.png"),
+        ("GOAL", "Name.Text", "x"),
+    }
+
+
+def test_only_changed_fields_are_reported():
+    old, new = parse_status_xml(_xml()), parse_status_xml(_xml(home="3"))
+    assert diff_states(old, new) == [FieldChanged("SB", "HomeScore.Text", "2", "3", "K1")]
+    assert diff_states(old, parse_status_xml(_xml())) == []
+
+
+def test_image_change_and_input_filter():
+    old, new = parse_status_xml(_xml()), parse_status_xml(_xml(home="3", logo="C:\\b.png"))
+    changes = diff_states(old, new, inputs=["GOAL"])
+    assert changes == []
+    changes = diff_states(old, new, inputs=["sb"])
+    assert {c.field for c in changes} == {"HomeScore.Text", "HomeLogo.Source"}
+
+
+def test_overlay_and_tally_events():
+    old = parse_status_xml(_xml())
+    new = parse_status_xml(_xml(overlay="2", active=2, preview=1))
+    changes = diff_states(old, new)
+    assert OverlayChanged(1, 2, True) in changes
+    assert TallyChanged(frozenset({2}), frozenset({1})) in changes
+
+    back = diff_states(new, old)
+    assert OverlayChanged(1, 2, False) in back
+
+
+def test_old_fields_survive_a_later_patch():
+    old = parse_status_xml(_xml())
+    fields = capture(old)
+    old.find_input("SB").set_field("HomeScore.Text", "5", "text")
+    new = parse_status_xml(_xml(home="5"))
+    assert diff_states(old, new, old_fields=fields) == [
+        FieldChanged("SB", "HomeScore.Text", "2", "5", "K1")
+    ]
+
+
+class Bodies:
+    def __init__(self, body):
+        self.body = body
+
+    def __call__(self):
+        return self.body
+
+
+def test_snapshot_diff_skips_same_snapshot_and_identical_body():
+    fetch = Bodies(_xml())
+    cache = SnapshotCache(fetch, max_age_ms=0)
+    diff = SnapshotDiff(inputs=["SB"])
+
+    first = cache.get()
+    assert len(diff.feed(first)) == 3
+    assert diff.feed(first) == []
+
+    # unchanged body: the cache shares the parse, nothing to compare
+    assert diff.feed(cache.get(max_age_ms=-1)) == []
+    assert diff.diffs == 1
+
+    fetch.body = _xml(away="4")
+    assert diff.feed(cache.get(max_age_ms=-1)) == [
+        FieldChanged("SB", "AwayScore.Text", "1", "4", "K1")
+    ]
+
+
+def test_snapshot_diff_sees_local_patch():
+    cache = SnapshotCache(Bodies(_xml()), max_age_ms=10_000)
+    diff = SnapshotDiff()
+    snap = cache.get()
+    diff.feed(snap)
+
+    cache.apply_write("SetText", {"Input": "SB", "SelectedName": "HomeScore.Text", "Value": "7"})
+    assert cache.get() is snap
+    assert diff.feed(snap) == [FieldChanged("SB", "HomeScore.Text", "2", "7", "K1")]
+
+    diff.reset()
+    assert len(diff.feed(snap)) == 4
@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+
+from scoreboard_app.core.vmix_clock import ClockModel
+from scoreboard_app.core.vmix_expiry import PenaltyScheduler
+from scoreboard_app.core.vmix_io import IOWorker
+from scoreboard_app.core.vmix_scheduler import TimerHeap
+
+CLEAR = [("SetText", {"Input": "Score", "SelectedName": "HomeP1time.Text", "Value": ""})]
+
+
+@pytest.fixture
+def model():
+    m = ClockModel()
+    m.set(1200, running=True)
+    return m
+
+
+class Recorder:
+    def __init__(self):
+        self.sent = []
+        self.expired = []
+        self.fired = threading.Event()
+
+    def send(self, cmds):
+        self.sent.append(cmds)
+
+    def on_expire(self, key):
+        self.expired.append(key)
+        self.fired.set()
+
+
+@pytest.fixture
+def rec():
+    return Recorder()
+
+
+@pytest.fixture
+def expiry(model, rec):
+    timers = TimerHeap(name="test-penalties")
+    io = IOWorker(lanes=("penalty",))
+    sched = PenaltyScheduler(model, io, timers, send=rec.send, on_expire=rec.on_expire)
+    yield sched
+    sched.close()
+    timers.close()
+    io.close()
+
+
+def test_expires_when_game_time_has_run(expiry, rec):
+    t0 = time.monotonic()
+    expiry.arm("home1", 0.15, CLEAR)
+    assert rec.fired.wait(1.0)
+    assert time.monotonic() - t0 >= 0.14
+    assert rec.expired == ["home1"]
+    assert rec.sent == [CLEAR]
+    assert expiry.armed() == {}
+
+
+def test_paused_clock_holds_the_penalty(expiry, rec, model):
+    expiry.arm("home1", 0.15, CLEAR)
+    model.set_running(False)
+    assert expiry.timers.pending() == 0
+    assert not rec.fired.wait(0.3)
+    assert expiry.remaining("home1") == pytest.approx(0.15, abs=0.03)
+    model.set_running(True)
+    assert rec.fired.wait(1.0)
+
+
+def test_clock_adjust_moves_the_expiry(expiry, rec, model):
+    expiry.arm("home1", 0.1, CLEAR)
+    # +0.3 s on the match clock = 0.3 s less played
+    model.adjust(0.3)
+    assert expiry.remaining("home1") == pytest.approx(0.4, abs=0.05)
+    assert not rec.fired.wait(0.2)
+    assert rec.fired.wait(1.0)
+
+
+def test_disarm_and_resync(expiry, rec):
+    expiry.arm("home1", 10, CLEAR)
+    expiry.arm("away1", 10, CLEAR)
+    assert expiry.disarm("home1")
+    assert not expiry.disarm("home1")
+    # vMix shows 0.1 s left: far enough off to move it
+    expiry.resync("away1", 0.1, at=time.monotonic())
+    assert rec.fired.wait(1.0)
+    assert rec.expired == ["away1"]
+
+
+def test_penalty_past_the_period_end_waits(expiry, rec, model):
+    model.set(0.1, running=True)
+    expiry.arm("home1", 0.3, CLEAR)
+    assert expiry.timers.pending() == 0
+    assert not rec.fired.wait(0.3)
+    assert "home1" in expiry.armed()
+
+
+def test_runs_on_the_shared_worker_and_keeps_bounded_history(model, rec):
+    timers = TimerHeap(name="test-penalties")
+    io = IOWorker(lanes=("cmd", "penalty"))
+    sched = PenaltyScheduler(model, io, timers, send=rec.send,
+                             on_expire=rec.on_expire, history=2)
+    try:
+        for key in ("a", "b", "c"):
+            rec.fired.clear()
+            sched.arm(key, 0.0, CLEAR)
+            assert rec.fired.wait(1.0)
+        assert sched.expired == 3
+        assert len(sched.late_ms) == 2
+        assert io.submitted == 3
+        sched.close()
+        # the app's worker outlives the scheduler
+        assert io.submit(lambda: 1, lane="cmd").result(1.0) == 1
+    finally:
+        timers.close()
+        io.close()
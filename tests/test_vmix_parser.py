@@ -0,0 +1,83 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from scoreboard_app.core.vmix_parser import parse_status_xml
+from scoreboard_app.core.vmix_projection import load_sample
+
+XML = """<vmix>
+  <version>27.0.0.49</version><edition>4K</edition><preset>C:\\match.vmix</preset>
+  <inputs>
+    <input key="AAA-1" number="1" type="GT" title="SCOREBOARD UPPE" shortTitle="SB">
+      <text index="0" name="HomeScore.Text">2</text>
+      <text index="1" name="Time.Text">19:45</text>
+      <text index="2" name="Time.Text">duplicate</text>
+      <image index="0" name="HomeLogo.Source">C:\\home.png</image>
+      <color index="0" name="Bar.Fill.Color">#FF0000</color>
+    </input>
+    <input key="BBB-2" number="2" type="GT" title="Goal" shortTitle="GOAL">
+      <text index="0" name="Name.Text"></text>
+    </input>
+    <input key="CCC-3" number="3" type="Colour" title="goal" />
+  </inputs>
+  <overlays><overlay number="1">2</overlay><overlay number="2" /></overlays>
+  <active>1</active><preview>3</preview>
+</vmix>"""
+
+
+@pytest.fixture
+def state():
+    return parse_status_xml(XML)
+
+
+def test_root_fields(state):
+    assert state.version == "27.0.0.49"
+    assert state.preset == "C:\\match.vmix"
+    assert (state.active, state.preview) == (1, 3)
+    assert state.overlays == {1: 2, 2: None}
+    assert [i.number for i in state.inputs] == [1, 2, 3]
+
+
+@pytest.mark.parametrize("ref", [1, "1", " SCOREBOARD UPPE ", "scoreboard uppe", "SB", "aaa-1"])
+def test_find_input(state, ref):
+    assert state.find_input(ref).key == "AAA-1"
+
+
+def test_first_input_with_a_name_wins(state):
+    # "Goal" (2) and "goal" (3) clash case-insensitively: the first one wins
+    assert state.find_input("GOAL").number == 2
+    assert state.find_input("nope") is None
+    assert state.find_input(9) is None
+
+
+def test_field_lookups(state):
+    sb = state.find_input("SB")
+    assert sb.get_text("HomeScore.Text") == "2"
+    assert sb.get_text("Time.Text") == "19:45"
+    assert sb.get_image("HomeLogo.Source") == "C:\\home.png"
+    assert sb.get_color("Bar.Fill.Color") == "#FF0000"
+    assert sb.get_text("Missing.Text") == ""
+    assert sb.get_field("Missing.Text") is None
+    assert state.find_input(2).get_field("Name.Text") == ""
+    assert sb.field_names() == ["HomeScore.Text", "Time.Text", "Time.Text",
+                                "HomeLogo.Source", "Bar.Fill.Color"]
+
+
+def test_set_field_is_copy_on_write(state):
+    sb = state.find_input("SB")
+    before = sb._text_index
+    assert sb.set_field("HomeScore.Text", "3")
+    assert sb.get_text("HomeScore.Text") == "3"
+    assert before["HomeScore.Text"] == "2"
+    assert not sb.set_field("Missing.Text", "x")
+
+
+def test_bundled_sample_parses():
+    state = parse_status_xml(load_sample())
+    assert state.inputs
+    assert all(state.find_input(i.number) is not None for i in state.inputs)
+
+
+def test_broken_xml_raises():
+    with pytest.raises(ET.ParseError):
+        parse_status_xml("<vmix><inputs>")
@@ -0,0 +1,81 @@
+import pytest
+
+from scoreboard_app.core.vmix_parser import parse_status_xml
+from scoreboard_app.core.vmix_projection import Projection, compile_projection, load_sample
+
+
+@pytest.fixture(scope="module")
+def sample():
+    return load_sample()
+
+
+@pytest.fixture(scope="module")
+def sample_state(sample):
+    return parse_status_xml(sample)
+
+
+def _projection(overlays=True):
+    return Projection({
+        "SCOREBOARD UPPE": {"Time.Text", "HomeScore.Text", "HomeP1nr.Text", "HomeLogo.Source"},
+        "scoreboard nere": {"TextBottom.Text", "Missing.Text"},
+    }, overlays=overlays)
+
+
+def test_extract_matches_full_parse(sample, sample_state):
+    proj = _projection()
+    fast = proj.extract(sample)
+    full = proj.from_state(sample_state)
+
+    assert fast.complete and full.complete
+    assert fast.values == full.values
+    assert fast.overlays == full.overlays
+    assert fast.values[("SCOREBOARD UPPE", "Time.Text")] == "19:01"
+    assert fast.values[("SCOREBOARD UPPE", "HomeLogo.Source")].endswith("SUN.png")
+    assert ("scoreboard nere", "Missing.Text") not in fast.values
+
+
+def test_extract_stops_after_last_target(sample):
+    res = _projection(overlays=False).extract(sample)
+    # the two targets are the first inputs of a ~130 kB preset
+    assert 0 < res.parsed < len(sample) * 0.05
+    assert res.overlays == {}
+
+
+def test_extract_never_reads_past_last_target():
+    xml = ('<vmix><inputs>'
+           '<input key="K1" number="1" title="SB"><text name="Time.Text">05:00</text></input>'
+           '<input key="K2" number="2" title="broken"><text name="x"></input>'
+           '</inputs></vmix>')
+    res = Projection({"SB": {"Time.Text"}}).extract(xml)
+    assert res.complete
+    assert res.values == {("SB", "Time.Text"): "05:00"}
+    with pytest.raises(Exception):
+        parse_status_xml(xml)
+
+
+def test_extract_matches_key_number_and_reports_missing():
+    xml = ('<vmix><inputs>'
+           '<input key="K1" number="1" title="A &amp; B" shortTitle="AB"><text name="T.Text">1</text></input>'
+           '<input key="K2" number="2" title="Other" />'
+           '</inputs><overlays><overlay number="1">2</overlay><overlay number="2" /></overlays></vmix>')
+    res = Projection({"a & b": {"T.Text"}, "2": {"T.Text"}, "nope": {"T.Text"}},
+                     overlays=True).extract(xml.encode("utf-8"))
+    assert res.values == {("a & b", "T.Text"): "1"}
+    assert not res.complete
+    assert res.overlays == {1: 2, 2: None}
+
+
+def test_compile_projection_collects_mapped_fields():
+    cfg = {
+        "scoreboard": {"input": "SB", "home_score": "HomeScore.Text", "label": "HEMMA"},
+        "mapping": {
+            "clock": {"input": "CLOCK", "time": "Time.Text"},
+            "shots": {"home": "HomeShotNr.Text"},
+        },
+    }
+    proj = compile_projection(cfg)
+    assert proj.targets == {
+        "SB": frozenset({"HomeScore.Text", "HomeShotNr.Text"}),
+        "CLOCK": frozenset({"Time.Text"}),
+    }
+    assert proj.overlays
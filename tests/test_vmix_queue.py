@@ -0,0 +1,73 @@
+from concurrent.futures import Future, TimeoutError
+
+import pytest
+
+from scoreboard_app.core.vmix_queue import CommandQueue
+
+
+class FakeSend:
+    def __init__(self, answer=True):
+        self.sent = []
+        self.answer = answer
+
+    def __call__(self, function, params):
+        self.sent.append((function, dict(params)))
+        fut = Future()
+        if self.answer:
+            fut.set_result("OK")
+        return fut
+
+
+def _text(value, field="Name.Text", inp="Score"):
+    return "SetText", {"Input": inp, "SelectedName": field, "Value": value}
+
+
+@pytest.fixture
+def send():
+    return FakeSend()
+
+
+@pytest.fixture
+def queue(send):
+    q = CommandQueue(send, max_latency_ms=50)
+    yield q
+    q.close()
+
+
+def test_last_write_wins(queue, send):
+    futures = [queue.submit(*_text(v)) for v in ("1", "2", "3")]
+    assert queue.flush(timeout=1.0)
+    assert send.sent == [_text("3")]
+    assert [f.result(timeout=1.0) for f in futures] == ["OK"] * 3
+    assert queue.stats()["merged"] == 2
+
+
+def test_other_fields_are_not_merged(queue, send):
+    queue.submit(*_text("a", field="Home.Text"))
+    queue.submit(*_text("b", field="Away.Text"))
+    queue.submit(*_text("c", field="Home.Text"))
+    assert queue.flush(timeout=1.0)
+    assert send.sent == [_text("c", field="Home.Text"), _text("b", field="Away.Text")]
+
+
+def test_barrier_keeps_order(queue, send):
+    queue.submit(*_text("1"))
+    queue.submit("StartCountdown", {"Input": "Score"})
+    queue.submit(*_text("2"))
+    assert queue.flush(timeout=1.0)
+    assert [f for f, _ in send.sent] == ["SetText", "StartCountdown", "SetText"]
+    assert [p.get("Value") for _, p in send.sent] == ["1", None, "2"]
+
+
+def test_silent_vmix_times_out():
+    send = FakeSend(answer=False)
+    q = CommandQueue(send, max_latency_ms=5, result_timeout=0.1)
+    try:
+        fut = q.submit(*_text("x"))
+        with pytest.raises(TimeoutError):
+            fut.result(timeout=1.0)
+        # the queue thread is free again
+        send.answer = True
+        assert q.submit(*_text("y")).result(timeout=1.0) == "OK"
+    finally:
+        q.close()
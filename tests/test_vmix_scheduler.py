@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+
+from scoreboard_app.core.vmix_scheduler import TimerHeap
+
+
+@pytest.fixture
+def heap():
+    h = TimerHeap(name="test-timers")
+    yield h
+    h.close()
+
+
+def _recorder():
+    fired = []
+    done = threading.Event()
+
+    def record(name, last=False):
+        fired.append(name)
+        if last:
+            done.set()
+    return fired, done, record
+
+
+def test_fires_in_due_order(heap):
+    fired, done, record = _recorder()
+    heap.call_later(0.06, record, "c", True)
+    heap.call_later(0.02, record, "a")
+    heap.call_later(0.04, record, "b")
+    assert done.wait(1.0)
+    assert fired == ["a", "b", "c"]
+
+
+def test_same_due_keeps_submit_order(heap):
+    fired, done, record = _recorder()
+    due = heap.now() + 0.03
+    for name in "abcd":
+        heap.call_at(due, record, name, name == "d")
+    assert done.wait(1.0)
+    assert fired == list("abcd")
+
+
+def test_cancel(heap):
+    fired, done, record = _recorder()
+    timer = heap.call_later(0.02, record, "x")
+    heap.call_later(0.02, record, "y", name="named")
+    heap.call_later(0.05, record, "end", True)
+    assert timer.cancel()
+    assert not timer.cancel()
+    assert heap.cancel("named") == 1
+    assert done.wait(1.0)
+    assert fired == ["end"]
+    assert heap.stats()["cancelled"] == 2
+
+
+def test_reschedule_moves_and_fires_once(heap):
+    fired, done, record = _recorder()
+    timer = heap.call_later(0.02, record, "moved", True)
+    assert timer.reschedule(0.08)
+    assert heap.pending() == 1
+    t0 = time.monotonic()
+    assert done.wait(1.0)
+    assert time.monotonic() - t0 >= 0.07
+    time.sleep(0.03)
+    assert fired == ["moved"]
+    assert not timer.reschedule(0.01)
+    assert heap.stats()["rescheduled"] == 1
+
+
+def test_inspect_lists_pending_in_due_order(heap):
+    heap.call_later(0.5, lambda: None, name="late")
+    early = heap.call_later(0.3, lambda: None, name="early")
+    heap.call_later(0.4, lambda: None, name="gone").cancel()
+    early.reschedule(0.1)
+    rows = heap.inspect()
+    assert [r["name"] for r in rows] == ["early", "late"]
+    assert 0 < rows[0]["due_in_ms"] <= 100
+
+
+def test_failing_callback_does_not_stop_the_thread(heap):
+    fired, done, record = _recorder()
+
+    def boom():
+        raise RuntimeError("boom")
+
+    heap.call_later(0.01, boom)
+    heap.call_later(0.02, record, "after", True)
+    assert done.wait(1.0)
+    stats = heap.stats()
+    assert stats["errors"] == 1
+    assert stats["fired"] >= 1
+    assert stats["jitter_ms_max"] >= 0
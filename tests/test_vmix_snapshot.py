@@ -0,0 +1,183 @@
+import threading
+import time
+
+import pytest
+
+from scoreboard_app.core import vmix_snapshot
+from scoreboard_app.core.vmix_snapshot import SnapshotCache
+
+
+def _xml(score="2"):
+    return (f'<vmix><version>27</version><inputs><input key="K1" number="1" title="SB">'
+            f'<text name="HomeScore.Text">{score}</text></input></inputs></vmix>')
+
+
+class SlowFetch:
+    def __init__(self, body=None, delay=0.0):
+        self.body = body or _xml()
+        self.delay = delay
+        self.calls = 0
+        self.error = None
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.body
+
+
+def _together(n, fn):
+    results = [None] * n
+    barrier = threading.Barrier(n)
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = fn()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(2.0)
+    return results
+
+
+def test_concurrent_misses_share_one_fetch():
+    fetch = SlowFetch(delay=0.1)
+    cache = SnapshotCache(fetch)
+    snaps = _together(8, cache.get)
+    assert fetch.calls == 1
+    assert all(s is snaps[0] for s in snaps)
+    assert cache.stats()["shared"] == 7
+
+
+def test_fetch_error_reaches_every_waiter():
+    fetch = SlowFetch(delay=0.1)
+    fetch.error = ConnectionError("down")
+    cache = SnapshotCache(fetch)
+    results = _together(4, cache.get)
+    assert fetch.calls == 1
+    assert all(isinstance(r, ConnectionError) for r in results)
+    # nothing was cached: the next call fetches again
+    fetch.error = None
+    assert cache.get().state.find_input("SB") is not None
+    assert fetch.calls == 2
+
+
+def test_max_age_and_stale_reads():
+    fetch = SlowFetch()
+    cache = SnapshotCache(fetch, max_age_ms=50)
+    first = cache.get()
+    assert cache.get() is first
+    time.sleep(0.07)
+    assert cache.get(allow_stale=True) is first
+    assert cache.get(max_age_ms=1000) is first
+    assert cache.get() is not first
+    assert fetch.calls == 2
+
+
+def test_write_during_fetch_is_not_trusted():
+    fetch = SlowFetch(delay=0.1)
+    cache = SnapshotCache(fetch)
+    t = threading.Thread(target=cache.get)
+    t.start()
+    time.sleep(0.03)
+    cache.apply_write("Fade", {})
+    t.join()
+    cache.get()
+    assert fetch.calls == 2
+
+
+def test_settext_patches_a_parsed_snapshot():
+    cache = SnapshotCache(SlowFetch())
+    snap = cache.get()
+    assert snap.state.find_input("SB").get_text("HomeScore.Text") == "2"
+    cache.apply_write("SetText", {"Input": "SB", "SelectedName": "HomeScore.Text", "Value": "3"})
+    assert cache.get() is snap
+    assert snap.state.find_input("SB").get_text("HomeScore.Text") == "3"
+    assert snap.xml is None and snap.version == 1
+    # the raw XML is gone: projections need a fresh body
+    assert cache.get(need_xml=True) is not snap
+
+
+def test_write_to_unparsed_snapshot_invalidates_without_parsing():
+    fetch = SlowFetch()
+    cache = SnapshotCache(fetch)
+    snap = cache.get()
+    cache.apply_write("SetText", {"Input": "SB", "SelectedName": "HomeScore.Text", "Value": "3"})
+    assert not snap.parsed
+    assert snap.xml is not None
+    assert cache.get() is not snap
+
+
+@pytest.mark.parametrize("function,params", [
+    ("SetText", {"Input": "Nope", "SelectedName": "HomeScore.Text", "Value": "3"}),
+    ("SetText", {"Input": "SB", "SelectedName": "Missing.Text", "Value": "3"}),
+    ("OverlayInput1In", {"Input": "SB"}),
+])
+def test_unpatchable_writes_invalidate(function, params):
+    cache = SnapshotCache(SlowFetch())
+    snap = cache.get()
+    snap.state
+    cache.apply_write(function, params)
+    assert cache.get() is not snap
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    calls = []
+    real = vmix_snapshot.parse_status_xml
+
+    def counting(xml):
+        calls.append(xml)
+        return real(xml)
+
+    monkeypatch.setattr(vmix_snapshot, "parse_status_xml", counting)
+    return calls
+
+
+def test_identical_body_reuses_the_parse(parses):
+    cache = SnapshotCache(SlowFetch(), max_age_ms=0)
+    first = cache.get()
+    state = first.state
+    second = cache.get(max_age_ms=-1)
+    assert second is not first
+    assert second.state is state
+    assert len(parses) == 1
+    assert cache.stats()["body_hits"] == 1
+
+
+def test_identical_body_shares_a_parse_not_yet_done(parses):
+    cache = SnapshotCache(SlowFetch(), max_age_ms=0)
+    first = cache.get()
+    second = cache.get(max_age_ms=-1)
+    # neither was parsed when the second body arrived: whichever parses first serves both
+    assert second.state is first.state
+    assert len(parses) == 1
+
+
+def test_changed_body_is_parsed_again(parses):
+    fetch = SlowFetch()
+    cache = SnapshotCache(fetch, max_age_ms=0)
+    cache.get().state
+    fetch.body = _xml(score="5")
+    snap = cache.get(max_age_ms=-1)
+    assert snap.state.find_input("SB").get_text("HomeScore.Text") == "5"
+    assert len(parses) == 2
+    assert cache.stats()["body_misses"] == 2
+
+
+def test_patched_snapshot_is_not_reused(parses):
+    cache = SnapshotCache(SlowFetch(), max_age_ms=10_000)
+    first = cache.get()
+    first.state
+    cache.apply_write("SetText", {"Input": "SB", "SelectedName": "HomeScore.Text", "Value": "3"})
+    # the server still says "2": the patched state must not be carried over
+    fresh = cache.get(max_age_ms=-1)
+    assert fresh.state is not first.state
+    assert fresh.state.find_input("SB").get_text("HomeScore.Text") == "2"
+    assert cache.stats()["body_hits"] == 0
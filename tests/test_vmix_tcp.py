@@ -0,0 +1,121 @@
+import socket
+import threading
+
+import pytest
+
+from scoreboard_app.core.vmix_tcp import TcpTransport
+
+XML = "<vmix><version>27</version></vmix>"
+
+
+class FakeVmix:
+    """
+    Minimal vMix TCP API: answers FUNCTION, XML and XMLTEXT, and can hold
+    replies back to check that they are matched per command, FIFO.
+    """
+
+    def __init__(self):
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.port = self.server.getsockname()[1]
+        self.lines = []
+        self.hold = threading.Event()
+        self.hold.set()
+        self.conn = None
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        conn, _ = self.server.accept()
+        self.conn = conn
+        conn.sendall(b"VERSION OK 27.0.0.1\r\n")
+        held = []
+        for raw in conn.makefile("rb"):
+            line = raw.decode().rstrip("\r\n")
+            self.lines.append(line)
+            command, _, rest = line.partition(" ")
+            if command == "FUNCTION":
+                fn = rest.split(" ", 1)[0]
+                reply = f"FUNCTION ER Unknown function {fn}\r\n" if fn == "Bogus" \
+                    else f"FUNCTION OK {fn}\r\n"
+                held.append(reply.encode())
+            elif command == "XML":
+                held.append(f"XML {len(XML)}\r\n{XML}".encode())
+            elif command == "XMLTEXT":
+                held.append(b"XMLTEXT OK 01:45\r\n")
+            if self.hold.is_set():
+                # an unsolicited line between replies
+                conn.sendall(b"TALLY OK 0121\r\n" + b"".join(held))
+                held = []
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+        self.server.close()
+
+
+@pytest.fixture
+def vmix():
+    v = FakeVmix()
+    yield v
+    v.close()
+
+
+@pytest.fixture
+def transport(vmix):
+    events = []
+    t = TcpTransport(port=vmix.port, read_timeout=2.0,
+                     on_event=lambda *e: events.append(e))
+    t.events = events
+    yield t
+    t.close()
+
+
+def test_pipelined_replies_match_their_futures(transport, vmix):
+    vmix.hold.clear()
+    a = transport.send("SetText", {"Input": "1", "Value": "a"})
+    xml = transport.send_line("XML")
+    b = transport.send("Fade", {})
+    text = transport.send_line("XMLTEXT", "vmix/inputs/input[1]/text[1]")
+    vmix.hold.set()
+    # released all at once with the next command
+    c = transport.send("Cut", {})
+    assert a.result(timeout=2) == "SetText"
+    assert b.result(timeout=2) == "Fade"
+    assert c.result(timeout=2) == "Cut"
+    assert xml.result(timeout=2) == XML
+    assert text.result(timeout=2) == "01:45"
+    assert [l.split(" ")[0] for l in vmix.lines] == ["FUNCTION", "XML", "FUNCTION", "XMLTEXT", "FUNCTION"]
+    assert transport.stats()["requests"] == 5
+
+
+def test_error_reply_fails_only_its_future(transport):
+    bad = transport.send("Bogus", {})
+    good = transport.send("Cut", {})
+    with pytest.raises(RuntimeError, match="Bogus"):
+        bad.result(timeout=2)
+    assert good.result(timeout=2) == "Cut"
+    assert transport.stats()["errors"] == 1
+
+
+def test_unsolicited_lines_go_to_on_event(transport):
+    assert transport.call("Cut", {}) == "Cut"
+    assert ("VERSION", "OK", "27.0.0.1") in transport.events
+    assert ("TALLY", "OK", "0121") in transport.events
+
+
+def test_connect_failure_returns_a_failed_future():
+    sock = socket.create_server(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    t = TcpTransport(port=port, connect_timeout=0.5)
+    fut = t.send("Cut", {})
+    assert fut.done()
+    assert isinstance(fut.exception(), ConnectionError)
+    assert not t.connected
+
+
+def test_lost_connection_fails_pending(transport, vmix):
+    vmix.hold.clear()
+    fut = transport.send("Cut", {})
+    transport.close()
+    with pytest.raises(ConnectionError):
+        fut.result(timeout=2)
@@ -0,0 +1,254 @@
+import threading
+import time
+
+import pytest
+
+from scoreboard_app.core.vmix_scheduler import TimerHeap
+from scoreboard_app.core.vmix_timeline import (
+    ChannelSequencer, TimelineEngine, compile_timeline,
+)
+
+
+class _Result:
+    ok = True
+    errors = []
+
+
+class FakeClient:
+    """Records every client.batch() as [(function, input), ...]"""
+
+    def __init__(self, delay=None):
+        self.timers = TimerHeap(name="test-timeline")
+        self.batches = []
+        # function name -> seconds that batch blocks
+        self.delay = delay or {}
+        self._lock = threading.Lock()
+
+    def batch(self, cmds):
+        time.sleep(max(self.delay.get(c[0], 0.0) for c in cmds))
+        with self._lock:
+            self.batches.append([(c[0], c[1].get("Input")) for c in cmds])
+        return _Result()
+
+    def sent(self):
+        with self._lock:
+            return [c for b in self.batches for c in b]
+
+
+def popup(name, inp, channel=1, hold=60):
+    return compile_timeline(name, [
+        {"overlay_in": channel, "input": inp},
+        {"wait": hold},
+        {"overlay_out": channel, "input": inp},
+    ])
+
+
+def settle(engine, run=None):
+    if run is not None:
+        assert run.done.wait(2.0)
+    for lane in ("stage", "timeline"):
+        engine.io.submit(lambda: None, lane=lane).result(timeout=2.0)
+
+
+@pytest.fixture
+def client():
+    c = FakeClient()
+    yield c
+    c.timers.close()
+
+
+@pytest.fixture
+def engine(client):
+    e = TimelineEngine(client)
+    yield e
+    e.io.close()
+
+
+# ------------------------------------------------------------
+# Compile
+# ------------------------------------------------------------
+
+def test_compile_offsets_and_parallel():
+    tl = compile_timeline("goal", [
+        {"overlay_in": 1, "input": "Goal"},
+        {"wait": "{popup_ms}"},
+        {"parallel": [
+            [{"overlay_out": 1, "input": "Goal"}],
+            [{"wait": 500}, {"set": {"Name.Text": "{name}"}, "input": "Scorer"}],
+        ]},
+        {"overlay_in": 2, "input": "Scorer"},
+    ], {"popup_ms": 2000})
+    assert [(s.offset_ms, [c.function for c in s.commands]) for s in tl.slots] == [
+        (0, ["OverlayInput1In"]),
+        (2000, ["OverlayInput1Out"]),
+        (2500, ["SetText", "OverlayInput2In"]),
+    ]
+    assert tl.duration_ms == 2500
+    assert tl.overlays == {("Goal", 1), ("Scorer", 2)}
+
+
+def test_compile_stage_and_binding():
+    tl = compile_timeline("scorer", [
+        {"wait": 300},
+        {"stage": {"Name.Text": "{name}", "Logo.Source": "{logo}"}, "input": "Scorer"},
+        {"overlay_in": 2, "input": "Scorer"},
+    ])
+    assert tl.stage_at_ms == 300
+    assert [c.function for c in tl.staged] == ["SetText", "SetImage"]
+    # empty placeholder -> command skipped
+    assert tl.bind_staged({"name": "Nilsson"}) == [
+        ("SetText", {"Input": "Scorer", "SelectedName": "Name.Text", "Value": "Nilsson"}),
+    ]
+
+
+@pytest.mark.parametrize("steps", [
+    [{"overlay_in": 1}],
+    [{"wait": "soon"}],
+    [{"bogus": 1}],
+    ["wait"],
+])
+def test_compile_rejects_bad_steps(steps):
+    with pytest.raises(ValueError):
+        compile_timeline("bad", steps)
+
+
+# ------------------------------------------------------------
+# Engine
+# ------------------------------------------------------------
+
+def test_engine_plays_slots_in_order(engine, client):
+    run = engine.run(popup("a", "A"))
+    settle(engine, run)
+    assert client.batches == [[("OverlayInput1In", "A")], [("OverlayInput1Out", "A")]]
+    assert engine.stats()["slots"] == 2
+    assert engine.channels == {}
+
+
+def test_engine_suppresses_duplicate_in_and_stray_out(engine, client):
+    settle(engine, engine.run(compile_timeline("in", [{"overlay_in": 1, "input": "A"}])))
+    engine.run(compile_timeline("again", [{"overlay_in": 1, "input": "A"}]))
+    settle(engine, engine.run(compile_timeline("stray", [{"overlay_out": 1, "input": "B"}])))
+    assert client.sent() == [("OverlayInput1In", "A")]
+    assert engine.stats()["suppressed"] == 2
+    assert engine.channels == {1: "A"}
+
+
+def test_stop_takes_overlays_off_air(engine, client):
+    run = engine.run(popup("a", "A", hold=5000))
+    time.sleep(0.05)
+    engine.stop(run)
+    settle(engine, run)
+    assert client.sent() == [("OverlayInput1In", "A"), ("OverlayInput1Out", "A")]
+    assert engine.channels == {}
+
+
+def test_engine_runs_on_the_client_heap(engine, client):
+    assert engine.timers is client.timers
+    with pytest.raises(ValueError):
+        TimelineEngine(object())
+
+
+def test_slow_batch_does_not_hold_the_timer_thread(engine, client):
+    client.delay["OverlayInput1In"] = 0.3
+    engine.run(popup("slow", "A"))
+    fired = threading.Event()
+    t0 = time.monotonic()
+    client.timers.call_later(0.05, fired.set)
+    assert fired.wait(1.0)
+    assert time.monotonic() - t0 < 0.2
+
+
+def _staged(lead_ms=100):
+    return compile_timeline("scorer", [
+        {"wait": lead_ms},
+        {"stage": {"Name.Text": "{name}"}, "input": "Scorer"},
+        {"overlay_in": 2, "input": "Scorer"},
+    ])
+
+
+def test_staged_fields_go_out_first(engine, client):
+    run = engine.run(_staged(), {"name": "Nilsson"})
+    settle(engine, run)
+    assert client.batches == [[("SetText", "Scorer")], [("OverlayInput2In", "Scorer")]]
+    assert run.staged.is_set() and not run.restaged
+    assert engine.staging_stats()["staged"] == 1
+
+
+def test_late_staging_is_resent_before_the_overlay(client):
+    client.delay["SetText"] = 0.4
+    engine = TimelineEngine(client, stage_grace_ms=50)
+    try:
+        run = engine.run(_staged(), {"name": "Nilsson"})
+        assert run.done.wait(1.0)
+        engine.io.submit(lambda: None, lane="timeline").result(timeout=2.0)
+        assert run.restaged
+        assert engine.staging_stats()["restaged"] == 1
+    finally:
+        engine.io.close()
+
+
+# ------------------------------------------------------------
+# Sequencer
+# ------------------------------------------------------------
+
+def test_queue_policy_waits_for_the_channel(engine, client):
+    seq = ChannelSequencer(engine, "queue")
+    first = seq.submit(popup("a", "A"))
+    assert seq.submit(popup("b", "B")) is None
+    assert seq.pending() == ["b"]
+    settle(engine, first)
+    # first's on_done started the queued one
+    [second] = seq.running()
+    assert second.timeline.name == "b"
+    settle(engine, second)
+    assert client.sent() == [
+        ("OverlayInput1In", "A"), ("OverlayInput1Out", "A"),
+        ("OverlayInput1In", "B"), ("OverlayInput1Out", "B"),
+    ]
+    assert seq.stats()["queued"] == 1
+    assert seq.pending() == []
+
+
+def test_other_channels_are_not_queued(engine, client):
+    seq = ChannelSequencer(engine, "queue")
+    seq.submit(popup("a", "A", channel=1))
+    assert seq.submit(popup("b", "B", channel=2)) is not None
+    assert len(seq.running()) == 2
+
+
+def test_preempt_policy_replaces_the_running_timeline(engine, client):
+    seq = ChannelSequencer(engine, "preempt")
+    first = seq.submit(popup("a", "A", hold=5000))
+    time.sleep(0.03)
+    second = seq.submit(popup("b", "B"))
+    assert not first.active
+    settle(engine, second)
+    sent = client.sent()
+    assert sent[0] == ("OverlayInput1In", "A")
+    assert sent[-1] == ("OverlayInput1Out", "B")
+    assert ("OverlayInput1In", "B") in sent
+    assert seq.stats()["preempted"] == 1
+    assert engine.channels == {}
+
+
+def test_merge_policy_combines_running_and_new(engine, client):
+    def merge(items):
+        goals = sum(v.get("goals", 1) for _, v in items)
+        return popup("multi", "Multi"), {"goals": goals}
+
+    seq = ChannelSequencer(engine, "merge", merge=merge)
+    seq.submit(popup("a", "A", hold=5000), {"goals": 1})
+    time.sleep(0.03)
+    merged = seq.submit(popup("b", "B", hold=5000), {"goals": 1})
+    merged = seq.submit(popup("c", "C"), {"goals": 1}) or merged
+    assert merged.timeline.name == "multi"
+    assert merged.values == {"goals": 3}
+    assert seq.stats()["merged"] == 2
+    seq.clear()
+    settle(engine, merged)
+    assert engine.channels == {}
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        ChannelSequencer(None, "fifo")
@@ -0,0 +1,62 @@
+from concurrent.futures import Future
+
+import pytest
+
+from scoreboard_app.core.vmix_batch import run_batch
+from scoreboard_app.core.vmix_timer_group import TimerRegistry
+
+
+class FakeClient:
+    pool_size = 4
+
+    def __init__(self):
+        self.batches = []
+
+    def _send(self, function, params):
+        fut = Future()
+        fut.set_result("OK")
+        return fut
+
+    def batch(self, cmds, max_workers=4):
+        self.batches.append([(c[0], c[1]["SelectedName"], c[1].get("Value")) for c in cmds])
+        return run_batch(self._send, cmds, max_workers=max_workers)
+
+
+@pytest.fixture
+def reg():
+    r = TimerRegistry(FakeClient())
+    r.register("clock", "SB", "Time.Text", role="match")
+    r.register("timeout_home", "SB", "ToHome.Text", role="timeout")
+    r.register("timeout_away", "SB", "ToAway.Text", role="timeout")
+    return r
+
+
+def test_subset_and_linked_fields_go_out_as_one_burst(reg):
+    reg.link("clock", lambda: [("SB", "HomeP1time.Text"), ("SB", "Time.Text")])
+    reg.start(["clock"])
+    reg.pause(role="timeout")
+    assert reg.client.batches == [
+        [("StartCountdown", "Time.Text", None), ("StartCountdown", "HomeP1time.Text", None)],
+        [("PauseCountdown", "ToHome.Text", None), ("PauseCountdown", "ToAway.Text", None)],
+    ]
+    assert reg.get("clock").model.running
+    assert reg.group.stats()["bursts"] == 2
+
+
+def test_set_keeps_the_running_flag(reg):
+    reg.start(["clock"])
+    reg.set("19:30", ["clock"])
+    clock = reg.get("clock").model
+    assert clock.running
+    assert clock.remaining() == pytest.approx(19 * 60 + 30, abs=0.5)
+
+    reg.set({"timeout_home": "00:30"})
+    assert not reg.get("timeout_home").model.running
+    assert reg.client.batches[-1] == [("SetCountdown", "ToHome.Text", "00:30")]
+
+
+def test_unknown_timer_and_operation(reg):
+    with pytest.raises(ValueError):
+        reg.start(["nope"])
+    with pytest.raises(ValueError):
+        reg.group.commands("stop", members=[("SB", "Time.Text")])